@@ -1,19 +1,31 @@
 import json
-import os
+from http import HTTPStatus
 
-from flask import request, send_from_directory
+from flask import request, send_file
 from flask_jwt_extended import jwt_required, get_jwt
 from flask_restx import Resource
 
-from backend.core.services.profile_service import *
+from backend.core import db
+from backend.core.models.auth_models import User
+from backend.core.services.auth_service import change_password, change_role, delete_user, get_current_user, \
+    get_user_by_username, parse_user_fields, users_query
+from backend.core.services.profile_service import get_user_info_response, login_user, register_user
 from . import admin_ns
+from ..core.extensions import role_registry, resource_versions, response_cache, request_profiler
 from ..core.messages import AuthMessages
 from ..core.models.hackathon_model import HackathonCase
 from ..core.models.team_models import Team
 from ..core.schemas.auth_schemas import login_model, change_password_model, user_model
-from ..core.schemas.hackathon_schemas import hackathon_case_model
+from ..core.schemas.hackathon_schemas import hackathon_case_model, assign_cases_model
+from ..core.services.import_service import import_format, read_import_rows, import_participants, \
+    import_team_rosters
+from ..core.services.assignment_service import assign_cases
 from ..core.services.hackathon_service import update_hackathon_case, delete_hackathon_case, create_hackathon_case, \
-    assign_cases_evenly
+    get_case_download_name, get_cases_page
+from ..core.services.leaderboard_service import get_leaderboard, is_leaderboard_key
+from ..core.services.pagination import parse_page_args, paginate, encode_cursor
+from ..core.services.utilits import send_upload
+from ..core.services.team_service import get_team_by_name, get_teams_page, parse_team_fields, team_members
 
 
 def admin_required():
@@ -30,13 +42,7 @@ class AdminLogin(Resource):
     def post(self):
         """Аутентификация администратора для получения токена доступа"""
         data = request.get_json()
-        username = data.get("username")
-        password = data.get("password")
-        user = get_user_by_username(username)
-        if not user or not user.check_password(password) or user.system_role.role_name != "admin":
-            return {"message": AuthMessages.AUTH_INVALID_CREDENTIALS}, HTTPStatus.UNAUTHORIZED
-
-        access_token = authenticate_user(username, password)
+        access_token = login_user("admin", data)
         if access_token:
             return {"access_token": access_token}, HTTPStatus.OK
         return {"message": AuthMessages.AUTH_INVALID_CREDENTIALS}, HTTPStatus.UNAUTHORIZED
@@ -46,13 +52,12 @@ class AdminLogin(Resource):
 class AdminProfile(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение информации о пользователе (только для администратора)")
+    @resource_versions.conditional("users", allow=admin_required)
     def get(self):
         """Получение информации о текущем пользователе (только для администратора)"""
         if not admin_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
-        current_username = get_jwt_identity()
-        user = get_user_by_username(current_username)
-        return get_user_info_response(user)
+        return get_user_info_response(get_current_user())
 
     @jwt_required()
     @admin_ns.expect(change_password_model)
@@ -61,9 +66,8 @@ class AdminProfile(Resource):
         """Изменение пароля текущего администратора"""
         if not admin_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
-        current_username = get_jwt_identity()
         data = request.get_json()
-        if change_password(current_username, data.get("old_password"), data.get("new_password")):
+        if change_password(get_current_user(), data.get("old_password"), data.get("new_password")):
             return {"message": AuthMessages.PASSWORD_CHANGED}, HTTPStatus.OK
         return {"message": AuthMessages.PASSWORD_INVALID_OLD}, HTTPStatus.BAD_REQUEST
 
@@ -74,17 +78,28 @@ class AdminUserList(Resource):
     @admin_ns.doc(
         description="Получение списка всех пользователей с возможностью фильтрации по роли (только для администратора)")
     @admin_ns.param('role', 'Фильтрация пользователей по роли')
+    @admin_ns.param('limit', 'Размер страницы')
+    @admin_ns.param('cursor', 'Курсор следующей страницы')
+    @admin_ns.param('fields', 'Поля пользователя через запятую: username,full_name')
+    @resource_versions.conditional("users", allow=admin_required)
     def get(self):
         """Получение списка всех пользователей с возможностью фильтрации по роли"""
         if not admin_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
 
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
+        fields, error = parse_user_fields(request.args)
+        if error:
+            return error
+
         role_filter = request.args.get('role')
-        users = get_all_users(role_filter)
+        users, next_cursor = paginate(users_query(role_filter, fields), User.user_id, limit, after)
 
-        user_list = [get_user_info_response(u)[0] for u in users]
+        user_list = [u.to_dict(fields) for u in users]
 
-        return user_list, HTTPStatus.OK
+        return {"users": user_list, "next_cursor": next_cursor}, HTTPStatus.OK
 
     @jwt_required()
     @admin_ns.expect(user_model)
@@ -115,10 +130,33 @@ class AdminUserList(Resource):
         return register_user(data)
 
 
+@admin_ns.route('/users/import')
+class AdminUserImport(Resource):
+    @jwt_required()
+    @admin_ns.doc(description="Массовая регистрация участников из CSV, JSON или JSONL (только для администратора)")
+    @admin_ns.param('file', 'Файл со строками участников', _in='formData', type='file')
+    @admin_ns.param('format', 'csv, json или jsonl; по умолчанию по расширению файла', _in='formData')
+    def post(self):
+        """Массовая регистрация участников с отчётом об ошибках по строкам"""
+        if not admin_required():
+            return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
+
+        file = request.files.get('file')
+        if not file:
+            return {"message": "Файл обязателен."}, HTTPStatus.BAD_REQUEST
+
+        fmt = import_format(file, request.form.get('format'))
+        if not fmt:
+            return {"message": "Поддерживаются только форматы CSV, JSON и JSONL."}, HTTPStatus.BAD_REQUEST
+
+        return import_participants(read_import_rows(file, fmt)), HTTPStatus.OK
+
+
 @admin_ns.route('/users/detail/<string:username>')
 class AdminUserDetail(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение информации о пользователе по username (только для администратора)")
+    @resource_versions.conditional("users", allow=admin_required)
     def get(self, username):
         """Получение информации о пользователе по username"""
         if not admin_required():
@@ -169,20 +207,26 @@ class HackathonCaseResource(Resource):
 
     @jwt_required()
     @admin_ns.doc(description="Получение списка всех кейсов хакатона")
+    @admin_ns.param('limit', 'Размер страницы')
+    @admin_ns.param('cursor', 'Курсор следующей страницы')
+    @resource_versions.conditional("cases", allow=admin_required)
     def get(self):
         """Получить список всех кейсов хакатона"""
         if not admin_required():
             return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
 
-        cases = HackathonCase.query.all()
-        case_list = [case.to_dict() for case in cases]
-        return {"cases": case_list}, HTTPStatus.OK
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
+
+        return get_cases_page(limit, after), HTTPStatus.OK
 
 
 @admin_ns.route('/hackathon_cases/<int:case_id>')
 class HackathonCaseDetail(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение информации о кейсе хакатона по ID")
+    @resource_versions.conditional("cases", allow=admin_required)
     def get(self, case_id):
         """Получить информацию о кейсе хакатона по ID"""
         if not admin_required():
@@ -226,83 +270,202 @@ class FileDownload(Resource):
     @jwt_required()
     def get(self, filename):
         """Скачать файл кейса по уникальному имени, но с оригинальным именем при скачивании"""
-        upload_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static', 'uploads'))
-
-        # Ищем кейс по file_url (уникальному имени файла)
-        case = HackathonCase.query.filter_by(file_url=filename).first()
-        if not case:
-            return {"message": "Файл не найден."}, 404
-
-        # Получаем оригинальное имя файла из базы данных
-        original_filename = case.original_filename
-
-        # Путь к файлу на сервере
-        filepath = os.path.join(upload_folder, case.file_url)
-
-        if not os.path.exists(filepath):
+        # Оригинальное имя файла по file_url (уникальному имени файла), из кэша или базы
+        original_filename = get_case_download_name(filename)
+        if original_filename is None:
             return {"message": "Файл не найден."}, 404
 
-        return send_from_directory(upload_folder, case.file_url, as_attachment=True, download_name=original_filename)
+        return send_upload(filename, original_filename)
 
 
 @admin_ns.route('/assign_cases')
 class AssignCases(Resource):
     @jwt_required()
-    @admin_ns.doc(description="Распределение кейсов среди команд (только для администратора)")
+    @admin_ns.expect(assign_cases_model)
+    @admin_ns.doc(description="Распределение кейсов среди команд с учётом вместимости и предпочтений (только для администратора)")
     def post(self):
         """Распределение кейсов среди команд"""
         if not admin_required():
             return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
 
-        result, status = assign_cases_evenly()
-        return result, status
+        data = request.get_json(silent=True) or {}
+        mode = data.get("mode", "full")
+        seed = data.get("seed")
+        preferences = data.get("preferences") or {}
+
+        if mode not in ("full", "incremental"):
+            return {"message": "Режим должен быть 'full' или 'incremental'."}, HTTPStatus.BAD_REQUEST
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            return {"message": "Seed должен быть целым числом."}, HTTPStatus.BAD_REQUEST
+        if not isinstance(preferences, dict) or not all(
+                isinstance(cases, list) and all(isinstance(case_id, int) for case_id in cases)
+                for cases in preferences.values()):
+            return {"message": "Предпочтения: объект {название команды: [case_id, ...]}."}, HTTPStatus.BAD_REQUEST
+
+        result, error, status = assign_cases(seed, preferences, incremental=mode == "incremental")
+        if error:
+            return error, status
+
+        return {"message": "Кейсы успешно распределены по командам.", **result}, status
 
 
 @admin_ns.route('/teams')
 class TeamList(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение списка всех команд (только для администратора)")
+    @admin_ns.param('limit', 'Размер страницы')
+    @admin_ns.param('cursor', 'Курсор следующей страницы')
+    @admin_ns.param('fields', 'Поля ответа через запятую, поля связей через точку: team_name,members.username')
+    @admin_ns.param('include', 'Связи к полям по умолчанию: members,cases,artifacts,reviews,team_lead')
+    @resource_versions.conditional("teams", "users", "cases", allow=admin_required)
     def get(self):
         """Получить список всех команд"""
         if not admin_required():
             return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
 
-        teams = Team.query.all()
-        team_list = [team.to_dict() for team in teams]
-        return {"teams": team_list}, HTTPStatus.OK
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
+        fields, error = parse_team_fields(request.args)
+        if error:
+            return error
+
+        return get_teams_page(limit, after, fields), HTTPStatus.OK
+
+
+@admin_ns.route('/leaderboard')
+class Leaderboard(Resource):
+    @jwt_required()
+    @admin_ns.doc(description="Рейтинг команд по средней сумме баллов жюри (только для администратора)")
+    @admin_ns.param('normalize', "'zscore' — нормализация оценок по каждому члену жюри")
+    @admin_ns.param('limit', 'Размер страницы')
+    @admin_ns.param('cursor', 'Курсор следующей страницы')
+    @resource_versions.conditional("teams", allow=admin_required)
+    def get(self):
+        """Получить рейтинг команд"""
+        if not admin_required():
+            return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
+
+        limit, after, error = parse_page_args(request.args, is_leaderboard_key)
+        if error:
+            return error
+
+        normalize = request.args.get('normalize') == 'zscore'
+        page, error, status = get_leaderboard(limit, after, normalize)
+        if error:
+            return error, status
+
+        next_cursor = encode_cursor(page["next_cursor"]) if page["next_cursor"] else None
+        return {"leaderboard": page["items"], "next_cursor": next_cursor}, HTTPStatus.OK
+
+
+@admin_ns.route('/cache/stats')
+class CacheStats(Resource):
+    @jwt_required()
+    @admin_ns.doc(description="Счётчики попаданий и промахов общего кэша в этом процессе (только для администратора)")
+    def get(self):
+        """Статистика общего кэша"""
+        if not admin_required():
+            return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
+
+        return response_cache.stats(), HTTPStatus.OK
+
+
+@admin_ns.route('/profiles')
+class ProfileList(Resource):
+    @jwt_required()
+    @admin_ns.doc(description="Сохранённые профили запросов (запрос с заголовком X-Profile: 1 или ?_profile=1)")
+    def get(self):
+        """Список профилей запросов"""
+        if not admin_required():
+            return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
+
+        return {"profiles": request_profiler.list_profiles()}, HTTPStatus.OK
+
+
+@admin_ns.route('/profiles/<string:profile_id>')
+class ProfileDownload(Resource):
+    @jwt_required()
+    @admin_ns.param('format', "txt — отчёт, pstats — данные cProfile, html — отчёт pyinstrument")
+    def get(self, profile_id):
+        """Скачать профиль запроса по id из заголовка X-Profile-Id"""
+        if not admin_required():
+            return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
+
+        kind = request.args.get("format", "txt")
+        path = request_profiler.artifact_path(profile_id, kind)
+        if path is None:
+            return {"message": "Профиль не найден."}, HTTPStatus.NOT_FOUND
+
+        return send_file(path, as_attachment=True, download_name=f"{profile_id}.{kind}", max_age=0)
+
+
+@admin_ns.route('/teams/import')
+class TeamRosterImport(Resource):
+    @jwt_required()
+    @admin_ns.doc(description="Массовое создание команд с участниками из CSV, JSON или JSONL (только для администратора)")
+    @admin_ns.param('file', 'Состав команд: team_name, description, team_lead, members', _in='formData', type='file')
+    @admin_ns.param('format', 'csv, json или jsonl; по умолчанию по расширению файла', _in='formData')
+    def post(self):
+        """Массовое создание команд с отчётом о конфликтах по строкам"""
+        if not admin_required():
+            return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
+
+        file = request.files.get('file')
+        if not file:
+            return {"message": "Файл обязателен."}, HTTPStatus.BAD_REQUEST
+
+        fmt = import_format(file, request.form.get('format'))
+        if not fmt:
+            return {"message": "Поддерживаются только форматы CSV, JSON и JSONL."}, HTTPStatus.BAD_REQUEST
+
+        return import_team_rosters(read_import_rows(file, fmt)), HTTPStatus.OK
 
 
 @admin_ns.route('/teams/<string:team_name>')
 class TeamDetail(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение информации о команде по названию (только для администратора)")
+    @admin_ns.param('fields', 'Поля ответа через запятую, поля связей через точку: team_name,members.username')
+    @admin_ns.param('include', 'Связи к полям по умолчанию: members,cases,artifacts,reviews,team_lead')
+    @resource_versions.conditional("teams", "users", "cases", allow=admin_required)
     def get(self, team_name):
         """Получить информацию о команде по названию"""
         if not admin_required():
             return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
 
-        team = Team.query.filter_by(team_name=team_name).first()  # Поиск по названию
+        fields, error = parse_team_fields(request.args)
+        if error:
+            return error
+
+        team = get_team_by_name(team_name, fields=fields)  # Поиск по названию
         if not team:
             return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
 
-        return team.to_dict(), HTTPStatus.OK
+        return team.to_dict(fields), HTTPStatus.OK
 
 
 @admin_ns.route('/teams/<string:team_name>/members')
 class TeamMembers(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение списка членов команды по названию (только для администратора)")
+    @admin_ns.param('fields', 'Поля пользователя через запятую: username,full_name')
+    @resource_versions.conditional("teams", "users", allow=admin_required)
     def get(self, team_name):
         """Получить список членов команды по названию"""
         if not admin_required():
             return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
 
+        fields, error = parse_user_fields(request.args)
+        if error:
+            return error
+
         team = Team.query.filter_by(team_name=team_name).first()  # Поиск по названию
         if not team:
             return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
 
         # Члены команды
-        members = [member.to_dict() for member in team.members]
+        members = [member.to_dict(fields) for member in team_members(team.team_id, fields)]
         return {"members": members}, HTTPStatus.OK
 
     @jwt_required()
@@ -358,20 +521,29 @@ class TeamMembers(Resource):
 class JuryList(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение списка всех членов жюри")
+    @admin_ns.param('limit', 'Размер страницы')
+    @admin_ns.param('cursor', 'Курсор следующей страницы')
+    @admin_ns.param('fields', 'Поля пользователя через запятую: username,full_name')
+    @resource_versions.conditional("users", allow=admin_required)
     def get(self):
         """Получить список всех членов жюри"""
         if not admin_required():
             return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
 
-        # Получаем роль "jury"
-        jury_role = Role.query.filter_by(role_name="jury").first()
-        if not jury_role:
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
+        fields, error = parse_user_fields(request.args)
+        if error:
+            return error
+
+        if not role_registry.id_of("jury"):
             return {"message": "Роль 'jury' не найдена."}, HTTPStatus.NOT_FOUND
 
-        # Получаем всех пользователей с этой ролью
-        jury_members = User.query.filter_by(system_role_id=jury_role.role_id).all()
-        jury_list = [user.to_dict() for user in jury_members]
-        return {"jury": jury_list}, HTTPStatus.OK
+        # Получаем пользователей с этой ролью постранично
+        jury_members, next_cursor = paginate(users_query("jury", fields), User.user_id, limit, after)
+        jury_list = [user.to_dict(fields) for user in jury_members]
+        return {"jury": jury_list, "next_cursor": next_cursor}, HTTPStatus.OK
 
     @jwt_required()
     @admin_ns.expect(user_model)
@@ -387,17 +559,15 @@ class JuryList(Resource):
             return {"message": "Пользователь не найден."}, HTTPStatus.NOT_FOUND
 
         # Проверяем, является ли пользователь уже членом жюри
-        if user.system_role.role_name == "jury":
+        if user.role_name == "jury":
             return {"message": "Пользователь уже является членом жюри."}, HTTPStatus.BAD_REQUEST
 
-        # Получаем роль "jury"
-        jury_role = Role.query.filter_by(role_name="jury").first()
-        if not jury_role:
+        jury_role_id = role_registry.id_of("jury")
+        if not jury_role_id:
             return {"message": "Роль 'jury' не найдена."}, HTTPStatus.NOT_FOUND
 
-        # Изменяем роль пользователя на "jury"
-        user.system_role = jury_role
-        db.session.commit()
+        # Изменяем роль пользователя на "jury" и выдаём ему часть очереди проверки
+        change_role(user, jury_role_id)
 
         return {"message": "Пользователь успешно добавлен в жюри."}, HTTPStatus.OK
 
@@ -406,20 +576,29 @@ class JuryList(Resource):
 class OrganizerList(Resource):
     @jwt_required()
     @admin_ns.doc(description="Получение списка всех организаторов")
+    @admin_ns.param('limit', 'Размер страницы')
+    @admin_ns.param('cursor', 'Курсор следующей страницы')
+    @admin_ns.param('fields', 'Поля пользователя через запятую: username,full_name')
+    @resource_versions.conditional("users", allow=admin_required)
     def get(self):
         """Получить список всех организаторов"""
         if not admin_required():
             return {"message": "Доступ запрещён"}, HTTPStatus.FORBIDDEN
 
-        # Получаем роль "organizer"
-        organizer_role = Role.query.filter_by(role_name="organizer").first()
-        if not organizer_role:
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
+        fields, error = parse_user_fields(request.args)
+        if error:
+            return error
+
+        if not role_registry.id_of("organizer"):
             return {"message": "Роль 'organizer' не найдена."}, HTTPStatus.NOT_FOUND
 
-        # Получаем всех пользователей с этой ролью
-        organizers = User.query.filter_by(system_role_id=organizer_role.role_id).all()
-        organizer_list = [user.to_dict() for user in organizers]
-        return {"organizers": organizer_list}, HTTPStatus.OK
+        # Получаем пользователей с этой ролью постранично
+        organizers, next_cursor = paginate(users_query("organizer", fields), User.user_id, limit, after)
+        organizer_list = [user.to_dict(fields) for user in organizers]
+        return {"organizers": organizer_list, "next_cursor": next_cursor}, HTTPStatus.OK
 
     @jwt_required()
     @admin_ns.expect(user_model)
@@ -434,15 +613,13 @@ class OrganizerList(Resource):
         if not user:
             return {"message": "Пользователь не найден."}, HTTPStatus.NOT_FOUND
 
-        if user.system_role.role_name == "organizer":
+        if user.role_name == "organizer":
             return {"message": "Пользователь уже является организатором."}, HTTPStatus.BAD_REQUEST
 
-        # Получаем роль "organizer"
-        organizer_role = Role.query.filter_by(role_name="organizer").first()
-        if not organizer_role:
+        organizer_role_id = role_registry.id_of("organizer")
+        if not organizer_role_id:
             return {"message": "Роль 'organizer' не найдена."}, HTTPStatus.NOT_FOUND
 
-        # Изменяем роль пользователя на "organizer"
-        user.system_role = organizer_role
-        db.session.commit()
+        # Изменяем роль пользователя на "organizer"; непроверенные команды бывшего жюри раздаются остальным
+        change_role(user, organizer_role_id)
         return {"message": "Пользователь успешно добавлен в организаторы."}, HTTPStatus.OK
@@ -3,4 +3,5 @@ from backend.core import create_app
 
 if __name__ == '__main__':
     app = create_app()
-    app.run(debug=True, use_reloader=True, port=5000)
+    # Сервер разработки; в production — gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+    app.run(debug=app.config["DEBUG"], use_reloader=app.config["DEBUG"], port=5000)
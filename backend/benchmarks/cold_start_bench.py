@@ -0,0 +1,98 @@
+"""Холодный старт процесса: импорт, create_app, первый запрос, первый запрос к ORM и выдача swagger.json.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.cold_start_bench --runs 7
+
+Каждый замер — новый интерпретатор, как при запуске воркера или serverless-функции. Варианты:
+default — как у `flask run`; wsgi — без команд flask db и со спецификацией из файла (как под Gunicorn);
+wsgi-user — то же, но только пространство имён user (со своим файлом спецификации).
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from backend.core import create_app, db
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+from backend.core import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+client = app.test_client()
+assert client.get("/health/live").status_code == 200
+first_request = time.perf_counter()
+# Вход настраивает мапперы ORM: ошибка связей моделей проявится здесь, а не в /health/live
+assert client.post("/api/user/login", json={"username": "-", "password": "-"}).status_code < 500
+first_query = time.perf_counter()
+assert client.get("/swagger.json").status_code == 200
+spec = time.perf_counter()
+print(json.dumps({"import": imported - started, "create_app": created - imported,
+                  "first_request": first_request - created, "first_query": first_query - first_request,
+                  "swagger_json": spec - first_query}))
+"""
+
+EXPORT = """
+import json, sys
+from backend.core import create_app
+from backend.core.extensions import api
+app = create_app()
+with open(sys.argv[1], "w", encoding="utf-8") as file:
+    json.dump(api.export_spec(app), file, ensure_ascii=False)
+"""
+
+
+def measure(env, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", CHILD], cwd=REPO_DIR, env=env, capture_output=True,
+                                text=True, check=True)
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        sample["process_total"] = time.perf_counter() - started
+        samples.append(sample)
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="cold-start-bench-")
+    database_url = f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}"
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url})
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+
+    base = dict(os.environ, DATABASE_URL=database_url, DEBUG="0")
+    variants = {
+        "default": dict(base, OPENAPI_SPEC_FILE=""),
+        "wsgi": dict(base, DB_MIGRATIONS="0", OPENAPI_SPEC_FILE=os.path.join(workdir, "openapi.json")),
+        "wsgi-user": dict(base, DB_MIGRATIONS="0", OPENAPI_SPEC_FILE=os.path.join(workdir, "openapi-user.json"),
+                          API_NAMESPACES="user"),
+    }
+    try:
+        for name, env in variants.items():
+            if env["OPENAPI_SPEC_FILE"]:
+                # Спецификация собирается тем же набором пространств имён, что и у варианта
+                subprocess.run([sys.executable, "-c", EXPORT, env["OPENAPI_SPEC_FILE"]], cwd=REPO_DIR, env=env,
+                               check=True)
+            result = measure(env, args.runs)
+            print(f"{name:<10} " + " ".join(f"{key}={value * 1000:.0f}ms" for key, value in result.items()))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Сценарии горячих эндпоинтов на детерминированном наборе данных: задержки, пропускная способность, SQL.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.endpoint_bench --users 20000 --teams 4000 --output bench.json
+    python -m backend.benchmarks.endpoint_bench --scenarios my_teams,admin_teams --compare bench.json
+
+Данные создаются `generate_dataset` (как `flask seed generate`) во временной SQLite или в пустой базе по --url.
+Запросы идут последовательно через тестовый клиент Flask, поэтому пропускная способность — на один поток.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import sqlalchemy
+from sqlalchemy import event, select
+
+from backend.core import create_app, db
+from backend.core.models.hackathon_model import HackathonCase
+from backend.core.services.seed_service import generate_dataset
+
+PASSWORD = "bench-password"
+TOKEN_POOL = 50
+
+
+def login_scenario(namespace, username):
+    def run(client, tokens, data, i):
+        return client.post(f"/api/{namespace}/login", json={"username": username(data, i), "password": PASSWORD})
+    return run
+
+
+def get_scenario(path, role):
+    def run(client, tokens, data, i):
+        pool = tokens[role]
+        return client.get(path(data, i), headers={"Authorization": f"Bearer {pool[i % len(pool)]}"})
+    return run
+
+
+def assign_cases_run(client, tokens, data, i):
+    return client.post("/api/admin/assign_cases", json={"seed": i},
+                       headers={"Authorization": f"Bearer {tokens['admin'][0]}"})
+
+
+# name: (функция запроса, ожидаемый статус, доля от --requests)
+SCENARIOS = {
+    "login_user": (login_scenario("user", lambda data, i: f"user_{i % data['users']}"), 200, 0.2),
+    "login_admin": (login_scenario("admin", lambda data, i: "admin"), 200, 0.2),
+    "login_organizer": (login_scenario("organization", lambda data, i: "organizer"), 200, 0.2),
+    "login_jury": (login_scenario("jury", lambda data, i: f"jury_{i % data['jury']}"), 200, 0.2),
+    "my_teams": (get_scenario(lambda data, i: "/api/user/my-teams", "user"), 200, 1),
+    "review_pending": (get_scenario(lambda data, i: "/api/jury/teams/review-pending", "jury"), 200, 1),
+    "admin_teams": (get_scenario(lambda data, i: "/api/admin/teams", "admin"), 200, 1),
+    "organizer_teams": (get_scenario(lambda data, i: "/api/organization/teams", "organizer"), 200, 1),
+    "team_names": (get_scenario(lambda data, i: "/api/admin/teams?fields=team_name", "admin"), 200, 1),
+    "jury_names": (get_scenario(lambda data, i: "/api/admin/jury?fields=username,full_name", "admin"), 200, 1),
+    "assign_cases": (assign_cases_run, 200, 0.05),
+    "case_download": (get_scenario(lambda data, i: f"/api/admin/download/{data['files'][i % len(data['files'])]}",
+                                   "admin"), 200, 1),
+}
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(share * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, queries, errors, elapsed):
+    ms = [value * 1000 for value in latencies]
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "throughput_rps": round(len(ms) / elapsed, 1),
+        "mean_ms": round(sum(ms) / len(ms), 2),
+        **{f"p{int(share * 100)}_ms": round(percentile(ms, share), 2) for share in (0.5, 0.9, 0.95, 0.99)},
+        "max_ms": round(max(ms), 2),
+        "queries_mean": round(sum(queries) / len(queries), 2),
+        "queries_max": max(queries),
+    }
+
+
+def login_tokens(client, data):
+    accounts = {
+        "user": ("user", [f"user_{i}" for i in range(min(TOKEN_POOL, data["users"]))]),
+        "jury": ("jury", [f"jury_{i}" for i in range(min(TOKEN_POOL, data["jury"]))]),
+        "admin": ("admin", ["admin"]),
+        "organizer": ("organization", ["organizer"]),
+    }
+    tokens = {}
+    for role, (namespace, usernames) in accounts.items():
+        tokens[role] = [
+            client.post(f"/api/{namespace}/login", json={"username": username, "password": PASSWORD})
+            .get_json()["access_token"]
+            for username in usernames
+        ]
+    return tokens
+
+
+def run_scenario(client, counter, run, expected, tokens, data, requests, warmup):
+    for i in range(warmup):
+        run(client, tokens, data, i)
+
+    latencies, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for i in range(warmup, warmup + requests):
+        before = counter.count
+        request_started = time.perf_counter()
+        response = run(client, tokens, data, i)
+        response.close()
+        latencies.append(time.perf_counter() - request_started)
+        queries.append(counter.count - before)
+        errors += response.status_code != expected
+    return summarize(latencies, queries, errors, time.perf_counter() - started)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="endpoint-bench-")
+    url = args.url or f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}"
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": url,
+        "UPLOAD_FOLDER": os.path.join(workdir, "uploads"),
+        "JWT_SECRET_KEY": "bench-secret-key-with-enough-length",
+        "DEBUG": False,
+        "SQL_STATS_HEADERS": False,
+        "PROFILING_ENABLED": False,
+    })
+
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        report = generate_dataset(args.users, args.teams, args.jury, args.cases, args.reviews_per_jury,
+                                  args.seed, PASSWORD)
+        print(f"dataset: {report} in {time.perf_counter() - started:.1f}s")
+        files = db.session.scalars(select(HackathonCase.file_url).order_by(HackathonCase.case_id)).all()
+        counter = QueryCounter(db.engine)
+
+    data = {"users": args.users, "jury": args.jury, "files": files}
+    client = app.test_client()
+    tokens = login_tokens(client, data)
+
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    results = {}
+    for name in names:
+        scenario_run, expected, share = SCENARIOS[name]
+        requests = max(5, int(args.requests * share))
+        results[name] = run_scenario(client, counter, scenario_run, expected, tokens, data, requests, args.warmup)
+        print_row(name, results[name])
+
+    with app.app_context():
+        db.engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": app.config["DB_PROFILE"],
+            "scale": {"users": args.users, "teams": args.teams, "jury": args.jury, "cases": args.cases,
+                      "reviews_per_jury": args.reviews_per_jury, "seed": args.seed},
+            "requests": args.requests,
+        },
+        "scenarios": results,
+    }
+
+
+def print_row(name, result):
+    print(f"{name:<16} n={result['requests']:<5} err={result['errors']:<3} rps={result['throughput_rps']:<8} "
+          f"p50={result['p50_ms']:<8} p95={result['p95_ms']:<8} p99={result['p99_ms']:<8} "
+          f"sql={result['queries_mean']}")
+
+
+def compare(previous, current):
+    print(f"\nСравнение с {previous['meta'].get('commit')} ({previous['meta'].get('timestamp')}):")
+    for name, result in current["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if not before:
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms", "throughput_rps", "queries_mean"):
+            delta = (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            changes.append(f"{key}: {before[key]} -> {result[key]} ({delta:+.0f}%)")
+        print(f"{name:<16} " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--teams", type=int, default=4000)
+    parser.add_argument("--jury", type=int, default=60)
+    parser.add_argument("--cases", type=int, default=30)
+    parser.add_argument("--reviews-per-jury", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="Запросов на сценарий (логины и распределение — доля)")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--scenarios", help=f"Через запятую из: {', '.join(SCENARIOS)}")
+    parser.add_argument("--url", help="Пустая база вместо временной SQLite")
+    parser.add_argument("--output", help="Файл для JSON с результатами")
+    parser.add_argument("--compare", help="JSON предыдущего прогона для сравнения")
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(json.load(file), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Пропускная способность входа на одно ядро.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.login_bench --seconds 5 --method scrypt:32768:8:1
+"""
+import argparse
+import time
+
+from backend.core import create_app, db
+from backend.core.models.auth_models import Role, User
+from backend.core.services.auth_service import authenticate_user
+
+USERNAME = "bench_user"
+PASSWORD = "bench-password"
+
+
+def run(seconds, method):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "PASSWORD_HASH_METHOD": method,
+        "JWT_SECRET_KEY": "bench-secret-key-with-enough-length",
+    })
+    with app.app_context():
+        db.create_all()
+        role = Role(role_name="user")
+        db.session.add(role)
+        db.session.flush()
+        user = User(username=USERNAME, full_name="Bench", university="-", study_info="-",
+                    email="bench@example.com", phone="-", system_role_id=role.role_id)
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+
+        logins = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while time.perf_counter() < deadline:
+            if not authenticate_user(USERNAME, PASSWORD, required_role="user"):
+                raise RuntimeError("Вход не удался")
+            db.session.remove()
+            logins += 1
+        elapsed = time.perf_counter() - started
+
+    print(f"method={method} logins={logins} elapsed={elapsed:.2f}s "
+          f"logins/sec/core={logins / elapsed:.1f} ms/login={elapsed / logins * 1000:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    args = parser.parse_args()
+    run(args.seconds, args.method)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Пропускная способность импорта составов команд, команд в секунду.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.roster_import_bench --teams 2000 --members 4
+"""
+import argparse
+import time
+
+from sqlalchemy import insert
+
+from backend.core import create_app, db
+from backend.core.models.auth_models import Role, User
+from backend.core.services.import_service import import_team_rosters
+
+
+def run(teams, members, batch_size):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "IMPORT_BATCH_SIZE": batch_size,
+        "JWT_SECRET_KEY": "bench-secret-key-with-enough-length",
+    })
+    with app.app_context():
+        db.create_all()
+        role = Role(role_name="user")
+        db.session.add(role)
+        db.session.flush()
+        db.session.execute(insert(User), [
+            {"username": f"bench_{i}", "full_name": "Bench", "university": "-", "study_info": "-",
+             "email": f"bench_{i}@example.com", "phone": "-", "password_hash": "-", "system_role_id": role.role_id}
+            for i in range(teams * members)
+        ])
+        db.session.commit()
+
+        rows = (
+            (team, {
+                "team_name": f"team_{team}",
+                "team_lead": f"bench_{team * members}",
+                "members": [f"bench_{team * members + member}" for member in range(1, members)],
+            }, None)
+            for team in range(teams)
+        )
+
+        started = time.perf_counter()
+        report = import_team_rosters(rows)
+        elapsed = time.perf_counter() - started
+
+    if report["failed"]:
+        raise RuntimeError(f"Импорт с ошибками: {report['errors'][:5]}")
+    print(f"teams={report['created']} members={report['members_added']} batch={batch_size} elapsed={elapsed:.2f}s "
+          f"teams/sec={report['created'] / elapsed:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    run(args.teams, args.members, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Кодирование больших ответов API: stdlib json (прежний путь flask-restx), orjson и MessagePack, сжатие.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.serialization_bench --teams 2000 --users 10000
+
+Полезные нагрузки — реальные ответы списков команд, пользователей и рейтинга на детерминированном наборе
+данных. Для каждой: время кодирования и размер тела, затем размер и время gzip/brotli; в конце задержка
+запроса через тестовый клиент для прежнего и нового представлений.
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import brotli
+import msgpack
+import orjson
+from flask_restx.representations import output_json as restx_output_json
+
+from backend.core import create_app, db
+from backend.core.config import Config
+from backend.core.extensions import api
+from backend.core.serialization import JSON_MIMETYPE, JSON_OPTIONS
+from backend.core.services.seed_service import generate_dataset
+
+PASSWORD = "bench-password"
+PAYLOADS = {
+    "admin_teams": "/api/admin/teams?limit={page}",
+    "organizer_teams": "/api/organization/teams?limit={page}",
+    "admin_users": "/api/admin/users?limit={page}",
+    "leaderboard": "/api/admin/leaderboard?limit={page}",
+}
+ENCODERS = {
+    "json": lambda data: (json.dumps(data) + "\n").encode(),
+    "orjson": lambda data: orjson.dumps(data, option=JSON_OPTIONS),
+    "msgpack": lambda data: msgpack.packb(data, use_bin_type=True),
+}
+
+
+def timed(func, repeat):
+    """Медиана времени вызова в миллисекундах и результат последнего вызова"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def compare_encoders(name, data, args):
+    print(f"\n{name}")
+    for encoder, encode in ENCODERS.items():
+        encode_ms, body = timed(lambda: encode(data), args.repeat)
+        gzip_ms, gzipped = timed(lambda: gzip.compress(body, compresslevel=args.gzip_level, mtime=0), args.repeat)
+        brotli_ms, compressed = timed(lambda: brotli.compress(body, quality=args.brotli_quality), args.repeat)
+        print(f"  {encoder:<8} encode={encode_ms:7.2f}ms size={len(body):>9} "
+              f"gzip={len(gzipped):>8} ({gzip_ms:6.2f}ms) br={len(compressed):>8} ({brotli_ms:6.2f}ms)")
+
+
+def compare_requests(client, path, headers, args):
+    variants = {
+        "json (restx)": (restx_output_json, JSON_MIMETYPE, "identity"),
+        "orjson": (None, JSON_MIMETYPE, "identity"),
+        "orjson+gzip": (None, JSON_MIMETYPE, "gzip"),
+        "orjson+br": (None, JSON_MIMETYPE, "br"),
+        "msgpack+br": (None, "application/msgpack", "br"),
+    }
+    current = api.representations[JSON_MIMETYPE]
+    for variant, (representation, accept, encoding) in variants.items():
+        api.representations[JSON_MIMETYPE] = representation or current
+        request_headers = {**headers, "Accept": accept, "Accept-Encoding": encoding}
+        try:
+            client.get(path, headers=request_headers)
+            latency_ms, response = timed(lambda: client.get(path, headers=request_headers), args.repeat)
+        finally:
+            api.representations[JSON_MIMETYPE] = current
+        print(f"  {variant:<13} p50={latency_ms:7.2f}ms bytes={len(response.data):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--teams", type=int, default=1000)
+    parser.add_argument("--jury", type=int, default=30)
+    parser.add_argument("--page", type=int, default=200, help="Размер страницы списков (не больше PAGE_SIZE_MAX)")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--gzip-level", type=int, default=6)
+    parser.add_argument("--brotli-quality", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="serialization-bench-")
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}",
+        "UPLOAD_FOLDER": os.path.join(workdir, "uploads"),
+        "JWT_SECRET_KEY": "bench-secret-key-with-enough-length",
+        "DEBUG": False,
+        "SQL_STATS_HEADERS": False,
+        "PROFILING_ENABLED": False,
+        "PAGE_SIZE_MAX": max(args.page, Config.PAGE_SIZE_MAX),
+    })
+    try:
+        with app.app_context():
+            db.create_all()
+            print(f"dataset: {generate_dataset(args.users, args.teams, args.jury, 10, 20, 42, PASSWORD)}")
+
+        client = app.test_client()
+        tokens = {
+            role: client.post(f"/api/{namespace}/login", json={"username": username, "password": PASSWORD})
+            .get_json()["access_token"]
+            for role, namespace, username in (("admin", "admin", "admin"), ("organizer", "organization", "organizer"))
+        }
+        for name, template in PAYLOADS.items():
+            path = template.format(page=args.page)
+            headers = {"Authorization": f"Bearer {tokens['organizer' if 'organization' in path else 'admin']}"}
+            data = client.get(path, headers=headers).get_json()
+            compare_encoders(name, data, args)
+            compare_requests(client, path, headers, args)
+
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
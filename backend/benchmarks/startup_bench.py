@@ -0,0 +1,125 @@
+"""Запуск Gunicorn: время до первого ответа и память воркеров с предзагрузкой приложения и без неё.
+
+Запуск из корня репозитория (Linux, нужен /proc):
+    python -m backend.benchmarks.startup_bench --workers 4
+    python -m backend.benchmarks.startup_bench --workers 8 --modes preload
+
+RSS включает общие с мастером страницы, поэтому эффект предзагрузки виден по PSS и Private.
+"""
+import argparse
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from backend.core import create_app, db
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def memory_kb(pid):
+    """Rss, Pss и Private процесса в КБ по /proc/<pid>/smaps_rollup"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                values[name] = int(rest.split()[0])
+    return {"rss": values["Rss"], "pss": values["Pss"],
+            "private": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as file:
+        return [int(child) for child in file.read().split()]
+
+
+def wait_ready(url, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.01)
+    return False
+
+
+def run_mode(preload, workers, threads, database_url, warm_requests):
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, GUNICORN_BIND=f"127.0.0.1:{port}",
+               GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads),
+               GUNICORN_PRELOAD="1" if preload else "0", GUNICORN_ACCESS_LOG="/dev/null")
+    command = [sys.executable, "-m", "gunicorn", "-c", os.path.join(BACKEND_DIR, "gunicorn.conf.py"),
+               "--log-level", "warning", "backend.wsgi:app"]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=REPO_DIR, env=env)
+    try:
+        url = f"http://127.0.0.1:{port}/health/ready"
+        if not wait_ready(url, started + 60):
+            raise RuntimeError("Gunicorn не ответил за 60 секунд")
+        first_response = time.perf_counter() - started
+
+        # Дождаться всех воркеров и прогреть их запросами
+        deadline = time.perf_counter() + 30
+        while len(children(process.pid)) < workers and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        for _ in range(warm_requests):
+            urllib.request.urlopen(url, timeout=5).read()
+        all_ready = time.perf_counter() - started
+
+        master = memory_kb(process.pid)
+        worker_memory = [memory_kb(pid) for pid in children(process.pid)]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+    mode = "preload" if preload else "no-preload"
+    print(f"\n{mode}: first response {first_response * 1000:.0f} ms, all workers warm {all_ready * 1000:.0f} ms")
+    print(f"  master    rss={master['rss'] / 1024:.1f}MB pss={master['pss'] / 1024:.1f}MB "
+          f"private={master['private'] / 1024:.1f}MB")
+    for index, memory in enumerate(worker_memory, start=1):
+        print(f"  worker {index:<2} rss={memory['rss'] / 1024:.1f}MB pss={memory['pss'] / 1024:.1f}MB "
+              f"private={memory['private'] / 1024:.1f}MB")
+    total_pss = master["pss"] + sum(memory["pss"] for memory in worker_memory)
+    print(f"  total pss={total_pss / 1024:.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--modes", default="preload,no-preload")
+    parser.add_argument("--warm-requests", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    database_url = f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}"
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url})
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+
+    try:
+        for mode in args.modes.split(","):
+            run_mode(mode == "preload", args.workers, args.threads, database_url, args.warm_requests)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
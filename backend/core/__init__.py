@@ -1,36 +1,71 @@
+import importlib
+
 from flask import Flask
 from flask_cors import CORS
 
 from .config import Config
-from .database import db, migrate
-from .extensions import jwt, api
+from .database import db, configure_engine_profile, init_engine, init_migrations
+from .extensions import jwt, api, user_cache, case_file_cache, role_registry, resource_versions, \
+    response_cache, sql_stats, metrics, request_profiler, response_encoding
+from .commands import register_commands
 
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+    app.logger.setLevel(app.config["LOG_LEVEL"])
     CORS(app, supports_credentials=True, resources={r"/*": {"origins": "*"}})
 
     api.init_app(app)
     jwt.init_app(app)
+    user_cache.init_app(app, "USER_CACHE")
+    case_file_cache.init_app(app, "CASE_FILE_CACHE")
 
+    configure_engine_profile(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    import_models()
+    init_engine(app)
+    sql_stats.init_app(app)
+    metrics.init_app(app, api)
+    request_profiler.init_app(app)
+    # После метрик: after_request выполняются в обратном порядке, и в метрики попадает размер сжатого тела
+    response_encoding.init_app(app, api)
+    if app.config["DB_MIGRATIONS"]:
+        init_migrations(app)
+    role_registry.init_app(app)
+    resource_versions.init_app(app)
+    response_cache.init_app(app, versions=resource_versions)
 
     register_apps(app)
+    api.use_prebuilt_spec(app)
+    register_commands(app)
 
     return app
 
 
-def register_apps(app):
-    from backend.user import user_ns
-    api.add_namespace(user_ns, path='/api/user')
+# Все модули моделей: связи между моделями разрешаются по имени класса, и набор пространств имён
+# из API_NAMESPACES не должен влиять на то, какие модели известны ORM
+MODEL_MODULES = ("auth_models", "hackathon_model", "storage_model", "team_models", "version_model")
+
 
-    from backend.admin import admin_ns
-    api.add_namespace(admin_ns, path='/api/admin')
+def import_models():
+    for name in MODEL_MODULES:
+        importlib.import_module(f"backend.core.models.{name}")
 
-    from backend.organizer import organizer_ns
-    api.add_namespace(organizer_ns, path='/api/organization')
 
-    from backend.jury import jury_ns
-    api.add_namespace(jury_ns, path='/api/jury')
+# Пространство имён: модуль, объект Namespace и префикс URL
+NAMESPACES = {
+    "user": ("backend.user", "user_ns", "/api/user"),
+    "admin": ("backend.admin", "admin_ns", "/api/admin"),
+    "organizer": ("backend.organizer", "organizer_ns", "/api/organization"),
+    "jury": ("backend.jury", "jury_ns", "/api/jury"),
+}
+
+
+def register_apps(app):
+    """Импорт и регистрация только пространств имён из API_NAMESPACES"""
+    for name in app.config["API_NAMESPACES"]:
+        module, attribute, path = NAMESPACES[name]
+        api.add_namespace(getattr(importlib.import_module(module), attribute), path=path)
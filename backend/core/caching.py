@@ -0,0 +1,219 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import orjson
+
+from .cache import TTLCache
+
+
+class MemoryBackend:
+    """LRU в памяти процесса: быстрый, но у каждого воркера свой"""
+
+    name = "memory"
+
+    def __init__(self, max_entries):
+        self._cache = TTLCache(maxsize=max_entries)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl):
+        self._cache.set(key, value, ttl)
+
+    def delete(self, key):
+        self._cache.invalidate(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class FileSystemBackend:
+    """Файлы в общем каталоге: разделяется воркерами одной машины без внешних сервисов"""
+
+    name = "filesystem"
+
+    def __init__(self, directory, max_entries):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                expires_at, value = file.read().split("\n", 1)
+        except (FileNotFoundError, ValueError):
+            return None
+        if float(expires_at) < time.time():
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key, value, ttl):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(f"{time.time() + ttl}\n{value}")
+        os.replace(tmp_path, self._path(key))
+        self._prune()
+
+    def _prune(self):
+        entries = [entry for entry in os.scandir(self.directory) if not entry.name.startswith(".tmp")]
+        if len(entries) <= self.max_entries:
+            return
+        # Вытесняются самые старые записи, с запасом, чтобы не сканировать каталог на каждой записи
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries * 9 // 10]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+class RedisBackend:
+    """Redis: общий для всех воркеров и машин; вытеснение по TTL и политике maxmemory сервера"""
+
+    name = "redis"
+
+    def __init__(self, url=None, client=None, prefix=""):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("Для CACHE_BACKEND=redis установите пакет redis") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self.client.delete(key)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(key)
+
+
+class SharedCache:
+    """Кэш сериализованных ответов сервисов с выбираемым хранилищем (memory, filesystem, redis).
+
+    Ключ: префикс, пространство имён, версии семейств ресурсов и хеш аргументов. Версии меняются
+    после commit каждой записи в таблицы семейства, поэтому записи сбрасываются на путях изменения
+    данных без явных вызовов; invalidate(namespace) сбрасывает пространство имён вручную.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.default_ttl = 60
+        self.prefix = ""
+        self._versions = None
+        self._stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._lock = threading.Lock()
+
+    def init_app(self, app, versions=None, client=None):
+        config = app.config
+        kind = config["CACHE_BACKEND"]
+        self.default_ttl = config["CACHE_DEFAULT_TTL"]
+        self.prefix = config["CACHE_KEY_PREFIX"]
+        self._versions = versions
+
+        if kind == "memory":
+            self.backend = MemoryBackend(config["CACHE_MAX_ENTRIES"])
+        elif kind == "filesystem":
+            self.backend = FileSystemBackend(config["CACHE_DIR"], config["CACHE_MAX_ENTRIES"])
+        elif kind == "redis":
+            self.backend = RedisBackend(config["CACHE_REDIS_URL"], client=client, prefix=self.prefix)
+        elif kind in ("", "none"):
+            self.backend = None
+        else:
+            raise RuntimeError(f"Неизвестный CACHE_BACKEND: {kind}")
+        self.reset_stats()
+
+    def _generation(self, namespace):
+        key = f"{self.prefix}gen:{namespace}"
+        generation = self.backend.get(key)
+        return generation or "0"
+
+    def invalidate(self, namespace):
+        """Сбросить все записи пространства имён во всех воркерах"""
+        if self.backend is None:
+            return
+        self.backend.set(f"{self.prefix}gen:{namespace}", str(time.time_ns()), 10 ** 8)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def key_for(self, namespace, families, args, kwargs):
+        parts = [namespace, self._generation(namespace)]
+        if families and self._versions is not None:
+            versions = self._versions.current(families)
+            parts.extend(f"{family}:{versions.get(family)}" for family in families)
+        digest = hashlib.sha1(json.dumps([args, kwargs], sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.prefix}{':'.join(parts)}:{digest}"
+
+    def cached(self, namespace, *families, ttl=None):
+        """Декоратор сервисной функции, возвращающей JSON-сериализуемый результат"""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return func(*args, **kwargs)
+
+                key = self.key_for(namespace, families, args, kwargs)
+                payload = self.backend.get(key)
+                if payload is not None:
+                    self._count(namespace, "hits")
+                    return orjson.loads(payload)
+
+                self._count(namespace, "misses")
+                result = func(*args, **kwargs)
+                payload = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
+                self.backend.set(key, payload, ttl or self.default_ttl)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def _count(self, namespace, counter):
+        with self._lock:
+            self._stats[namespace][counter] += 1
+
+    def stats(self):
+        """Счётчики попаданий и промахов этого процесса по пространствам имён"""
+        with self._lock:
+            namespaces = {namespace: dict(counters) for namespace, counters in self._stats.items()}
+        return {"backend": self.backend.name if self.backend else "none", "namespaces": namespaces}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
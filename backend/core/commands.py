@@ -0,0 +1,89 @@
+import click
+from flask.cli import AppGroup
+
+leaderboard_cli = AppGroup('leaderboard', help="Управление рейтингом команд")
+
+
+@leaderboard_cli.command('rebuild')
+def rebuild_leaderboard():
+    """Пересчитать агрегаты оценок по всем существующим оценкам жюри"""
+    from backend.core.services.leaderboard_service import rebuild_scores
+
+    rebuild_scores()
+    click.echo("Рейтинг пересчитан.")
+
+
+reviews_cli = AppGroup('reviews', help="Очередь проверки артефактов жюри")
+
+
+@reviews_cli.command('assign')
+def assign_reviews():
+    """Заново распределить непроверенные команды между членами жюри"""
+    from backend.core.services.review_service import rebuild_assignments
+
+    rebuild_assignments()
+    click.echo("Назначения жюри пересчитаны.")
+
+
+uploads_cli = AppGroup('uploads', help="Хранилище загруженных файлов")
+
+
+@uploads_cli.command('gc')
+def collect_uploads():
+    """Удалить файлы без ссылок; запускается периодически, например из cron"""
+    from backend.core.services.storage_service import collect_garbage
+
+    click.echo(f"Удалено файлов: {collect_garbage()}")
+
+
+seed_cli = AppGroup('seed', help="Тестовые данные для нагрузочных замеров")
+
+
+@seed_cli.command('generate')
+@click.option('--users', default=20000, show_default=True, help="Участников")
+@click.option('--teams', default=4000, show_default=True, help="Команд")
+@click.option('--jury', default=60, show_default=True, help="Членов жюри")
+@click.option('--cases', default=30, show_default=True, help="Кейсов")
+@click.option('--reviews-per-jury', default=20, show_default=True, help="Оценок от каждого члена жюри")
+@click.option('--seed', default=42, show_default=True, help="Seed генератора")
+@click.option('--password', default="password", show_default=True, help="Пароль всех пользователей")
+def generate_seed(users, teams, jury, cases, reviews_per_jury, seed, password):
+    """Сгенерировать детерминированный набор данных в пустой базе"""
+    from backend.core import db
+    from backend.core.models.auth_models import User
+    from backend.core.services.seed_service import generate_dataset
+
+    if db.session.query(User.user_id).first() is not None:
+        raise click.ClickException("База не пуста: генерация выполняется только в пустой базе.")
+    try:
+        report = generate_dataset(users, teams, jury, cases, reviews_per_jury, seed, password)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(", ".join(f"{key}={value}" for key, value in report.items()))
+
+
+openapi_cli = AppGroup('openapi', help="Спецификация OpenAPI (swagger.json)")
+
+
+@openapi_cli.command('export')
+@click.option('--output', default=None, help="Файл спецификации; по умолчанию OPENAPI_SPEC_FILE")
+def export_openapi(output):
+    """Собрать swagger.json для отдачи файлом (шаг сборки)"""
+    import json
+
+    from flask import current_app
+    from backend.core.extensions import api
+
+    path = output or current_app.config["OPENAPI_SPEC_FILE"]
+    schema = api.export_spec(current_app)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(schema, file, ensure_ascii=False, separators=(",", ":"))
+    click.echo(f"Спецификация записана в {path}")
+
+
+def register_commands(app):
+    app.cli.add_command(leaderboard_cli)
+    app.cli.add_command(reviews_cli)
+    app.cli.add_command(uploads_cli)
+    app.cli.add_command(seed_cli)
+    app.cli.add_command(openapi_cli)
@@ -1,21 +1,112 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def flag(value):
+    """Булево значение настройки: строки 1/true/yes/on или уже bool"""
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
 
 class Config:
-    DEBUG = True
+    # Отладка (отладчик werkzeug, заголовки Server-Timing) включается только явно: DEBUG=1
+    DEBUG = flag(os.getenv("DEBUG", "0"))
+    # Уровень журнала приложения; INFO — чтобы при старте был виден отчёт о настройках движка БД
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
     SECRET_KEY = os.getenv('SECRET_KEY')
 
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     JWT_ACCESS_TOKEN_EXPIRES = 3600000
     JWT_TOKEN_LOCATION = ["headers"]
 
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 4096))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))
+
+    # Полная строка метода werkzeug, например "scrypt:32768:8:1" или "pbkdf2:sha256:600000".
+    # Хеши с другими параметрами пересчитываются при успешном входе
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+    # Пространства имён API; отдельный процесс может поднимать только нужные, например API_NAMESPACES=user
+    API_NAMESPACES = [name.strip() for name in os.getenv("API_NAMESPACES", "user,admin,organizer,jury").split(",")]
+    # Swagger UI можно выключить в production; swagger.json собирается `flask openapi export` и отдаётся файлом
+    SWAGGER_UI = flag(os.getenv("SWAGGER_UI", "1"))
+    OPENAPI_SPEC_FILE = os.getenv("OPENAPI_SPEC_FILE", os.path.join(BACKEND_DIR, "openapi.json"))
+
+    # Ответы API: MessagePack по Accept: application/msgpack; сжатие тел длиннее COMPRESS_MIN_SIZE байт
+    # первым из COMPRESS_ALGORITHMS (br, gzip), который принимает клиент; пустой список — без сжатия
+    API_MSGPACK = flag(os.getenv("API_MSGPACK", "1"))
+    COMPRESS_ALGORITHMS = [name.strip() for name in os.getenv("COMPRESS_ALGORITHMS", "br,gzip").split(",")
+                           if name.strip()]
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_MIMETYPES = ["application/json", "application/msgpack"]
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 5))
+
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///db.sqlite3")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Команды flask db; без них не импортируется alembic (WSGI-воркерам они не нужны)
+    DB_MIGRATIONS = flag(os.getenv("DB_MIGRATIONS", "1"))
+
+    # Профиль движка БД: sqlite, postgresql или none; по умолчанию определяется по DATABASE_URL
+    DB_PROFILE = os.getenv("DB_PROFILE")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024))
+
+    # Учёт SQL на запрос: заголовки Server-Timing и X-DB-Queries (по умолчанию при DEBUG/TESTING),
+    # порог журнала медленных выражений и сколько самых медленных выражений показывать
+    SQL_STATS_HEADERS = os.getenv("SQL_STATS_HEADERS")
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+    SQL_STATS_SLOWEST = int(os.getenv("SQL_STATS_SLOWEST", 3))
+
+    # Профилирование отдельных запросов администратором (X-Profile: 1 или ?_profile=1):
+    # движок cprofile или pyinstrument, каталог отчётов, строк в отчёте и сколько отчётов хранить
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "1")
+    PROFILING_ENGINE = os.getenv("PROFILING_ENGINE", "cprofile").lower()
+    PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(tempfile.gettempdir(), "hackathon-profiles"))
+    PROFILING_TOP = int(os.getenv("PROFILING_TOP", 25))
+    PROFILING_KEEP = int(os.getenv("PROFILING_KEEP", 50))
+
+    PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+    PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 200))
+
+    # Массовый импорт: строк в одной транзакции и процессов для хеширования паролей (0 — по числу ядер)
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 500))
+    IMPORT_HASH_WORKERS = int(os.getenv("IMPORT_HASH_WORKERS", 0))
+
+    # Экспорт протокола: команд в одной пачке серверного курсора
+    EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", 500))
+
+    REVIEWS_PER_TEAM = int(os.getenv("REVIEWS_PER_TEAM", 3))
+
+    # Общий кэш ответов сервисов: memory (в процессе), filesystem (общий каталог), redis или none
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 60))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 2048))
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "hackathon:")
+    CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "hackathon-cache"))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+    # Сколько секунд процесс доверяет прочитанным версиям ресурсов (изменения других воркеров видны с этой задержкой)
+    RESOURCE_VERSION_TTL = float(os.getenv("RESOURCE_VERSION_TTL", 1))
 
     ALLOWED_ORIGINS = ["*"]
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "static/uploads")
+    UPLOAD_MAX_AGE = int(os.getenv("UPLOAD_MAX_AGE", 3600))
+    # Отдача файлов фронт-прокси: "" (сам Flask), "x-sendfile" (Apache/lighttpd) или "x-accel" (nginx)
+    UPLOAD_OFFLOAD = os.getenv("UPLOAD_OFFLOAD", "").lower()
+    USE_X_SENDFILE = UPLOAD_OFFLOAD == "x-sendfile"
+    UPLOAD_ACCEL_PREFIX = os.getenv("UPLOAD_ACCEL_PREFIX", "/protected-uploads/")
+    CASE_FILE_CACHE_SIZE = int(os.getenv("CASE_FILE_CACHE_SIZE", 1024))
+    CASE_FILE_CACHE_TTL = int(os.getenv("CASE_FILE_CACHE_TTL", 300))
     ALLOWED_EXTENSIONS = os.getenv("ALLOWED_EXTENSIONS", "png,jpg,jpeg,gif").split(',')
@@ -1,5 +1,68 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 
 db = SQLAlchemy()
-migrate = Migrate()
+
+
+def init_migrations(app):
+    """Команды flask db; alembic импортируется только при включённом DB_MIGRATIONS"""
+    from flask_migrate import Migrate
+
+    Migrate(app, db)
+
+
+def detect_profile(app):
+    profile = app.config.get("DB_PROFILE")
+    if profile:
+        return profile.lower()
+    backend = make_url(app.config["SQLALCHEMY_DATABASE_URI"]).get_backend_name()
+    return backend if backend in ("sqlite", "postgresql") else "none"
+
+
+def sqlite_pragmas(app):
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": app.config["SQLITE_BUSY_TIMEOUT_MS"],
+        "mmap_size": app.config["SQLITE_MMAP_SIZE"],
+        # Отрицательное значение cache_size задаётся в килобайтах
+        "cache_size": -app.config["SQLITE_CACHE_SIZE_KB"],
+    }
+
+
+def configure_engine_profile(app):
+    """Параметры пула для выбранного профиля; вызывается до db.init_app"""
+    profile = detect_profile(app)
+    app.config["DB_PROFILE"] = profile
+
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    if profile == "postgresql":
+        options.setdefault("pool_size", app.config["DB_POOL_SIZE"])
+        options.setdefault("max_overflow", app.config["DB_MAX_OVERFLOW"])
+        options.setdefault("pool_pre_ping", True)
+        options.setdefault("pool_recycle", app.config["DB_POOL_RECYCLE"])
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def init_engine(app):
+    """Прагмы SQLite на каждое соединение и отчёт о настройках движка; вызывается после db.init_app"""
+    profile = app.config["DB_PROFILE"]
+    with app.app_context():
+        engine = db.engine
+
+    if profile == "sqlite":
+        pragmas = sqlite_pragmas(app)
+
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+        event.listen(engine, "connect", set_pragmas)
+        app.logger.info("DB profile sqlite: %s", ", ".join(f"{k}={v}" for k, v in pragmas.items()))
+    else:
+        options = app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+        app.logger.info("DB profile %s: pool=%s %s", profile, type(engine.pool).__name__,
+                        ", ".join(f"{k}={v}" for k, v in options.items()))
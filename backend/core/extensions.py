@@ -1,7 +1,16 @@
 from flask_jwt_extended import JWTManager
-from flask_restx import Api
 
-api = Api(security='BearerAuth', title="uknoAPI", description="API для сайта ukno")
+from .cache import TTLCache
+from .caching import SharedCache
+from .instrumentation import SqlStats
+from .metrics import Metrics
+from .openapi import HackathonApi
+from .profiling import RequestProfiler
+from .roles import RoleRegistry
+from .serialization import ResponseEncoding
+from .versions import ResourceVersions
+
+api = HackathonApi(security='BearerAuth', title="uknoAPI", description="API для сайта ukno")
 api.authorizations = {
     'Bearer': {
         'type': 'apiKey',
@@ -11,3 +20,29 @@ api.authorizations = {
 }
 api.security = [{'Bearer': []}]
 jwt = JWTManager()
+
+# Кэш текущих пользователей по user_id из токена
+user_cache = TTLCache()
+
+# Имя файла для скачивания по имени файла кейса на диске
+case_file_cache = TTLCache()
+
+role_registry = RoleRegistry()
+
+# Версии семейств ресурсов для ETag/304 на GET
+resource_versions = ResourceVersions()
+
+# Кэш сериализованных страниц (команды, кейсы, рейтинг), общий для воркеров при filesystem/redis
+response_cache = SharedCache()
+
+# Число SQL-выражений и время в БД на запрос, журнал медленных выражений
+sql_stats = SqlStats()
+
+# Метрики Prometheus и проверки живости/готовности
+metrics = Metrics()
+
+# Профили отдельных запросов по требованию администратора
+request_profiler = RequestProfiler()
+
+# orjson/MessagePack для ответов flask-restx и сжатие больших ответов
+response_encoding = ResponseEncoding()
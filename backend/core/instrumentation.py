@@ -0,0 +1,133 @@
+import json
+import logging
+import re
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from .config import flag
+
+slow_query_log = logging.getLogger("backend.sql.slow")
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def param_shape(parameters):
+    """Форма параметров выражения: типы значений без самих значений"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"rows": len(parameters), "row": param_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def short_statement(statement, length):
+    return WHITESPACE.sub(" ", statement).strip()[:length]
+
+
+class SqlStats:
+    """Учёт SQL в пределах HTTP-запроса: число выражений, время в БД и самые медленные выражения.
+
+    Считается на событиях курсора движка, поэтому учитываются и ORM, и Core. Выражения дольше
+    SLOW_QUERY_MS пишутся в журнал backend.sql.slow с маршрутом и формой параметров.
+    """
+
+    def __init__(self):
+        self.slow_threshold = 0.2
+        self.track_slowest = 3
+        self.headers = None
+
+    def init_app(self, app):
+        from backend.core import db
+
+        self.slow_threshold = app.config["SLOW_QUERY_MS"] / 1000
+        self.track_slowest = app.config["SQL_STATS_SLOWEST"]
+        self.headers = app.config["SQL_STATS_HEADERS"]
+
+        with app.app_context():
+            engine = db.engine
+        for name, listener in (("before_cursor_execute", self._before_cursor_execute),
+                               ("after_cursor_execute", self._after_cursor_execute),
+                               ("handle_error", self._on_error)):
+            if not event.contains(engine, name, listener):
+                event.listen(engine, name, listener)
+
+        app.before_request(self._start_request)
+        app.after_request(self._add_headers)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()
+
+        if has_request_context():
+            stats = self.current()
+            stats["count"] += 1
+            stats["time"] += duration
+            slowest = stats["slowest"]
+            if len(slowest) < self.track_slowest or duration > slowest[-1][0]:
+                slowest.append((duration, statement))
+                slowest.sort(key=lambda item: item[0], reverse=True)
+                del slowest[self.track_slowest:]
+
+        if duration >= self.slow_threshold:
+            self._log_slow(statement, parameters, executemany, duration)
+
+    def _on_error(self, exception_context):
+        # Выражение упало: снять его отметку времени, чтобы не сбить замеры следующих
+        connection = exception_context.connection
+        started = connection.info.get("query_started") if connection is not None else None
+        if started:
+            started.pop()
+
+    def _log_slow(self, statement, parameters, executemany, duration):
+        record = {
+            "event": "slow_query",
+            "duration_ms": round(duration * 1000, 2),
+            "statement": short_statement(statement, 500),
+            "params": param_shape(parameters),
+            "executemany": executemany,
+            "route": None,
+        }
+        if has_request_context():
+            record.update(route=request.endpoint, rule=str(request.url_rule), method=request.method)
+        slow_query_log.warning(json.dumps(record, ensure_ascii=False), extra={"sql": record})
+
+    @staticmethod
+    def current():
+        """Счётчики текущего запроса"""
+        if "sql_stats" not in g:
+            g.sql_stats = {"count": 0, "time": 0.0, "slowest": []}
+        return g.sql_stats
+
+    def _start_request(self):
+        g.request_started = time.perf_counter()
+
+    def _enabled(self, app):
+        # По умолчанию заголовки отдаются только вне production: при DEBUG или TESTING
+        if self.headers is None:
+            return app.debug or app.testing
+        return flag(self.headers)
+
+    def _add_headers(self, response):
+        if not self._enabled(current_app):
+            return response
+
+        stats = self.current()
+        timings = [f'db;dur={stats["time"] * 1000:.2f};desc="{stats["count"]} queries"']
+        for index, (duration, statement) in enumerate(stats["slowest"], start=1):
+            description = short_statement(statement, 80).replace("\\", "").replace('"', "'")
+            timings.append(f'sql-{index};dur={duration * 1000:.2f};desc="{description}"')
+        if "request_started" in g:
+            timings.append(f"app;dur={(time.perf_counter() - g.request_started) * 1000:.2f}")
+
+        response.headers["Server-Timing"] = ", ".join(timings)
+        response.headers["X-DB-Queries"] = str(stats["count"])
+        return response
@@ -0,0 +1,129 @@
+import os
+import time
+
+from flask import current_app, g, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, \
+    generate_latest, multiprocess
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+
+# При нескольких воркерах значения пишутся в файлы каталога PROMETHEUS_MULTIPROC_DIR и суммируются при выдаче
+REQUESTS = Counter("http_requests_total", "HTTP-запросы", ["namespace", "resource", "method", "status"])
+REQUEST_ERRORS = Counter("http_request_errors_total", "Ответы 5xx", ["namespace", "resource", "method"])
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Время обработки запроса",
+                            ["namespace", "resource", "method"],
+                            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Размер тела ответа", ["namespace", "resource"],
+                          buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304))
+LOGIN_HASH_TIME = Histogram("login_password_hash_seconds", "Проверка хеша пароля при входе", ["role"],
+                            buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2))
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Выданные соединения пула", multiprocess_mode="livesum")
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Соединения сверх pool_size", multiprocess_mode="livesum")
+POOL_SIZE = Gauge("db_pool_size", "Размер пула соединений", multiprocess_mode="livesum")
+
+UNMATCHED = ("", "unmatched")
+
+
+class Metrics:
+    """Метрики Prometheus: запросы по пространству имён и ресурсу flask-restx, пул БД, хеширование паролей.
+
+    Также регистрирует /metrics, /health/live и /health/ready вне Swagger.
+    """
+
+    def __init__(self):
+        self._labels = {}
+        self._api = None
+        self._pool = None
+
+    def init_app(self, app, api):
+        from backend.core import db
+
+        self._api = api
+        self._labels = {}
+
+        with app.app_context():
+            self._pool = db.engine.pool
+        for name, listener in (("checkout", self._on_checkout), ("checkin", self._on_checkin)):
+            if not event.contains(self._pool, name, listener):
+                event.listen(self._pool, name, listener)
+        if hasattr(self._pool, "size"):
+            POOL_SIZE.set(self._pool.size())
+
+        app.before_request(self._start_request)
+        app.after_request(self._record_request)
+        app.add_url_rule("/metrics", "metrics", self.render)
+        app.add_url_rule("/health/live", "health_live", self.live)
+        app.add_url_rule("/health/ready", "health_ready", self.ready)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKED_OUT.inc()
+        self._sample_overflow()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        POOL_CHECKED_OUT.dec()
+        self._sample_overflow()
+
+    def _sample_overflow(self):
+        if hasattr(self._pool, "overflow"):
+            POOL_OVERFLOW.set(max(self._pool.overflow(), 0))
+
+    def labels(self):
+        """(namespace, resource) текущего запроса; набор значений ограничен зарегистрированными маршрутами"""
+        endpoint = request.endpoint
+        if endpoint is None:
+            return UNMATCHED
+        labels = self._labels.get(endpoint)
+        if labels is None:
+            view = current_app.view_functions.get(endpoint)
+            resource = getattr(view, "view_class", None)
+            namespaces = {route.resource: ns.name for ns in self._api.namespaces for route in ns.resources}
+            if resource in namespaces:
+                labels = (namespaces[resource], resource.__name__)
+            else:
+                labels = ("", endpoint)
+            self._labels[endpoint] = labels
+        return labels
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+
+    def _record_request(self, response):
+        if "metrics_started" not in g:
+            return response
+        namespace, resource = self.labels()
+        method = request.method
+
+        REQUESTS.labels(namespace, resource, method, str(response.status_code)).inc()
+        REQUEST_LATENCY.labels(namespace, resource, method).observe(time.perf_counter() - g.metrics_started)
+        if response.status_code >= 500:
+            REQUEST_ERRORS.labels(namespace, resource, method).inc()
+        # У потоковых ответов длина заранее неизвестна
+        size = response.calculate_content_length()
+        if size is not None:
+            RESPONSE_SIZE.labels(namespace, resource).observe(size)
+        return response
+
+    @staticmethod
+    def render():
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), 200, {"Content-Type": CONTENT_TYPE_LATEST}
+
+    @staticmethod
+    def live():
+        # Процесс отвечает; база не проверяется, чтобы её сбой не приводил к перезапуску воркеров
+        return {"status": "ok"}, 200
+
+    @staticmethod
+    def ready():
+        from backend.core import db
+
+        try:
+            with db.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except SQLAlchemyError:
+            return {"status": "unavailable", "message": "База данных недоступна"}, 503
+        return {"status": "ok"}, 200
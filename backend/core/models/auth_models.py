@@ -1,6 +1,17 @@
+from functools import lru_cache
+
+from flask import current_app
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from backend.core import db
+from backend.core.extensions import role_registry
+
+
+@lru_cache(maxsize=8)
+def hash_method_prefix(method):
+    """Полная метка метода в хеше: werkzeug дополняет неполное значение (scrypt, pbkdf2:sha256) своими
+    параметрами по умолчанию, поэтому метка берётся из хеша пустой строки"""
+    return generate_password_hash("", method=method).split("$", 1)[0]
 
 
 class Role(db.Model):
@@ -15,6 +26,11 @@ class Role(db.Model):
 
 
 
+# Поля User.to_dict и столбцы, из которых они читаются, если называются иначе
+USER_FIELDS = ("username", "full_name", "university", "study_info", "email", "phone", "system_role", "project_role")
+USER_FIELD_COLUMNS = {"system_role": "system_role_id"}
+
+
 class User(db.Model):
     __tablename__ = 'users'
     user_id = db.Column(db.Integer, primary_key=True)
@@ -26,27 +42,33 @@ class User(db.Model):
     phone = db.Column(db.String(15), nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
 
-    system_role_id = db.Column(db.Integer, db.ForeignKey('roles.role_id'), nullable=False)
+    system_role_id = db.Column(db.Integer, db.ForeignKey('roles.role_id'), nullable=False, index=True)
 
     project_role = db.Column(db.String(100), nullable=True)
 
     def __repr__(self):
         return f"<User {self.username}>"
 
+    @property
+    def role_name(self):
+        return role_registry.name_of(self.system_role_id)
+
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=current_app.config["PASSWORD_HASH_METHOD"])
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
-    def to_dict(self):
-        return {
-            "username": self.username,
-            "full_name": self.full_name,
-            "university": self.university,
-            "study_info": self.study_info,
-            "email": self.email,
-            "phone": self.phone,
-            "system_role": self.system_role.role_name,
-            "project_role": self.project_role
-        }
+    def needs_rehash(self):
+        """Хеш создан с другим алгоритмом или параметрами, чем указано в конфигурации"""
+        return self.password_hash.split("$", 1)[0] != hash_method_prefix(current_app.config["PASSWORD_HASH_METHOD"])
+
+    def to_dict(self, fields=None):
+        """Профиль пользователя; fields — подмножество USER_FIELDS, None — все поля"""
+        return {name: self.role_name if name == "system_role" else getattr(self, name)
+                for name in USER_FIELDS if fields is None or name in fields}
+
+
+def user_columns(fields):
+    """Столбцы User для полей профиля, для load_only; первичный ключ загружается всегда"""
+    return [getattr(User, USER_FIELD_COLUMNS.get(name, name)) for name in fields]
@@ -8,8 +8,10 @@ class HackathonCase(db.Model):
     case_id = Column(Integer, primary_key=True)
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
-    file_url = Column(String(255), nullable=True)
+    file_url = Column(String(255), nullable=True, index=True)
     original_filename = Column(String(255), nullable=True)
+    # Максимум команд на кейс при распределении; NULL — без ограничения
+    capacity = Column(Integer, nullable=True)
 
 
     def __repr__(self):
@@ -22,5 +24,6 @@ class HackathonCase(db.Model):
             "title": self.title,
             "description": self.description,
             "file_url": self.file_url,
-            "original_filename": self.original_filename  # Добавляем оригинальное имя файла
+            "original_filename": self.original_filename,  # Добавляем оригинальное имя файла
+            "capacity": self.capacity
         }
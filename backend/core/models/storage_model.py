@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, Integer, String
+
+from backend.core import db
+
+
+class StoredBlob(db.Model):
+    """Загруженный файл, хранимый один раз по SHA-256 содержимого, со счётчиком ссылок"""
+    __tablename__ = 'stored_blobs'
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<StoredBlob {self.sha256} refs={self.ref_count}>"
@@ -1,13 +1,18 @@
 from backend.core import db
 
 
+# Поля Team.to_dict: столбцы, затем связи; поля руководителя команды
+TEAM_FIELDS = ("team_id", "team_name", "description", "team_lead", "members", "cases", "artifacts", "reviews")
+TEAM_LEAD_FIELDS = ("user_id", "username", "full_name")
+
+
 class Team(db.Model):
     __tablename__ = 'teams'
     team_id = db.Column(db.Integer, primary_key=True)
     team_name = db.Column(db.String(100), nullable=False, unique=True)
     description = db.Column(db.String(255), nullable=True)
 
-    team_lead_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+    team_lead_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False, index=True)
     team_lead = db.relationship('User', foreign_keys=[team_lead_id])
 
     members = db.relationship('User', secondary='team_members', backref='teams')
@@ -17,12 +22,29 @@ class Team(db.Model):
     def __repr__(self):
         return f"<Team {self.team_name}>"
 
-    def to_dict(self):
-        # Получаем оценки команды
-        reviews = self.artifact_reviews
-        review_data = []
-        for review in reviews:
-            review_data.append({
+    def to_dict(self, fields=None):
+        """Словарь команды; fields — {поле: вложенные поля или None} из parse_fieldset, None — все поля.
+
+        Читаются только запрошенные поля, поэтому при проекции не догружаются ненужные столбцы и связи.
+        """
+        if fields is None:
+            fields = dict.fromkeys(TEAM_FIELDS)
+
+        data = {name: getattr(self, name) for name in ("team_id", "team_name", "description") if name in fields}
+        if "team_lead" in fields:
+            lead = self.team_lead
+            data["team_lead"] = {
+                name: getattr(lead, name) for name in fields["team_lead"] or TEAM_LEAD_FIELDS
+            } if lead else None
+        if "members" in fields:
+            data["members"] = [member.to_dict(fields["members"]) for member in self.members]
+        if "cases" in fields:
+            data["cases"] = [case.title for case in self.cases]
+        if "artifacts" in fields:
+            data["artifacts"] = self.artifacts.to_dict() if self.artifacts else None
+        if "reviews" in fields:
+            # Оценки команды
+            data["reviews"] = [{
                 "jury_id": review.jury_id,
                 "criteria": {
                     "criterion_1": review.criterion_1,
@@ -32,28 +54,14 @@ class Team(db.Model):
                     "criterion_5": review.criterion_5
                 },
                 "comment": review.comment
-            })
-
-        return {
-            "team_id": self.team_id,
-            "team_name": self.team_name,
-            "description": self.description,
-            "team_lead": {
-                "user_id": self.team_lead.user_id,
-                "username": self.team_lead.username,
-                "full_name": self.team_lead.full_name
-            } if self.team_lead else None,
-            "members": [member.to_dict() for member in self.members],
-            "cases": [case.title for case in self.cases],
-            "artifacts": self.artifacts.to_dict() if self.artifacts else None,
-            "reviews": review_data  # Добавляем оценки
-        }
+            } for review in self.artifact_reviews]
+        return data
 
 
 class TeamMember(db.Model):
     __tablename__ = 'team_members'
     team_id = db.Column(db.Integer, db.ForeignKey('teams.team_id'), primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), primary_key=True, index=True)
 
 
 from backend.core import db
@@ -63,7 +71,12 @@ class TeamCase(db.Model):
     __tablename__ = 'team_cases'
     id = db.Column(db.Integer, primary_key=True)
     team_id = db.Column(db.Integer, db.ForeignKey('teams.team_id'))  # фикс тут
-    case_id = db.Column(db.Integer, db.ForeignKey('hackathon_cases.case_id'))
+    case_id = db.Column(db.Integer, db.ForeignKey('hackathon_cases.case_id'), index=True)
+
+    # Уникальный индекс (team_id, case_id) также обслуживает поиск по team_id
+    __table_args__ = (
+        db.UniqueConstraint('team_id', 'case_id', name='uq_team_case'),
+    )
 
 
 class TeamArtifacts(db.Model):
@@ -95,7 +108,7 @@ class ArtifactReview(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
     jury_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
-    team_id = db.Column(db.Integer, db.ForeignKey('teams.team_id'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.team_id'), nullable=False, index=True)
 
     criterion_1 = db.Column(db.Integer, nullable=False)
     criterion_2 = db.Column(db.Integer, nullable=False)
@@ -111,3 +124,73 @@ class ArtifactReview(db.Model):
     __table_args__ = (
         db.UniqueConstraint('jury_id', 'team_id', name='uq_jury_team_review'),
     )
+
+
+class TeamScore(db.Model):
+    """Агрегат оценок команды, обновляется вместе с каждой оценкой жюри"""
+    __tablename__ = 'team_scores'
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.team_id'), primary_key=True)
+
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    criterion_1_sum = db.Column(db.Integer, nullable=False, default=0)
+    criterion_2_sum = db.Column(db.Integer, nullable=False, default=0)
+    criterion_3_sum = db.Column(db.Integer, nullable=False, default=0)
+    criterion_4_sum = db.Column(db.Integer, nullable=False, default=0)
+    criterion_5_sum = db.Column(db.Integer, nullable=False, default=0)
+    total_sum = db.Column(db.Integer, nullable=False, default=0)
+    mean_total = db.Column(db.Float, nullable=False, default=0.0)
+
+    # Средний z-score по жюри; NULL означает, что значение нужно пересчитать
+    normalized_mean = db.Column(db.Float, nullable=True)
+
+    team = db.relationship('Team', backref=db.backref('score', uselist=False))
+
+    __table_args__ = (
+        db.Index('ix_team_scores_rank', mean_total.desc(), team_id),
+        db.Index('ix_team_scores_normalized_rank', normalized_mean.desc(), team_id),
+    )
+
+    def to_dict(self):
+        count = self.review_count or 1
+        return {
+            "team_id": self.team_id,
+            "review_count": self.review_count,
+            "criteria": {
+                f"criterion_{i}": getattr(self, f"criterion_{i}_sum") / count for i in range(1, 6)
+            },
+            "total": self.total_sum,
+            "mean": self.mean_total,
+            "normalized_mean": self.normalized_mean
+        }
+
+
+class JuryScoreStats(db.Model):
+    """Статистика оценок одного члена жюри для нормализации по z-score"""
+    __tablename__ = 'jury_score_stats'
+    jury_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), primary_key=True)
+
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    total_sum = db.Column(db.Integer, nullable=False, default=0)
+    total_sq_sum = db.Column(db.Integer, nullable=False, default=0)
+
+    def mean_std(self):
+        if not self.review_count:
+            return 0.0, 0.0
+        mean = self.total_sum / self.review_count
+        variance = max(self.total_sq_sum / self.review_count - mean * mean, 0.0)
+        return mean, variance ** 0.5
+
+
+class ReviewAssignment(db.Model):
+    """Очередь проверки: команда, назначенная члену жюри"""
+    __tablename__ = 'review_assignments'
+    id = db.Column(db.Integer, primary_key=True)
+
+    jury_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+    team_id = db.Column(db.Integer, db.ForeignKey('teams.team_id'), nullable=False)
+    reviewed = db.Column(db.Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('team_id', 'jury_id', name='uq_review_assignment'),
+        db.Index('ix_review_assignments_queue', 'jury_id', 'reviewed', 'team_id'),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import BigInteger, Column, String
+
+from backend.core import db
+
+
+class ResourceVersion(db.Model):
+    """Счётчик изменений семейства ресурсов (кейсы, команды, пользователи) для ETag"""
+    __tablename__ = 'resource_versions'
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+
+    def __repr__(self):
+        return f"<ResourceVersion {self.name}={self.version}>"
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+
+from flask import send_file
+from flask_restx import Api
+
+
+class HackathonApi(Api):
+    """Api с заранее собранной спецификацией и отключаемым Swagger UI.
+
+    swagger.json собирается при сборке командой `flask openapi export` и отдаётся файлом: воркерам не нужно
+    строить схему из всех api.model при первом обращении. В файл записываются пространства имён и отпечаток
+    маршрутов и моделей; если они не совпадают с приложением (другой API_NAMESPACES, изменившийся код),
+    а также при DEBUG или без файла схема строится как обычно.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._default_doc = self._doc
+
+    def init_app(self, app, **kwargs):
+        self._doc = self._default_doc if app.config["SWAGGER_UI"] else False
+        super().init_app(app, **kwargs)
+
+    def fingerprint(self):
+        """Отпечаток маршрутов и моделей: меняется вместе с кодом, от которого зависит схема"""
+        routes = sorted(
+            [self.ns_paths.get(ns) or ns.path, list(route.urls), route.resource.__name__,
+             sorted(route.resource.methods or ())]
+            for ns in self.namespaces for route in ns.resources
+        )
+        models = sorted([name, sorted(model.keys()) if hasattr(model, "keys") else None]
+                        for name, model in self.models.items())
+        return hashlib.sha1(json.dumps([routes, models]).encode()).hexdigest()
+
+    def namespace_paths(self):
+        return sorted(path for path in self.ns_paths.values() if path)
+
+    def use_prebuilt_spec(self, app):
+        """Отдавать swagger.json из OPENAPI_SPEC_FILE, если файл собран для этого набора пространств имён
+        и этого кода; вызывается после регистрации пространств имён"""
+        spec_file = app.config["OPENAPI_SPEC_FILE"]
+        if not spec_file or app.debug or not os.path.isfile(spec_file):
+            return False
+
+        with open(spec_file, encoding="utf-8") as file:
+            spec = json.load(file)
+        if spec.get("x-namespaces") != self.namespace_paths() or spec.get("x-fingerprint") != self.fingerprint():
+            app.logger.warning("%s собран для других пространств имён или кода, схема строится заново", spec_file)
+            return False
+
+        app.view_functions[self.endpoint("specs")] = lambda: send_file(
+            spec_file, mimetype="application/json", conditional=True, max_age=0
+        )
+        return True
+
+    def export_spec(self, app):
+        """Схема API в виде словаря; url_for внутри схемы требует контекста запроса"""
+        with app.test_request_context():
+            schema = dict(self.__schema__)
+        schema["x-namespaces"] = self.namespace_paths()
+        schema["x-fingerprint"] = self.fingerprint()
+        return schema
@@ -0,0 +1,191 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+
+from flask import g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+
+from .config import flag
+
+PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+ARTIFACT_KINDS = ("txt", "pstats", "html")
+
+
+class RequestProfiler:
+    """Профилирование отдельного запроса по требованию администратора.
+
+    Запускается заголовком X-Profile: 1 или параметром _profile=1: снимаются дерево вызовов (cProfile
+    или pyinstrument) и разница снимков tracemalloc, отчёт сохраняется в PROFILING_DIR и доступен
+    по id из заголовка X-Profile-Id. Без триггера стоимость — одна проверка заголовка и параметра.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        self.engine = "cprofile"
+        self.top = 25
+        self.keep = 50
+        # tracemalloc глобален для процесса: трассировку запускает первый профилируемый запрос
+        # и останавливает последний из одновременно идущих
+        self._tracing_lock = threading.Lock()
+        self._tracing_requests = 0
+        self._owns_tracing = False
+
+    def init_app(self, app):
+        config = app.config
+        self.enabled = flag(config["PROFILING_ENABLED"])
+        self.directory = config["PROFILING_DIR"]
+        self.engine = config["PROFILING_ENGINE"]
+        self.top = config["PROFILING_TOP"]
+        self.keep = config["PROFILING_KEEP"]
+        if not self.enabled:
+            return
+
+        if self.engine == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError as e:
+                raise RuntimeError("Для PROFILING_ENGINE=pyinstrument установите пакет pyinstrument") from e
+        elif self.engine != "cprofile":
+            raise RuntimeError(f"Неизвестный PROFILING_ENGINE: {self.engine}")
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+
+    @staticmethod
+    def _requested():
+        return request.headers.get("X-Profile") == "1" or request.args.get("_profile") == "1"
+
+    @staticmethod
+    def _is_admin():
+        try:
+            verify_jwt_in_request(optional=True)
+        except (JWTExtendedException, PyJWTError):
+            return False
+        return get_jwt().get("role") == "admin"
+
+    def _start(self):
+        if not self._requested() or not self._is_admin():
+            return
+
+        # В снимки попадут и выделения параллельных запросов
+        self._acquire_tracing()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+        if self.engine == "pyinstrument":
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        g.request_profile = {"profiler": profiler, "snapshot": snapshot, "started": time.perf_counter()}
+
+    def _acquire_tracing(self):
+        with self._tracing_lock:
+            if self._tracing_requests == 0:
+                self._owns_tracing = not tracemalloc.is_tracing()
+                if self._owns_tracing:
+                    tracemalloc.start()
+            self._tracing_requests += 1
+
+    def _release_tracing(self):
+        with self._tracing_lock:
+            self._tracing_requests -= 1
+            if self._tracing_requests == 0 and self._owns_tracing:
+                # Трассировку, включённую не профилировщиком (PYTHONTRACEMALLOC), не трогаем
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    def _finish(self, response):
+        state = g.pop("request_profile", None)
+        if state is None:
+            return response
+
+        profiler = state["profiler"]
+        elapsed = time.perf_counter() - state["started"]
+        if self.engine == "pyinstrument":
+            profiler.stop()
+        else:
+            profiler.disable()
+
+        snapshot = tracemalloc.take_snapshot() if state["snapshot"] is not None and tracemalloc.is_tracing() else None
+        self._release_tracing()
+        allocations = snapshot.compare_to(state["snapshot"], "lineno") if snapshot else []
+
+        profile_id = uuid.uuid4().hex
+        self._save(profile_id, profiler, allocations, elapsed)
+        response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    def _teardown(self, exc):
+        # after_request не выполнился (исключение): профилировщик и счётчик трассировки освобождаются здесь
+        state = g.pop("request_profile", None)
+        if state is None:
+            return
+        if self.engine == "pyinstrument":
+            state["profiler"].stop()
+        else:
+            state["profiler"].disable()
+        self._release_tracing()
+
+    def _save(self, profile_id, profiler, allocations, elapsed):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile_id)
+
+        report = io.StringIO()
+        report.write(f"{request.method} {request.full_path}\nendpoint: {request.endpoint}\n"
+                     f"elapsed: {elapsed * 1000:.1f} ms\n\n")
+        if self.engine == "pyinstrument":
+            report.write(profiler.output_text(unicode=True))
+            with open(f"{base}.html", "w", encoding="utf-8") as file:
+                file.write(profiler.output_html())
+        else:
+            profiler.dump_stats(f"{base}.pstats")
+            stats = pstats.Stats(profiler, stream=report)
+            stats.sort_stats("cumulative").print_stats(self.top * 2)
+
+        report.write(f"\nВыделения памяти за запрос (top {self.top}):\n")
+        for stat in allocations[:self.top]:
+            report.write(f"{stat}\n")
+
+        with open(f"{base}.txt", "w", encoding="utf-8") as file:
+            file.write(report.getvalue())
+        self._prune()
+
+    def _prune(self):
+        reports = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith(".txt")),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in reports[:max(len(reports) - self.keep, 0)]:
+            profile_id = entry.name[:-len(".txt")]
+            for extension in ARTIFACT_KINDS:
+                try:
+                    os.remove(os.path.join(self.directory, f"{profile_id}.{extension}"))
+                except FileNotFoundError:
+                    pass
+
+    def list_profiles(self):
+        """Сохранённые профили, новые первыми"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        reports = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith(".txt")),
+                         key=lambda entry: entry.stat().st_mtime, reverse=True)
+        return [{"profile_id": entry.name[:-len(".txt")], "created_at": entry.stat().st_mtime} for entry in reports]
+
+    def artifact_path(self, profile_id, kind="txt"):
+        """Путь к файлу профиля или None, если id или тип некорректны либо файла нет"""
+        if kind not in ARTIFACT_KINDS or not PROFILE_ID.match(profile_id or "") or not self.directory:
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.{kind}")
+        return path if os.path.isfile(path) else None
@@ -0,0 +1,55 @@
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class RoleRegistry:
+    """Справочник ролей в памяти процесса: таблица roles крошечная и почти не меняется"""
+
+    def __init__(self):
+        self._ids = {}
+        self._names = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        from backend.core.models.auth_models import Role
+
+        for name in ("after_insert", "after_update", "after_delete"):
+            if not event.contains(Role, name, self._on_role_change):
+                event.listen(Role, name, self._on_role_change)
+
+        # Прогрев при старте; если таблиц ещё нет (до миграций), справочник загрузится при первом обращении
+        with app.app_context():
+            try:
+                self.reload()
+            except SQLAlchemyError:
+                self.invalidate()
+
+    def _on_role_change(self, mapper, connection, target):
+        self.invalidate()
+
+    def reload(self):
+        from backend.core import db
+        from backend.core.models.auth_models import Role
+
+        rows = db.session.query(Role.role_id, Role.role_name).all()
+        with self._lock:
+            self._ids = {role_name: role_id for role_id, role_name in rows}
+            self._names = {role_id: role_name for role_id, role_name in rows}
+            self._loaded = True
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def id_of(self, role_name):
+        if not self._loaded or role_name not in self._ids:
+            self.reload()
+        return self._ids.get(role_name)
+
+    def name_of(self, role_id):
+        if not self._loaded or role_id not in self._names:
+            self.reload()
+        return self._names.get(role_id)
@@ -6,6 +6,13 @@ hackathon_case_model = api.model('HackathonCase', {
     'title': fields.String(required=True, description="Название кейса хакатона"),
     'description': fields.String(required=True, description="Описание кейса хакатона"),
     'file': fields.String(description="Загрузите файл с подробным ТЗ (PDF или DOCX)", required=True),
+    'capacity': fields.Integer(required=False, min=0, description="Максимум команд на кейс; пусто — без ограничения"),
+})
+assign_cases_model = api.model('AssignCases', {
+    'mode': fields.String(required=False, enum=['full', 'incremental'],
+                          description="full — перераспределить всех, incremental — только команды без кейса"),
+    'seed': fields.Integer(required=False, description="Seed для воспроизводимого распределения"),
+    'preferences': fields.Raw(required=False, description="Предпочтения: {\"название команды\": [case_id, ...]}"),
 })
 artifact_review_model = api.model('ArtifactReview', {
     'criterion_1': fields.Integer(required=True, min=1, max=10, description="Критерий 1"),
@@ -9,7 +9,8 @@ team_model = api.model('Team', {
 
 team_invite_model = api.model('TeamInvite', {
     'team_name': fields.String(required=True, description='Название команды'),
-    'username': fields.String(required=True, description='Имя пользователя для приглашения'),
+    'username': fields.String(required=False, description='Имя пользователя для приглашения'),
+    'usernames': fields.List(fields.String, required=False, description='Несколько пользователей за один запрос'),
 })
 
 team_artifacts = api.model("TeamArtifacts", {
@@ -0,0 +1,114 @@
+import gzip
+
+import orjson
+from flask import current_app, make_response, request
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+COMPRESSORS = ("br", "gzip")
+
+# Ключи-не-строки приводятся к строкам, как у json.dumps
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+
+def output_json(data, code, headers=None):
+    """JSON-ответ через orjson: UTF-8 без экранирования кириллицы, отступы только при DEBUG"""
+    option = (JSON_OPTIONS | orjson.OPT_INDENT_2) if current_app.debug else JSON_OPTIONS
+    response = make_response(orjson.dumps(data, option=option), code)
+    response.headers.extend(headers or {})
+    response.vary.add("Accept")
+    return response
+
+
+def output_msgpack(data, code, headers=None):
+    import msgpack
+
+    response = make_response(msgpack.packb(data, use_bin_type=True), code)
+    response.headers.extend(headers or {})
+    response.vary.add("Accept")
+    return response
+
+
+class ResponseEncoding:
+    """Представления ответов flask-restx и сжатие больших тел.
+
+    JSON кодируется orjson, по Accept: application/msgpack — MessagePack (API_MSGPACK). Тела из
+    COMPRESS_MIMETYPES длиннее COMPRESS_MIN_SIZE байт сжимаются brotli или gzip по Accept-Encoding;
+    файлы и потоковые ответы не трогаются.
+    """
+
+    def __init__(self):
+        self._api = None
+        self.algorithms = []
+        self.min_size = 1024
+        self.mimetypes = set()
+        self.gzip_level = 6
+        self.brotli_quality = 5
+
+    def init_app(self, app, api):
+        config = app.config
+        self._api = api
+        self.algorithms = config["COMPRESS_ALGORITHMS"]
+        self.min_size = config["COMPRESS_MIN_SIZE"]
+        self.mimetypes = set(config["COMPRESS_MIMETYPES"])
+        self.gzip_level = config["COMPRESS_GZIP_LEVEL"]
+        self.brotli_quality = config["COMPRESS_BROTLI_QUALITY"]
+
+        unknown = set(self.algorithms) - set(COMPRESSORS)
+        if unknown:
+            raise RuntimeError(f"Неизвестные COMPRESS_ALGORITHMS: {', '.join(sorted(unknown))}")
+        if "br" in self.algorithms:
+            try:
+                import brotli  # noqa: F401
+            except ImportError as e:
+                raise RuntimeError("Для сжатия br установите пакет brotli или уберите br из COMPRESS_ALGORITHMS") \
+                    from e
+
+        api.representations[JSON_MIMETYPE] = output_json
+        if config["API_MSGPACK"]:
+            try:
+                import msgpack  # noqa: F401
+            except ImportError as e:
+                raise RuntimeError("Для API_MSGPACK установите пакет msgpack") from e
+            api.representations[MSGPACK_MIMETYPE] = output_msgpack
+        else:
+            api.representations.pop(MSGPACK_MIMETYPE, None)
+
+        if self.algorithms:
+            app.after_request(self._compress)
+
+    def mediatype(self):
+        """Представление, которое flask-restx выберет для текущего запроса"""
+        return request.accept_mimetypes.best_match(self._api.representations, default=self._api.default_mediatype)
+
+    def encoding(self):
+        """Сжатие, которое получит большой ответ на текущий запрос, или None"""
+        return request.accept_encodings.best_match(self.algorithms) if self.algorithms else None
+
+    def variant(self):
+        """Метка представления для ETag: разные тела одного URL не должны получать один ETag"""
+        return f"{self.mediatype()};{self.encoding()}"
+
+    def _compress(self, response):
+        if (response.direct_passthrough or response.is_streamed or not 200 <= response.status_code < 300
+                or response.status_code == 204 or "Content-Encoding" in response.headers
+                or response.mimetype not in self.mimetypes):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = self.encoding()
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        if encoding == "br":
+            import brotli
+
+            response.set_data(brotli.compress(data, quality=self.brotli_quality))
+        else:
+            # mtime=0: одинаковые тела дают одинаковые байты
+            response.set_data(gzip.compress(data, compresslevel=self.gzip_level, mtime=0))
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,102 @@
+import heapq
+import random
+
+from sqlalchemy import delete, func, insert, select
+
+from backend.core import db
+from backend.core.models.hackathon_model import HackathonCase
+from backend.core.models.team_models import Team, TeamCase
+
+
+def plan_assignment(team_ids, capacities, preferences=None, seed=None, load=None):
+    """Распределение команд по кейсам в памяти.
+
+    capacities: {case_id: вместимость или None (без ограничения)};
+    preferences: {team_id: [case_id, ...]} в порядке убывания желания;
+    load: уже занятые места по кейсам при дозаполнении.
+    Возвращает ({team_id: case_id}, [team_id без места]). При одном seed результат одинаков.
+    """
+    rng = random.Random(seed)
+    preferences = preferences or {}
+    load = {case_id: (load or {}).get(case_id, 0) for case_id in capacities}
+
+    def has_room(case_id):
+        capacity = capacities[case_id]
+        return capacity is None or load[case_id] < capacity
+
+    # Порядок кейсов тоже перемешивается, чтобы при равной загрузке первый кейс не получал всех «лишних»
+    case_order = sorted(capacities)
+    rng.shuffle(case_order)
+    heap = [(load[case_id], position, case_id) for position, case_id in enumerate(case_order)]
+    heapq.heapify(heap)
+
+    teams = sorted(team_ids)
+    rng.shuffle(teams)
+
+    placement = {}
+    unplaced = []
+    for team_id in teams:
+        case_id = next((case for case in preferences.get(team_id, ()) if case in capacities and has_room(case)), None)
+
+        if case_id is None:
+            # Наименее загруженный кейс с местом; устаревшие записи кучи отбрасываются лениво
+            while heap:
+                heap_load, position, candidate = heap[0]
+                if heap_load != load[candidate]:
+                    heapq.heapreplace(heap, (load[candidate], position, candidate))
+                elif not has_room(candidate):
+                    heapq.heappop(heap)
+                else:
+                    case_id = candidate
+                    break
+
+        if case_id is None:
+            unplaced.append(team_id)
+            continue
+
+        placement[team_id] = case_id
+        load[case_id] += 1
+        if heap and heap[0][2] == case_id:
+            heapq.heapreplace(heap, (load[case_id], heap[0][1], case_id))
+
+    return placement, unplaced
+
+
+def assign_cases(seed=None, preferences=None, incremental=False):
+    """Назначение кейсов командам: полное перераспределение или дозаполнение команд без кейса.
+
+    preferences: {team_name: [case_id, ...]}. Запись в team_cases — одно удаление и одна вставка пачкой.
+    """
+    capacities = dict(db.session.execute(select(HackathonCase.case_id, HackathonCase.capacity)).all())
+    team_names = dict(db.session.execute(select(Team.team_id, Team.team_name)).all())
+    if not team_names or not capacities:
+        return None, {"message": "Нет доступных команд или кейсов."}, 400
+
+    team_ids = {name: team_id for team_id, name in team_names.items()}
+    team_preferences = {team_ids[name]: cases for name, cases in (preferences or {}).items() if name in team_ids}
+
+    load = None
+    if incremental:
+        load = dict(db.session.execute(
+            select(TeamCase.case_id, func.count()).group_by(TeamCase.case_id)
+        ).all())
+        placed = set(db.session.scalars(select(TeamCase.team_id).distinct()))
+        team_names = {team_id: name for team_id, name in team_names.items() if team_id not in placed}
+
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    placement, unplaced = plan_assignment(team_names, capacities, team_preferences, seed, load)
+
+    if not incremental:
+        db.session.execute(delete(TeamCase))
+    if placement:
+        db.session.execute(insert(TeamCase), [
+            {"team_id": team_id, "case_id": case_id} for team_id, case_id in placement.items()
+        ])
+    db.session.commit()
+
+    return {
+        "assigned": len(placement),
+        "unassigned": sorted(team_names[team_id] for team_id in unplaced),
+        "seed": seed,
+    }, None, 200
@@ -1,33 +1,46 @@
-from flask_jwt_extended import create_access_token
+from flask import g
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, make_transient_to_detached
 
 from backend.core import db
-from backend.core.models.auth_models import User, Role
+from backend.core.extensions import resource_versions, role_registry, user_cache
+from backend.core.metrics import LOGIN_HASH_TIME
+from backend.core.models.auth_models import USER_FIELDS, User, user_columns
+from backend.core.services.fieldsets import parse_fieldset
+from backend.core.services.review_service import assign_jury, release_jury
 
 
 def get_user_by_username(username):
     return User.query.filter_by(username=username).first()
 
 
-def get_role_by_name(role_name):
-    return Role.query.filter_by(role_name=role_name).first()
+def parse_user_fields(args):
+    """fields= для списков пользователей: (набор полей или None, ошибка)"""
+    return parse_fieldset(args, USER_FIELDS)
 
 
-def get_all_users(role=None):
+def users_query(role=None, fields=None):
     query = User.query
 
     if role:
-        query = query.filter(User.role.has(role_name=role))
+        query = query.filter(User.system_role_id == role_registry.id_of(role))
+    if fields is not None:
+        query = query.options(load_only(*user_columns(fields)))
+
+    return query
 
-    users = query.all()
-    return users
+
+def get_all_users(role=None):
+    return users_query(role).all()
 
 
 def create_user(username, email, password, full_name, phone, university, study_info, system_role_name, project_role):
     if User.query.filter((User.username == username) | (User.email == email)).first():
         return None
 
-    system_role = get_role_by_name(system_role_name)
-    if not system_role:
+    system_role_id = role_registry.id_of(system_role_name)
+    if not system_role_id:
         return None
 
     new_user = User(
@@ -37,41 +50,120 @@ def create_user(username, email, password, full_name, phone, university, study_i
         phone=phone,
         university=university,
         study_info=study_info,
-        system_role_id=system_role.role_id,
+        system_role_id=system_role_id,
         project_role=project_role
     )
     new_user.set_password(password)
 
     db.session.add(new_user)
+    if system_role_name == "jury":
+        db.session.flush()
+        assign_jury(new_user.user_id)
     db.session.commit()
     return new_user
 
 
 def delete_user(username):
-    user = get_user_by_username(username)
-    if user:
-        db.session.delete(user)
-        db.session.commit()
-        return True
-    return False
+    return remove_user(get_user_by_username(username))
+
+
+def remove_user(user):
+    if not user:
+        return False
+    if user.role_name == "jury":
+        release_jury(user.user_id)
+    db.session.delete(user)
+    db.session.commit()
+    user_cache.invalidate(user.user_id)
+    return True
 
 
 def authenticate_user(username, password, required_role=None):
-    user = get_user_by_username(username)
-    if not user or not user.check_password(password):
+    """Вход: один запрос пользователя и одна проверка хеша, роль берётся из справочника"""
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        return None
+    with LOGIN_HASH_TIME.labels(required_role or "any").time():
+        password_ok = user.check_password(password)
+    if not password_ok:
         return None
 
-    if required_role and user.role.role_name != required_role:
+    role_name = user.role_name
+    if required_role and role_name.lower() != required_role.lower():
         return None
 
-    return create_access_token(identity=user.username, additional_claims={"role": user.system_role.role_name})
+    if user.needs_rehash():
+        user.set_password(password)
+        db.session.commit()
+
+    return create_access_token(identity=str(user.user_id),
+                               additional_claims={"role": role_name, "username": user.username})
+
+
+def get_current_user_id():
+    """user_id из токена без обращения к базе"""
+    if "username" in get_jwt():
+        return int(get_jwt_identity())
+    user = get_current_user()
+    return user.user_id if user else None
+
+
+def get_current_user():
+    """Текущий пользователь: не больше одного поиска за запрос, обычно из кэша процесса"""
+    if "current_user" in g:
+        return g.current_user
+
+    if "username" not in get_jwt():
+        # Токены, выданные до появления user_id в identity, содержат username
+        user = get_user_by_username(get_jwt_identity())
+    else:
+        user = _load_user(int(get_jwt_identity()))
+
+    g.current_user = user
+    return user
+
+
+def _load_user(user_id):
+    """Пользователь из кэша процесса, если с момента записи в кэш таблица users не менялась.
+
+    Запись хранит версию семейства users: изменение в любом воркере её увеличивает, и чужие кэши
+    перестают отдавать запись не позже чем через RESOURCE_VERSION_TTL.
+    """
+    version = resource_versions.current(("users",)).get("users")
+    entry = user_cache.get(user_id)
+    if entry is not None and entry[0] == version:
+        cached = User(**entry[1])
+        make_transient_to_detached(cached)
+        return db.session.merge(cached, load=False)
+
+    user = db.session.get(User, user_id)
+    if user:
+        user_cache.set(user_id, (version, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}))
+    return user
+
+
+def invalidate_user(user):
+    user_cache.invalidate(user.user_id)
+    g.pop("current_user", None)
+
+
+def change_role(user, role_id):
+    """Сменить системную роль: новый член жюри получает часть очереди проверки, бывший — отдаёт свою"""
+    was_jury = user.role_name == "jury"
+    user.system_role_id = role_id
+    db.session.flush()
+    if user.role_name == "jury" and not was_jury:
+        assign_jury(user.user_id)
+    elif was_jury and user.role_name != "jury":
+        release_jury(user.user_id)
+    db.session.commit()
+    invalidate_user(user)
 
 
-def change_password(username, old_password, new_password):
-    user = get_user_by_username(username)
+def change_password(user, old_password, new_password):
     if user and user.check_password(old_password):
         user.set_password(new_password)
-        from backend.core import db
         db.session.commit()
+        invalidate_user(user)
         return True
     return False
@@ -0,0 +1,100 @@
+import csv
+import json
+
+from flask import current_app, stream_with_context
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
+from backend.core import db
+from backend.core.models.team_models import Team
+from backend.core.services.leaderboard_service import CRITERIA
+from backend.core.xlsx import iter_xlsx
+
+
+def _criterion_mean(score, criterion):
+    if not score or not score.review_count:
+        return None
+    return getattr(score, f"{criterion}_sum") / score.review_count
+
+
+ARTIFACT_FIELDS = ("github_url", "figma_url", "hosting_url", "presentation_url", "extra_links")
+
+EXPORT_COLUMNS = (
+    ("team_id", lambda team: team.team_id),
+    ("team_name", lambda team: team.team_name),
+    ("description", lambda team: team.description),
+    ("team_lead", lambda team: team.team_lead.username if team.team_lead else None),
+    ("members", lambda team: ", ".join(member.username for member in team.members)),
+    ("cases", lambda team: ", ".join(case.title for case in team.cases)),
+    *((name, lambda team, name=name: getattr(team.artifacts, name) if team.artifacts else None) for name in ARTIFACT_FIELDS),
+    ("review_count", lambda team: team.score.review_count if team.score else 0),
+    *((f"{criterion}_mean", lambda team, criterion=criterion: _criterion_mean(team.score, criterion)) for criterion in CRITERIA),
+    ("mean_total", lambda team: team.score.mean_total if team.score else None),
+    ("normalized_mean", lambda team: team.score.normalized_mean if team.score else None),
+)
+EXPORT_HEADER = [name for name, _ in EXPORT_COLUMNS]
+# Начало строки, с которого табличные редакторы читают ячейку CSV как формулу
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Line:
+    """Приёмник csv.writer: возвращает последнюю записанную строку"""
+
+    def write(self, line):
+        return line
+
+
+def iter_team_rows():
+    """Строки итогового протокола; команды читаются серверным курсором пачками по EXPORT_YIELD_PER"""
+    statement = (
+        select(Team)
+        .options(
+            joinedload(Team.team_lead),
+            joinedload(Team.artifacts),
+            joinedload(Team.score),
+            selectinload(Team.members),
+            selectinload(Team.cases),
+        )
+        .order_by(Team.team_id)
+        .execution_options(yield_per=current_app.config["EXPORT_YIELD_PER"])
+    )
+    for team in db.session.scalars(statement):
+        yield [getter(team) for _, getter in EXPORT_COLUMNS]
+
+
+def escape_formula(value):
+    """Текст из пользовательских полей не должен исполняться как формула при открытии CSV"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Line())
+    # BOM, чтобы Excel открывал кириллицу без выбора кодировки
+    yield "\ufeff" + writer.writerow(EXPORT_HEADER)
+    for row in rows:
+        yield writer.writerow([escape_formula(value) for value in row])
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_HEADER, row)), ensure_ascii=False) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", iter_csv),
+    "jsonl": ("application/x-ndjson; charset=utf-8", iter_jsonl),
+    # В XLSX строки пишутся как inlineStr и никогда не вычисляются: экранирование исказило бы значения
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+             lambda rows: iter_xlsx(EXPORT_HEADER, rows, sheet_name="Команды")),
+}
+
+
+def export_teams_response(fmt):
+    """Потоковый ответ с протоколом по командам; первый байт уходит до чтения всех команд"""
+    content_type, render = EXPORT_FORMATS[fmt]
+    response = current_app.response_class(stream_with_context(render(iter_team_rows())), content_type=content_type)
+    response.headers.set("Content-Disposition", "attachment", filename=f"teams.{fmt}")
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,43 @@
+from http import HTTPStatus
+
+
+def split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+def parse_fieldset(args, fields, relations=None):
+    """Разбор параметров fields и include: {поле: вложенные поля или None — все} в порядке fields.
+
+    fields перечисляет поля ответа, вложенные поля связей — через точку (members.username); include
+    добавляет связи к fields или к полям по умолчанию (всем, кроме связей), не расширяя вложенные поля,
+    выбранные в fields. Без обоих параметров — None, полный ответ.
+    relations — {связь: допустимые вложенные поля}.
+    """
+    requested, include = split_list(args.get("fields")), split_list(args.get("include"))
+    if not requested and not include:
+        return None, None
+
+    relations = relations or {}
+    for name in include:
+        if name not in relations:
+            return None, ({"message": f"Неизвестная связь '{name}' в параметре 'include'."}, HTTPStatus.BAD_REQUEST)
+    if not requested:
+        requested = [name for name in fields if name not in relations]
+
+    selected = {}
+    for item in requested:
+        name, _, nested = item.partition(".")
+        if name not in fields or (nested and nested not in relations.get(name, ())):
+            return None, ({"message": f"Неизвестное поле '{item}' в параметре 'fields'."}, HTTPStatus.BAD_REQUEST)
+        if not nested:
+            selected[name] = None
+        elif selected.get(name, ()) is not None:
+            selected[name] = selected.get(name, ()) + (nested,)
+    for name in include:
+        selected.setdefault(name, None)
+
+    # Канонический порядок: одинаковые наборы полей дают одинаковые ключи кэша
+    return {
+        name: None if selected[name] is None else tuple(key for key in relations[name] if key in selected[name])
+        for name in fields if name in selected
+    }, None
@@ -1,10 +1,23 @@
-import os
-import random
-
 from backend.core import db
+from backend.core.extensions import case_file_cache, response_cache
 from backend.core.models.hackathon_model import HackathonCase
-from backend.core.models.team_models import Team
-from backend.core.services.utilits import save_file
+from backend.core.services.pagination import paginate
+from backend.core.services.storage_service import purge_uploads, release_upload, store_upload
+
+
+def parse_capacity(data):
+    """Вместимость кейса из данных формы: целое >= 0 или пусто (без ограничения)"""
+    capacity = data.get('capacity')
+    if capacity is None or capacity == "":
+        return None, None
+    try:
+        capacity = int(capacity)
+    except (TypeError, ValueError):
+        return None, {"message": "Вместимость кейса должна быть целым числом."}
+    if capacity < 0:
+        return None, {"message": "Вместимость кейса не может быть отрицательной."}
+    return capacity, None
+
 
 def create_hackathon_case(data, file):
     """Создание нового кейса хакатона"""
@@ -17,12 +30,17 @@ def create_hackathon_case(data, file):
     if not file:
         return None, {"message": "Файл с подробным ТЗ обязателен."}, 400
 
-    original_filename, file_url = save_file(file)
+    capacity, error = parse_capacity(data)
+    if error:
+        return None, error, 400
+
+    original_filename, file_url = store_upload(file)
     if not file_url:
         return None, {"message": "Неверный формат файла. Разрешены только PDF и DOCX."}, 400
 
     # Сохраняем кейс в базе данных с оригинальным именем файла
-    new_case = HackathonCase(title=title, description=description, file_url=file_url, original_filename=original_filename)
+    new_case = HackathonCase(title=title, description=description, file_url=file_url, original_filename=original_filename,
+                             capacity=capacity)
     db.session.add(new_case)
     db.session.commit()
 
@@ -42,14 +60,25 @@ def update_hackathon_case(case_id, data, file):
         case.title = title
     if description:
         case.description = description
+    if 'capacity' in data:
+        capacity, error = parse_capacity(data)
+        if error:
+            return None, error, 400
+        case.capacity = capacity
 
     if file:
-        file_url = save_file(file)
+        original_filename, file_url = store_upload(file)
         if not file_url:
             return None, {"message": "Неверный формат файла. Разрешены только PDF и DOCX."}, 400
+        stale_file = release_upload(case.file_url)
+        case_file_cache.invalidate(case.file_url)
         case.file_url = file_url
+        case.original_filename = original_filename
+    else:
+        stale_file = None
 
     db.session.commit()
+    purge_uploads(stale_file)
     return case, None, 200
 
 
@@ -59,44 +88,31 @@ def delete_hackathon_case(case_id):
     if not case:
         return {"message": "Кейс не найден."}, 404
 
-    file_path = case.file_url
-
-    if file_path and os.path.exists(file_path):
-        try:
-            os.remove(file_path)
-        except Exception as e:
-            return {"message": f"Кейс удалён, но не удалось удалить файл: {str(e)}"}, 500
-
+    stale_file = release_upload(case.file_url)
     db.session.delete(case)
     db.session.commit()
+    case_file_cache.invalidate(case.file_url)
+    purge_uploads(stale_file)
     return {"message": "Кейс и связанный файл успешно удалены"}, 200
 
-def assign_cases_evenly():
-    teams = Team.query.all()
-    cases = HackathonCase.query.all()
-
-    if not teams or not cases:
-        return {"message": "Нет доступных команд или кейсов."}, 400
-
-    random.shuffle(teams)
 
-    # Создаём пустые "ведра" для кейсов
-    case_buckets = {case.case_id: [] for case in cases}
+def get_case_download_name(file_url):
+    """Оригинальное имя файла кейса; горячие скачивания обходятся без запроса к базе"""
+    download_name = case_file_cache.get(file_url)
+    if download_name is not None:
+        return download_name
 
-    # Распределяем команды по кейсам по кругу
-    for idx, team in enumerate(teams):
-        case_id = cases[idx % len(cases)].case_id
-        case_buckets[case_id].append(team)
+    case = HackathonCase.query.filter_by(file_url=file_url).first()
+    if not case:
+        return None
 
-    # Очищаем старые связи (если нужно)
-    for team in teams:
-        team.cases.clear()
+    download_name = case.original_filename or case.file_url
+    case_file_cache.set(file_url, download_name)
+    return download_name
 
-    # Добавляем новые связи
-    for case_id, team_list in case_buckets.items():
-        case = HackathonCase.query.get(case_id)
-        for team in team_list:
-            team.cases.append(case)
 
-    db.session.commit()
-    return {"message": "Кейсы успешно распределены по командам."}, 200
\ No newline at end of file
+@response_cache.cached("cases_page", "cases")
+def get_cases_page(limit, after=None):
+    """Сериализованная страница списка кейсов"""
+    cases, next_cursor = paginate(HackathonCase.query, HackathonCase.case_id, limit, after)
+    return {"cases": [case.to_dict() for case in cases], "next_cursor": next_cursor}
@@ -0,0 +1,341 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from itertools import islice
+
+from flask import current_app
+from sqlalchemy import insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash
+
+from backend.core import db
+from backend.core.extensions import role_registry
+from backend.core.models.auth_models import User
+from backend.core.models.team_models import Team, TeamMember
+
+IMPORT_FORMATS = ("csv", "json", "jsonl")
+PARTICIPANT_FIELDS = ("username", "email", "password", "full_name", "phone", "university", "study_info")
+MEMBER_SEPARATORS = re.compile(r"[;,\s]+")
+
+# Пул хеширования паролей: один на процесс, создаётся при первом импорте. spawn — воркеры не наследуют
+# соединения БД и потоки приложения; pid — после fork (Gunicorn) потомок создаёт свой пул
+_hash_pool = None
+_hash_pool_key = None
+_hash_pool_lock = threading.Lock()
+
+
+def import_format(file, requested=None):
+    """Формат файла импорта: явный параметр или расширение имени файла"""
+    fmt = (requested or file.filename.rsplit(".", 1)[-1]).lower()
+    if fmt == "ndjson":
+        fmt = "jsonl"
+    return fmt if fmt in IMPORT_FORMATS else None
+
+
+def read_import_rows(file, fmt):
+    """Потоковое чтение строк импорта: (номер строки, словарь или None, ошибка или None)"""
+    text = io.TextIOWrapper(file.stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {key.strip(): value for key, value in row.items() if key}, None
+        return
+
+    if fmt == "json":
+        try:
+            rows = json.load(text)
+        except ValueError:
+            yield 1, None, "Невалидный JSON"
+            return
+        if not isinstance(rows, list):
+            yield 1, None, "Ожидается JSON-массив объектов"
+            return
+        for index, row in enumerate(rows, start=1):
+            yield (index, row, None) if isinstance(row, dict) else (index, None, "Элемент должен быть JSON-объектом")
+        return
+
+    for line_num, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_num, None, "Невалидный JSON"
+            continue
+        if not isinstance(row, dict):
+            yield line_num, None, "Строка должна быть JSON-объектом"
+            continue
+        yield line_num, row, None
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def column_limit(model, name):
+    return getattr(model.__table__.c[name].type, "length", None)
+
+
+def validate_participant(row):
+    values = {}
+    for name in PARTICIPANT_FIELDS:
+        value = row.get(name)
+        value = value.strip() if isinstance(value, str) else value
+        if not value:
+            return None, f"Поле '{name}' обязательно"
+        if not isinstance(value, str):
+            return None, f"Поле '{name}' должно быть строкой"
+        limit = column_limit(User, name) if name != "password" else None
+        if limit and len(value) > limit:
+            return None, f"Поле '{name}' длиннее {limit} символов"
+        values[name] = value
+
+    project_role = row.get("project_role") or None
+    if project_role is not None and not isinstance(project_role, str):
+        return None, "Поле 'project_role' должно быть строкой"
+    values["project_role"] = project_role
+    return values, None
+
+
+def hash_pool(workers):
+    """Общий пул процессов хеширования на workers процессов"""
+    global _hash_pool, _hash_pool_key
+    with _hash_pool_lock:
+        if _hash_pool is None or _hash_pool_key != (os.getpid(), workers):
+            if _hash_pool is not None and _hash_pool_key[0] == os.getpid():
+                _hash_pool.shutdown(wait=False)
+            _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _hash_pool_key = (os.getpid(), workers)
+        return _hash_pool
+
+
+def reset_hash_pool(pool):
+    """Забыть пул, процессы которого упали: следующий импорт создаст новый"""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False)
+
+
+def hash_passwords(workers, passwords):
+    """Хеширование паролей пачки; при нескольких workers — параллельно в общем пуле процессов"""
+    hasher = partial(generate_password_hash, method=current_app.config["PASSWORD_HASH_METHOD"])
+    if workers <= 1:
+        return [hasher(password) for password in passwords]
+    pool = hash_pool(workers)
+    try:
+        return list(pool.map(hasher, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+    except BrokenProcessPool:
+        reset_hash_pool(pool)
+        raise
+
+
+def insert_each(rows, insert_row):
+    """Вставка по одной строке в точках сохранения после конфликта пачки: номера вставленных строк.
+
+    rows — [(номер строки, данные)], insert_row(данные) выполняет вставку одной строки.
+    """
+    inserted = []
+    for line_num, row in rows:
+        try:
+            with db.session.begin_nested():
+                insert_row(row)
+        except IntegrityError:
+            continue
+        inserted.append(line_num)
+    db.session.commit()
+    return inserted
+
+
+def import_participants(rows):
+    """Массовая регистрация участников: проверка конфликтов одним запросом на пачку,
+    хеширование паролей в пуле процессов, вставка пачкой в отдельной транзакции"""
+    batch_size = current_app.config["IMPORT_BATCH_SIZE"]
+    workers = current_app.config["IMPORT_HASH_WORKERS"] or os.cpu_count() or 1
+    role_id = role_registry.id_of("user")
+
+    created = 0
+    errors = []
+    seen_usernames = set()
+    seen_emails = set()
+
+    for batch in batched(rows, batch_size):
+        candidates = []
+        for line_num, source, error in batch:
+            row = None
+            if not error:
+                row, error = validate_participant(source)
+            if not error and row["username"] in seen_usernames:
+                error = "username повторяется в файле"
+            if not error and row["email"] in seen_emails:
+                error = "email повторяется в файле"
+            if error:
+                errors.append({"row": line_num, "username": (row or source or {}).get("username"), "message": error})
+                continue
+            seen_usernames.add(row["username"])
+            seen_emails.add(row["email"])
+            candidates.append((line_num, row))
+
+        if not candidates:
+            continue
+
+        existing = db.session.execute(select(User.username, User.email).where(or_(
+            User.username.in_([row["username"] for _, row in candidates]),
+            User.email.in_([row["email"] for _, row in candidates]),
+        ))).all()
+        taken_usernames = {username for username, _ in existing}
+        taken_emails = {email for _, email in existing}
+
+        accepted = []
+        for line_num, row in candidates:
+            if row["username"] in taken_usernames:
+                errors.append({"row": line_num, "username": row["username"], "message": "username уже занят"})
+            elif row["email"] in taken_emails:
+                errors.append({"row": line_num, "username": row["username"], "message": "email уже занят"})
+            else:
+                accepted.append((line_num, row))
+
+        if not accepted:
+            continue
+
+        hashes = hash_passwords(workers, [row["password"] for _, row in accepted])
+        values = []
+        for (line_num, row), password_hash in zip(accepted, hashes):
+            row = dict(row, password_hash=password_hash, system_role_id=role_id)
+            del row["password"]
+            values.append((line_num, row))
+
+        try:
+            db.session.execute(insert(User), [row for _, row in values])
+            db.session.commit()
+        except IntegrityError:
+            # Конкурирующая регистрация заняла имя или почту между проверкой и вставкой: пачка вставляется
+            # построчно, чтобы отклонить только конфликтующие строки
+            db.session.rollback()
+            inserted = set(insert_each(values, lambda row: db.session.execute(insert(User), [row])))
+            errors.extend({"row": line_num, "username": row["username"], "message": "username или email уже занят"}
+                          for line_num, row in values if line_num not in inserted)
+            created += len(inserted)
+            continue
+        created += len(values)
+
+    errors.sort(key=lambda error: error["row"])
+    return {"created": created, "failed": len(errors), "errors": errors}
+
+
+def validate_roster(row):
+    team_name = row.get("team_name")
+    team_lead = row.get("team_lead")
+    description = row.get("description") or None
+    members = row.get("members") or []
+
+    if not isinstance(team_name, str) or not team_name.strip():
+        return None, "Поле 'team_name' обязательно"
+    if not isinstance(team_lead, str) or not team_lead.strip():
+        return None, "Поле 'team_lead' обязательно"
+    if description is not None and not isinstance(description, str):
+        return None, "Поле 'description' должно быть строкой"
+    if isinstance(members, str):
+        members = MEMBER_SEPARATORS.split(members)
+    if not isinstance(members, list) or not all(isinstance(member, str) for member in members):
+        return None, "Поле 'members' должно быть списком username"
+
+    team_name = team_name.strip()
+    for name, value in (("team_name", team_name), ("description", description)):
+        limit = column_limit(Team, name)
+        if value and len(value) > limit:
+            return None, f"Поле '{name}' длиннее {limit} символов"
+
+    team_lead = team_lead.strip()
+    # Тимлид всегда участник своей команды, как при создании команды через API
+    members = list(dict.fromkeys([team_lead] + [member.strip() for member in members if member.strip()]))
+    return {"team_name": team_name, "description": description, "team_lead": team_lead, "members": members}, None
+
+
+def import_team_rosters(rows):
+    """Массовое создание команд с участниками: названия и username пачки проверяются
+    одним запросом IN каждое, команды и членства вставляются пачкой в одной транзакции"""
+    batch_size = current_app.config["IMPORT_BATCH_SIZE"]
+
+    created = 0
+    members_added = 0
+    errors = []
+    seen_names = set()
+
+    for batch in batched(rows, batch_size):
+        candidates = []
+        for line_num, source, error in batch:
+            row = None
+            if not error:
+                row, error = validate_roster(source)
+            if not error and row["team_name"] in seen_names:
+                error = "Название команды повторяется в файле"
+            if error:
+                errors.append({"row": line_num, "team_name": (row or source or {}).get("team_name"), "message": error})
+                continue
+            seen_names.add(row["team_name"])
+            candidates.append((line_num, row))
+
+        if not candidates:
+            continue
+
+        taken_names = set(db.session.scalars(
+            select(Team.team_name).where(Team.team_name.in_([row["team_name"] for _, row in candidates]))
+        ))
+        usernames = {username for _, row in candidates for username in row["members"]}
+        user_ids = dict(db.session.execute(
+            select(User.username, User.user_id).where(User.username.in_(usernames))
+        ).all())
+
+        accepted = []
+        for line_num, row in candidates:
+            unknown = [username for username in row["members"] if username not in user_ids]
+            if row["team_name"] in taken_names:
+                errors.append({"row": line_num, "team_name": row["team_name"], "message": "Команда с таким названием уже существует"})
+            elif unknown:
+                errors.append({"row": line_num, "team_name": row["team_name"],
+                               "message": f"Пользователи не найдены: {', '.join(unknown)}"})
+            else:
+                accepted.append((line_num, row))
+
+        if not accepted:
+            continue
+
+        def insert_rosters(rosters):
+            team_ids = dict(db.session.execute(
+                insert(Team).returning(Team.team_name, Team.team_id),
+                [{"team_name": row["team_name"], "description": row["description"],
+                  "team_lead_id": user_ids[row["team_lead"]]} for row in rosters],
+            ).all())
+            db.session.execute(insert(TeamMember), [
+                {"team_id": team_ids[row["team_name"]], "user_id": user_ids[username]}
+                for row in rosters for username in row["members"]
+            ])
+
+        try:
+            insert_rosters([row for _, row in accepted])
+            db.session.commit()
+        except IntegrityError:
+            # Команду с тем же названием создали (или участника удалили) между проверкой и вставкой:
+            # пачка вставляется построчно, чтобы отклонить только конфликтующие строки
+            db.session.rollback()
+            inserted = set(insert_each(accepted, lambda row: insert_rosters([row])))
+            errors.extend({"row": line_num, "team_name": row["team_name"],
+                           "message": "Команда с таким названием уже существует или участник удалён"}
+                          for line_num, row in accepted if line_num not in inserted)
+            accepted = [(line_num, row) for line_num, row in accepted if line_num in inserted]
+        created += len(accepted)
+        members_added += sum(len(row["members"]) for _, row in accepted)
+
+    errors.sort(key=lambda error: error["row"])
+    return {"created": created, "members_added": members_added, "failed": len(errors), "errors": errors}
@@ -0,0 +1,186 @@
+from http import HTTPStatus
+
+from sqlalchemy import and_, func, or_, select, update
+
+from backend.core import db
+from backend.core.extensions import response_cache
+from backend.core.models.team_models import ArtifactReview, JuryScoreStats, Team, TeamScore
+from backend.core.services.pagination import is_id_key
+
+CRITERIA = ("criterion_1", "criterion_2", "criterion_3", "criterion_4", "criterion_5")
+REFRESH_CHUNK = 500
+
+
+def review_scores(review):
+    return tuple(getattr(review, criterion) for criterion in CRITERIA)
+
+
+def _get_team_score(team_id):
+    score = db.session.get(TeamScore, team_id)
+    if not score:
+        score = TeamScore(team_id=team_id, review_count=0, total_sum=0, mean_total=0.0,
+                          **{f"{criterion}_sum": 0 for criterion in CRITERIA})
+        db.session.add(score)
+    return score
+
+
+def _get_jury_stats(jury_id):
+    stats = db.session.get(JuryScoreStats, jury_id)
+    if not stats:
+        stats = JuryScoreStats(jury_id=jury_id, review_count=0, total_sum=0, total_sq_sum=0)
+        db.session.add(stats)
+    return stats
+
+
+def _apply(score, stats, scores, sign):
+    total = sum(scores)
+    for criterion, value in zip(CRITERIA, scores):
+        setattr(score, f"{criterion}_sum", getattr(score, f"{criterion}_sum") + sign * value)
+    score.review_count += sign
+    score.total_sum += sign * total
+    score.mean_total = score.total_sum / score.review_count if score.review_count else 0.0
+
+    stats.review_count += sign
+    stats.total_sum += sign * total
+    stats.total_sq_sum += sign * total * total
+
+
+def _reviewed_by(jury_ids):
+    return db.session.scalars(
+        select(ArtifactReview.team_id).where(ArtifactReview.jury_id.in_(jury_ids)).distinct()
+    ).all()
+
+
+def record_review(review, previous=None):
+    """Учесть новую или изменённую оценку в агрегатах. Вызывается до commit, в той же транзакции.
+
+    Статистика жюри изменилась, поэтому z-score всех оценённых им команд пересчитывается здесь же:
+    чтение рейтинга ничего не пишет.
+    """
+    score = _get_team_score(review.team_id)
+    stats = _get_jury_stats(review.jury_id)
+    if previous:
+        _apply(score, stats, previous, -1)
+    _apply(score, stats, review_scores(review), 1)
+    db.session.flush()
+    update_normalized(_reviewed_by([review.jury_id]))
+
+
+def remove_team_reviews(team_id):
+    """Убрать оценки удаляемой команды из статистики жюри, удалить её агрегат и пересчитать z-score
+    остальных команд этих жюри"""
+    reviews = ArtifactReview.query.filter_by(team_id=team_id).all()
+    for review in reviews:
+        stats = _get_jury_stats(review.jury_id)
+        total = sum(review_scores(review))
+        stats.review_count -= 1
+        stats.total_sum -= total
+        stats.total_sq_sum -= total * total
+    TeamScore.query.filter_by(team_id=team_id).delete()
+    db.session.flush()
+    jury_ids = {review.jury_id for review in reviews}
+    if jury_ids:
+        update_normalized([other for other in _reviewed_by(jury_ids) if other != team_id])
+
+
+def update_normalized(team_ids):
+    """Пересчёт z-score указанных команд в текущей транзакции, без commit"""
+    if not team_ids:
+        return
+
+    jury_stats = {stats.jury_id: stats.mean_std() for stats in JuryScoreStats.query}
+    criteria_columns = [getattr(ArtifactReview, criterion) for criterion in CRITERIA]
+
+    for start in range(0, len(team_ids), REFRESH_CHUNK):
+        chunk = team_ids[start:start + REFRESH_CHUNK]
+        z_scores = {team_id: [] for team_id in chunk}
+        rows = db.session.execute(
+            select(ArtifactReview.team_id, ArtifactReview.jury_id, *criteria_columns)
+            .where(ArtifactReview.team_id.in_(chunk))
+        )
+        for team_id, jury_id, *scores in rows:
+            mean, std = jury_stats.get(jury_id, (0.0, 0.0))
+            z_scores[team_id].append((sum(scores) - mean) / std if std else 0.0)
+
+        db.session.execute(update(TeamScore), [
+            {"team_id": team_id, "normalized_mean": sum(values) / len(values) if values else 0.0}
+            for team_id, values in z_scores.items()
+        ])
+
+
+def refresh_normalized():
+    """Пересчёт z-score команд без значения (после rebuild_scores), без commit"""
+    update_normalized(db.session.scalars(
+        select(TeamScore.team_id).where(TeamScore.normalized_mean.is_(None))
+    ).all())
+
+
+def is_leaderboard_key(value):
+    """Ключ страницы рейтинга: [оценка, team_id, место]"""
+    return (isinstance(value, list) and len(value) == 3
+            and isinstance(value[0], (int, float)) and not isinstance(value[0], bool)
+            and is_id_key(value[1]) and is_id_key(value[2]))
+
+
+def get_leaderboard(limit, after=None, normalize=False):
+    """Страница рейтинга команд по индексу (оценка DESC, team_id)"""
+    if after is not None and not is_leaderboard_key(after):
+        return None, {"message": "Некорректный курсор."}, HTTPStatus.BAD_REQUEST
+    return leaderboard_page(limit, after, normalize), None, HTTPStatus.OK
+
+
+@response_cache.cached("leaderboard", "teams")
+def leaderboard_page(limit, after=None, normalize=False):
+    column = TeamScore.normalized_mean if normalize else TeamScore.mean_total
+
+    query = db.session.query(TeamScore, Team.team_name) \
+        .join(Team, Team.team_id == TeamScore.team_id) \
+        .filter(TeamScore.review_count > 0)
+
+    rank = 0
+    if after is not None:
+        value, team_id, rank = after
+        query = query.filter(or_(column < value, and_(column == value, TeamScore.team_id > team_id)))
+
+    rows = query.order_by(column.desc(), TeamScore.team_id).limit(limit + 1).all()
+
+    items = []
+    for score, team_name in rows[:limit]:
+        rank += 1
+        items.append({"rank": rank, "team_name": team_name, **score.to_dict()})
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1][0]
+        next_cursor = [getattr(last, column.key), last.team_id, rank]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def rebuild_scores():
+    """Полный пересчёт агрегатов по таблице оценок (разовое заполнение для существующих данных)"""
+    TeamScore.query.delete()
+    JuryScoreStats.query.delete()
+
+    total = sum(getattr(ArtifactReview, criterion) for criterion in CRITERIA)
+    team_rows = db.session.execute(
+        select(ArtifactReview.team_id, func.count(), func.sum(total),
+               *[func.sum(getattr(ArtifactReview, criterion)) for criterion in CRITERIA])
+        .group_by(ArtifactReview.team_id)
+    )
+    for team_id, count, total_sum, *criteria_sums in team_rows:
+        db.session.add(TeamScore(
+            team_id=team_id, review_count=count, total_sum=total_sum, mean_total=total_sum / count,
+            **{f"{criterion}_sum": value for criterion, value in zip(CRITERIA, criteria_sums)}
+        ))
+
+    jury_rows = db.session.execute(
+        select(ArtifactReview.jury_id, func.count(), func.sum(total), func.sum(total * total))
+        .group_by(ArtifactReview.jury_id)
+    )
+    for jury_id, count, total_sum, total_sq_sum in jury_rows:
+        db.session.add(JuryScoreStats(jury_id=jury_id, review_count=count, total_sum=total_sum,
+                                      total_sq_sum=total_sq_sum))
+
+    db.session.flush()
+    refresh_normalized()
+    db.session.commit()
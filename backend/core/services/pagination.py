@@ -0,0 +1,61 @@
+import base64
+import binascii
+import json
+from http import HTTPStatus
+
+from flask import current_app
+
+
+def encode_cursor(value):
+    """Непрозрачный курсор: последний ключ страницы в base64"""
+    raw = json.dumps({"after": value}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def is_id_key(value):
+    """Ключ keyset-страницы по id: целое число (bool — подкласс int, но ключом не является)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor, valid=is_id_key):
+    """Ключ из курсора или None, если курсор повреждён или ключ не проходит проверку valid"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        value = json.loads(base64.urlsafe_b64decode(padded.encode()))["after"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+    return value if valid(value) else None
+
+
+def parse_page_args(args, valid_cursor=is_id_key):
+    """Разбор параметров limit и cursor из строки запроса; valid_cursor проверяет тип ключа из курсора"""
+    default_limit = current_app.config["PAGE_SIZE_DEFAULT"]
+    max_limit = current_app.config["PAGE_SIZE_MAX"]
+
+    try:
+        limit = int(args.get("limit", default_limit))
+    except (TypeError, ValueError):
+        return None, None, ({"message": "Параметр 'limit' должен быть целым числом."}, HTTPStatus.BAD_REQUEST)
+    limit = max(1, min(limit, max_limit))
+
+    after = None
+    cursor = args.get("cursor")
+    if cursor:
+        after = decode_cursor(cursor, valid_cursor)
+        if after is None:
+            return None, None, ({"message": "Некорректный курсор."}, HTTPStatus.BAD_REQUEST)
+
+    return limit, after, None
+
+
+def paginate(query, key_column, limit, after=None):
+    """Keyset-пагинация по индексированному столбцу: читается не больше limit + 1 строк"""
+    if after is not None:
+        query = query.filter(key_column > after)
+    items = query.order_by(key_column).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(getattr(items[-1], key_column.key))
+    return items, next_cursor
@@ -1,9 +1,9 @@
 from http import HTTPStatus
 
-from flask_jwt_extended import get_jwt_identity
-
+from backend.core import db
 from backend.core.messages import AuthMessages
-from backend.core.services.auth_service import *
+from backend.core.services.auth_service import authenticate_user, change_password, create_user, get_current_user, \
+    invalidate_user, remove_user
 
 
 def parse_user_data(data, default_role):
@@ -47,19 +47,11 @@ def register_user(data):
 
 
 def login_user(role, data):
-    username = data.get("username")
-    password = data.get("password")
-    user = User.query.filter_by(username=username).first()
-
-    if not user or not user.check_password(password) or (
-            user.system_role and user.system_role.role_name.lower() != role.lower()):
-        return None
-    return authenticate_user(username, password)
+    return authenticate_user(data.get("username"), data.get("password"), required_role=role)
 
 
 def get_profile():
-    current_username = get_jwt_identity()
-    user = User.query.filter_by(username=current_username).first()
+    user = get_current_user()
     if not user:
         return None, {"message": AuthMessages.USER_NOT_FOUND}, HTTPStatus.NOT_FOUND
     return user, None, None
@@ -80,19 +72,18 @@ def update_user_profile(user, data):
         user.set_password(new_password)
 
     db.session.commit()
+    invalidate_user(user)
     return {"message": "Профиль успешно обновлен."}
 
 
 def change_profile_password(data):
-    current_username = get_jwt_identity()
-    if change_password(current_username, data.get("old_password"), data.get("new_password")):
+    if change_password(get_current_user(), data.get("old_password"), data.get("new_password")):
         return {"message": AuthMessages.PASSWORD_CHANGED}, HTTPStatus.OK
     return {"message": AuthMessages.PASSWORD_INVALID_OLD}, HTTPStatus.BAD_REQUEST
 
 
 def delete_profile():
-    current_username = get_jwt_identity()
-    if delete_user(current_username):
+    if remove_user(get_current_user()):
         return {"message": AuthMessages.USER_DELETED_SELF}, HTTPStatus.OK
     return {"message": AuthMessages.USER_NOT_FOUND}, HTTPStatus.NOT_FOUND
 
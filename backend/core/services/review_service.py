@@ -0,0 +1,159 @@
+from flask import current_app
+from sqlalchemy import func, select, update
+
+from backend.core import db
+from backend.core.extensions import role_registry
+from backend.core.models.auth_models import User
+from backend.core.models.team_models import ArtifactReview, ReviewAssignment, Team, TeamArtifacts
+from backend.core.services.pagination import paginate
+from backend.core.services.team_service import team_query
+
+FILL_CHUNK = 500
+
+
+def _jury_ids():
+    return select(User.user_id).where(User.system_role_id == role_registry.id_of("jury"))
+
+
+def _jury_loads():
+    """Число назначений у каждого члена жюри"""
+    jury_ids = db.session.scalars(_jury_ids()).all()
+    counts = dict(db.session.execute(
+        select(ReviewAssignment.jury_id, func.count()).group_by(ReviewAssignment.jury_id)
+    ).all())
+    return {jury_id: counts.get(jury_id, 0) for jury_id in jury_ids}
+
+
+def _active_assignments(team_ids):
+    """Назначения действующих членов жюри: {team_id: {jury_id}}"""
+    assigned = {}
+    rows = db.session.execute(
+        select(ReviewAssignment.team_id, ReviewAssignment.jury_id)
+        .where(ReviewAssignment.team_id.in_(team_ids), ReviewAssignment.jury_id.in_(_jury_ids()))
+    )
+    for team_id, jury_id in rows:
+        assigned.setdefault(team_id, set()).add(jury_id)
+    return assigned
+
+
+def _underfilled_teams():
+    """Команды с артефактами, у которых меньше REVIEWS_PER_TEAM назначений действующих членов жюри"""
+    counts = (
+        select(ReviewAssignment.team_id, func.count().label("assigned"))
+        .where(ReviewAssignment.jury_id.in_(_jury_ids()))
+        .group_by(ReviewAssignment.team_id)
+        .subquery()
+    )
+    return db.session.scalars(
+        select(TeamArtifacts.team_id)
+        .outerjoin(counts, counts.c.team_id == TeamArtifacts.team_id)
+        .where(func.coalesce(counts.c.assigned, 0) < current_app.config["REVIEWS_PER_TEAM"])
+        .order_by(TeamArtifacts.team_id)
+    ).all()
+
+
+def _fill_team(team_id, loads, assigned=None):
+    """Дополнить назначения команды до REVIEWS_PER_TEAM наименее загруженными членами жюри.
+
+    Учитываются только назначения действующих членов жюри: проверенные пары бывших остаются в истории.
+    assigned — уже загруженные назначения команды, иначе читаются из базы.
+    """
+    if assigned is None:
+        assigned = _active_assignments([team_id]).get(team_id, set())
+    missing = current_app.config["REVIEWS_PER_TEAM"] - len(assigned)
+    if missing <= 0:
+        return
+
+    candidates = sorted((load, jury_id) for jury_id, load in loads.items() if jury_id not in assigned)
+    for load, jury_id in candidates[:missing]:
+        db.session.add(ReviewAssignment(team_id=team_id, jury_id=jury_id, reviewed=False))
+        loads[jury_id] = load + 1
+
+
+def assign_team(team_id):
+    """Назначить жюри команде, впервые отправившей артефакты"""
+    _fill_team(team_id, _jury_loads())
+
+
+def assign_jury(jury_id):
+    """Дополнить команды, которым не хватало жюри, затем передать новому члену жюри часть
+    непроверенных команд самых загруженных коллег"""
+    loads = _jury_loads()
+    loads.setdefault(jury_id, 0)
+
+    team_ids = _underfilled_teams()
+    assigned = {}
+    for start in range(0, len(team_ids), FILL_CHUNK):
+        assigned.update(_active_assignments(team_ids[start:start + FILL_CHUNK]))
+    for team_id in team_ids:
+        _fill_team(team_id, loads, assigned.get(team_id, set()))
+    db.session.flush()
+
+    target = sum(loads.values()) // len(loads)
+
+    own_teams = select(ReviewAssignment.team_id).where(ReviewAssignment.jury_id == jury_id)
+    for donor_id, donor_load in sorted(loads.items(), key=lambda item: -item[1]):
+        if loads[jury_id] >= target:
+            break
+        movable = min(donor_load - target, target - loads[jury_id])
+        if donor_id == jury_id or movable <= 0:
+            continue
+
+        assignments = ReviewAssignment.query.filter(
+            ReviewAssignment.jury_id == donor_id,
+            ReviewAssignment.reviewed == False,  # noqa: E712
+            ReviewAssignment.team_id.not_in(own_teams)
+        ).order_by(ReviewAssignment.team_id.desc()).limit(movable).all()
+        for assignment in assignments:
+            assignment.jury_id = jury_id
+        loads[jury_id] += len(assignments)
+        db.session.flush()
+
+
+def release_jury(jury_id):
+    """Снять непроверенные назначения с удаляемого или сменившего роль члена жюри и раздать их остальным"""
+    # Проверенные пары сменившего роль больше не учитываются в _fill_team: дополняются все его команды
+    team_ids = db.session.scalars(
+        select(ReviewAssignment.team_id).where(ReviewAssignment.jury_id == jury_id)
+    ).all()
+    ReviewAssignment.query.filter_by(jury_id=jury_id, reviewed=False).delete()
+
+    loads = _jury_loads()
+    loads.pop(jury_id, None)
+    for team_id in team_ids:
+        _fill_team(team_id, loads)
+
+
+def mark_reviewed(jury_id, team_id):
+    result = db.session.execute(
+        update(ReviewAssignment)
+        .where(ReviewAssignment.jury_id == jury_id, ReviewAssignment.team_id == team_id)
+        .values(reviewed=True),
+        execution_options={"synchronize_session": False}
+    )
+    if not result.rowcount:
+        db.session.add(ReviewAssignment(team_id=team_id, jury_id=jury_id, reviewed=True))
+
+
+def rebuild_assignments():
+    """Полное перераспределение: проверенные пары сохраняются, остальные назначаются заново"""
+    ReviewAssignment.query.delete()
+    reviewed_pairs = db.session.execute(select(ArtifactReview.team_id, ArtifactReview.jury_id)).all()
+    db.session.add_all([
+        ReviewAssignment(team_id=team_id, jury_id=jury_id, reviewed=True) for team_id, jury_id in reviewed_pairs
+    ])
+    db.session.flush()
+
+    loads = _jury_loads()
+    for team_id in db.session.scalars(select(TeamArtifacts.team_id).order_by(TeamArtifacts.team_id)).all():
+        _fill_team(team_id, loads)
+    db.session.commit()
+
+
+def get_assigned_teams(jury_id, reviewed, limit, after=None):
+    """Страница очереди члена жюри по индексу (jury_id, reviewed, team_id)"""
+    query = team_query().join(ReviewAssignment, ReviewAssignment.team_id == Team.team_id).filter(
+        ReviewAssignment.jury_id == jury_id,
+        ReviewAssignment.reviewed == reviewed
+    )
+    return paginate(query, Team.team_id, limit, after)
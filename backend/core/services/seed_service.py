@@ -0,0 +1,105 @@
+import io
+import random
+
+from flask import current_app
+from sqlalchemy import insert, select
+from werkzeug.datastructures import FileStorage
+from werkzeug.security import generate_password_hash
+
+from backend.core import db
+from backend.core.extensions import role_registry
+from backend.core.models.auth_models import Role, User
+from backend.core.models.hackathon_model import HackathonCase
+from backend.core.models.team_models import ArtifactReview, Team, TeamArtifacts, TeamCase, TeamMember
+from backend.core.services.import_service import batched
+from backend.core.services.leaderboard_service import rebuild_scores
+from backend.core.services.review_service import rebuild_assignments
+from backend.core.services.storage_service import store_upload
+
+ROLES = ("user", "admin", "organizer", "jury")
+FIRST_NAMES = ("Анна", "Иван", "Мария", "Пётр", "Ольга", "Дмитрий", "Елена", "Сергей", "Наталья", "Алексей")
+LAST_NAMES = ("Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров", "Соколов", "Михайлов")
+UNIVERSITIES = ("УрФУ", "МГУ", "СПбГУ", "НИУ ВШЭ", "МФТИ", "ИТМО", "НГУ", "ТГУ")
+
+
+def _user_row(rng, username, role_id, password_hash):
+    return {
+        "username": username,
+        "full_name": f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)}",
+        "university": rng.choice(UNIVERSITIES),
+        "study_info": f"{rng.randint(1, 6)} курс",
+        "email": f"{username}@example.com",
+        "phone": f"+7900{rng.randrange(10 ** 7):07d}",
+        "password_hash": password_hash,
+        "system_role_id": role_id,
+    }
+
+
+def _ensure_roles():
+    existing = set(db.session.scalars(select(Role.role_name)))
+    db.session.add_all([Role(role_name=name) for name in ROLES if name not in existing])
+    db.session.flush()
+    role_registry.reload()
+    return {name: role_registry.id_of(name) for name in ROLES}
+
+
+def _insert(model, rows, batch_size):
+    for batch in batched(rows, batch_size):
+        db.session.execute(insert(model), batch)
+
+
+def generate_dataset(users=20000, teams=4000, jury=60, cases=30, reviews_per_jury=20, seed=42,
+                     password="password"):
+    """Детерминированный набор данных хакатона заданного масштаба для нагрузочных замеров.
+
+    Пользователи: admin, organizer, jury_<i>, user_<i>; у всех один пароль, хеш считается один раз.
+    Команды собираются из участников по порядку, кейс и оценки жюри выбираются генератором с seed.
+    """
+    if teams > users:
+        raise ValueError("Команд не может быть больше, чем участников")
+    rng = random.Random(seed)
+    batch_size = current_app.config["IMPORT_BATCH_SIZE"]
+    role_ids = _ensure_roles()
+    password_hash = generate_password_hash(password, method=current_app.config["PASSWORD_HASH_METHOD"])
+
+    staff = [("admin", "admin"), ("organizer", "organizer")] + [(f"jury_{i}", "jury") for i in range(jury)]
+    _insert(User, (_user_row(rng, username, role_ids[role], password_hash) for username, role in staff), batch_size)
+    _insert(User, (_user_row(rng, f"user_{i}", role_ids["user"], password_hash) for i in range(users)), batch_size)
+    user_ids = dict(db.session.execute(select(User.username, User.user_id)).all())
+
+    case_ids = []
+    for i in range(cases):
+        content = f"%PDF-1.4\n% Кейс {i}\n".encode() + rng.randbytes(16 * 1024)
+        original_filename, file_url = store_upload(FileStorage(io.BytesIO(content), filename=f"case_{i}.pdf"))
+        case = HackathonCase(title=f"Кейс {i}", description=f"Описание кейса {i}", file_url=file_url,
+                             original_filename=original_filename)
+        db.session.add(case)
+        db.session.flush()
+        case_ids.append(case.case_id)
+
+    # Участники делятся между командами поровну, первый участник команды — капитан
+    members = [user_ids[f"user_{i}"] for i in range(users)]
+    team_members = [members[team::teams] for team in range(teams)]
+    _insert(Team, ({"team_name": f"team_{team}", "description": f"Команда {team}", "team_lead_id": ids[0]}
+                   for team, ids in enumerate(team_members)), batch_size)
+    team_ids = dict(db.session.execute(select(Team.team_name, Team.team_id)).all())
+    team_ids = [team_ids[f"team_{team}"] for team in range(teams)]
+
+    _insert(TeamMember, ({"team_id": team_id, "user_id": user_id}
+                         for team_id, ids in zip(team_ids, team_members) for user_id in ids), batch_size)
+    _insert(TeamArtifacts, ({"team_id": team_id, "github_url": f"https://github.com/example/team-{team}"}
+                            for team, team_id in enumerate(team_ids)), batch_size)
+    if case_ids:
+        _insert(TeamCase, ({"team_id": team_id, "case_id": rng.choice(case_ids)} for team_id in team_ids), batch_size)
+
+    reviews = []
+    for i in range(jury):
+        for team_id in rng.sample(team_ids, min(reviews_per_jury, len(team_ids))):
+            reviews.append({"jury_id": user_ids[f"jury_{i}"], "team_id": team_id,
+                            **{f"criterion_{c}": rng.randint(1, 10) for c in range(1, 6)}})
+    _insert(ArtifactReview, reviews, batch_size)
+    db.session.commit()
+
+    rebuild_scores()
+    rebuild_assignments()
+    return {"users": users + len(staff), "teams": teams, "jury": jury, "cases": cases, "reviews": len(reviews)}
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import tempfile
+import time
+
+from flask import current_app
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.core import db
+from backend.core.models.storage_model import StoredBlob
+from backend.core.services.utilits import BLOB_DIR, allowed_file, blob_key, upload_folder, upload_path
+
+CHUNK_SIZE = 64 * 1024
+# Временные файлы моложе этого возраста могут принадлежать идущей загрузке
+TMP_MAX_AGE = 3600
+GC_CHUNK = 500
+
+UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def store_upload(file):
+    """Потоковое сохранение загрузки с подсчётом SHA-256; одинаковые файлы хранятся один раз.
+    Ссылка на файл добавляется в текущую транзакцию"""
+    if not file or not file.filename or not allowed_file(file.filename):
+        return None, None
+
+    tmp_dir = os.path.join(upload_folder(), BLOB_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        key = digest.hexdigest()
+        # Сначала ссылка: upsert блокирует строку, и сборщик мусора не удалит файл, пока транзакция не завершится
+        acquire_upload(key, size)
+        path = os.path.join(upload_folder(), upload_path(key))
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return file.filename, key
+
+
+def acquire_upload(key, size):
+    """Добавить ссылку на файл хранилища одним INSERT ... ON CONFLICT DO UPDATE"""
+    insert = UPSERT[db.session.get_bind().dialect.name]
+    db.session.execute(
+        insert(StoredBlob).values(sha256=key, size=size, ref_count=1).on_conflict_do_update(
+            index_elements=[StoredBlob.sha256], set_={"ref_count": StoredBlob.ref_count + 1}
+        )
+    )
+
+
+def release_upload(key):
+    """Снять ссылку на файл. Файлы хранилища без ссылок удаляет collect_garbage; возвращается только ключ
+    старого файла вне хранилища, который можно удалить после commit"""
+    if not key:
+        return None
+    if not blob_key(key):
+        # Файлы, загруженные до хранилища по содержимому, принадлежат ровно одному кейсу
+        return key
+
+    db.session.execute(
+        update(StoredBlob).where(StoredBlob.sha256 == key, StoredBlob.ref_count > 0)
+        .values(ref_count=StoredBlob.ref_count - 1)
+    )
+    return None
+
+
+def purge_uploads(*keys):
+    """Удалить с диска старые файлы вне хранилища; вызывается после commit"""
+    for key in keys:
+        if key:
+            _remove_file(key)
+
+
+def collect_garbage():
+    """Удалить файлы хранилища без ссылок; запускается периодически (`flask uploads gc`), а не в запросах.
+    Файлы без строки в stored_blobs (загрузка откатилась) сначала заносятся с нулём ссылок"""
+    orphans = list(_blob_files())
+    insert = UPSERT[db.session.get_bind().dialect.name]
+    for i in range(0, len(orphans), GC_CHUNK):
+        db.session.execute(insert(StoredBlob).values(orphans[i:i + GC_CHUNK]).on_conflict_do_nothing())
+    db.session.commit()
+
+    removed = 0
+    keys = db.session.scalars(select(StoredBlob.sha256).where(StoredBlob.ref_count <= 0)).all()
+    for key in keys:
+        # Строка удаляется и файл стирается под блокировкой строки: конкурентная загрузка того же файла
+        # дождётся commit, вставит строку заново и положит файл уже после удаления
+        if db.session.execute(
+            delete(StoredBlob).where(StoredBlob.sha256 == key, StoredBlob.ref_count <= 0)
+        ).rowcount:
+            _remove_file(key)
+            removed += 1
+        db.session.commit()
+
+    # Временные файлы оборванных загрузок
+    tmp_dir = os.path.join(upload_folder(), BLOB_DIR, "tmp")
+    cutoff = time.time() - TMP_MAX_AGE
+    for name in os.listdir(tmp_dir) if os.path.isdir(tmp_dir) else ():
+        path = os.path.join(tmp_dir, name)
+        if os.path.getmtime(path) < cutoff:
+            _remove_path(path)
+    return removed
+
+
+def _blob_files():
+    root = os.path.join(upload_folder(), BLOB_DIR)
+    for dirpath, dirnames, filenames in os.walk(root):
+        if dirpath == root:
+            dirnames[:] = [name for name in dirnames if name != "tmp"]
+        for name in filenames:
+            if blob_key(name):
+                yield {"sha256": name, "size": os.path.getsize(os.path.join(dirpath, name)), "ref_count": 0}
+
+
+def _remove_file(key):
+    _remove_path(os.path.join(upload_folder(), upload_path(key)))
+
+
+def _remove_path(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        current_app.logger.warning("Не удалось удалить файл %s: %s", path, e)
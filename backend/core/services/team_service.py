@@ -1,10 +1,84 @@
 from http import HTTPStatus
 
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
 from backend.core import db
-from backend.core.models.auth_models import User
-from backend.core.models.team_models import Team
+from backend.core.extensions import response_cache
+from backend.core.models.auth_models import USER_FIELDS, User, user_columns
+from backend.core.models.team_models import TEAM_FIELDS, TEAM_LEAD_FIELDS, Team, TeamMember
+from backend.core.services.fieldsets import parse_fieldset
+from backend.core.services.pagination import paginate
+
+TEAM_RELATIONS = ("team_lead", "members", "cases", "artifacts", "reviews")
+# Вложенные поля связей, доступные в fields через точку: members.username, team_lead.full_name
+TEAM_NESTED_FIELDS = {"team_lead": TEAM_LEAD_FIELDS, "members": USER_FIELDS, "cases": (), "artifacts": (),
+                      "reviews": ()}
+
+
+def parse_team_fields(args):
+    """fields= и include= для команд: (набор полей или None, ошибка)"""
+    return parse_fieldset(args, TEAM_FIELDS, TEAM_NESTED_FIELDS)
+
+
+def team_load_options(include=TEAM_RELATIONS, fields=None):
+    """Опции жадной загрузки связей команды: число запросов не зависит от количества команд.
+
+    С набором полей из parse_team_fields загружаются только нужные столбцы команды и участников,
+    а связи, которых нет в наборе, не загружаются вовсе.
+    """
+    options = []
+    if fields is not None:
+        include = [name for name in TEAM_RELATIONS if name in fields]
+        columns = [getattr(Team, name) for name in ("team_name", "description") if name in fields]
+        if "team_lead" in fields:
+            columns.append(Team.team_lead_id)
+        options.append(load_only(Team.team_id, *columns))
+
+    if "team_lead" in include:
+        loader = joinedload(Team.team_lead)
+        options.append(loader.load_only(User.username, User.full_name) if fields is not None else loader)
+    if "members" in include:
+        loader = selectinload(Team.members)
+        member_fields = fields.get("members") if fields is not None else None
+        options.append(loader.load_only(*user_columns(member_fields)) if member_fields else loader)
+    if "cases" in include:
+        options.append(selectinload(Team.cases))
+    if "artifacts" in include:
+        options.append(selectinload(Team.artifacts))
+    if "reviews" in include:
+        options.append(selectinload(Team.artifact_reviews))
+    return options
+
+
+def team_query(*criteria, include=TEAM_RELATIONS, fields=None):
+    return Team.query.options(*team_load_options(include, fields)).filter(*criteria)
+
+
+def get_teams(*criteria, include=TEAM_RELATIONS, fields=None):
+    """Получение команд вместе со всеми связями, нужными для сериализации"""
+    return team_query(*criteria, include=include, fields=fields).order_by(Team.team_id).all()
+
+
+def get_team_by_name(team_name, include=TEAM_RELATIONS, fields=None):
+    return Team.query.options(*team_load_options(include, fields)).filter_by(team_name=team_name).first()
+
+
+def get_user_teams(user_id, fields=None):
+    """Команды, в которых пользователь является тимлидом или участником"""
+    return get_teams((Team.team_lead_id == user_id) | Team.members.any(User.user_id == user_id), fields=fields)
+
+
+def serialize_teams(teams, fields=None):
+    return [team.to_dict(fields) for team in teams]
+
+
+@response_cache.cached("teams_page", "teams", "users", "cases")
+def get_teams_page(limit, after=None, fields=None):
+    """Сериализованная страница списка команд"""
+    teams, next_cursor = paginate(team_query(fields=fields), Team.team_id, limit, after)
+    return {"teams": serialize_teams(teams, fields), "next_cursor": next_cursor}
 
 
 def create_team(data):
@@ -31,21 +105,50 @@ def create_team(data):
 
 
 def add_member_to_team(team_id, user_id):
-    team = Team.query.get(team_id)
-    user = User.query.get(user_id)
+    # Команда и пользователь обычно уже в identity map сессии; список участников не загружается
+    team = db.session.get(Team, team_id)
+    user = db.session.get(User, user_id)
 
     if not team or not user:
         return {"message": "Команда или пользователь не найдены."}, 404
 
-    if user in team.members:
+    if db.session.get(TeamMember, (team_id, user_id)):
         return {"message": "Пользователь уже состоит в этой команде."}, 200
 
-    team.members.append(user)
+    db.session.add(TeamMember(team_id=team_id, user_id=user_id))
     db.session.commit()
 
     return {"message": "Пользователь успешно добавлен в команду."}, 200
 
 
+def add_members_to_team(team_id, usernames):
+    """Приглашение пачки пользователей: один запрос по username, одна вставка недостающих членств"""
+    usernames = list(dict.fromkeys(usernames))
+    user_ids = dict(db.session.execute(select(User.username, User.user_id).where(User.username.in_(usernames))).all())
+    current = set(db.session.scalars(select(TeamMember.user_id).where(
+        TeamMember.team_id == team_id, TeamMember.user_id.in_(user_ids.values())
+    )))
+
+    added = [username for username in usernames if username in user_ids and user_ids[username] not in current]
+    if added:
+        db.session.execute(insert(TeamMember), [{"team_id": team_id, "user_id": user_ids[username]} for username in added])
+        db.session.commit()
+
+    return {
+        "added": added,
+        "already_members": [username for username in usernames if user_ids.get(username) in current],
+        "not_found": [username for username in usernames if username not in user_ids],
+    }
+
+
+def team_members(team_id, fields=None):
+    """Участники команды одним запросом, с проекцией на поля профиля"""
+    query = User.query.join(TeamMember, TeamMember.user_id == User.user_id).filter(TeamMember.team_id == team_id)
+    if fields is not None:
+        query = query.options(load_only(*user_columns(fields)))
+    return query.order_by(User.user_id).all()
+
+
 def get_team_members(team_id):
     team = Team.query.get(team_id)
     if not team:
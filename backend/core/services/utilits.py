@@ -1,10 +1,19 @@
 import os
-import uuid
+import unicodedata
+from urllib.parse import quote
 
-from backend.core.config import Config
+from flask import current_app, send_from_directory
 
-UPLOAD_FOLDER = Config.UPLOAD_FOLDER
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+BLOB_DIR = "blobs"
+HEX_DIGITS = frozenset("0123456789abcdef")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def upload_folder():
+    """Каталог загрузок; относительный путь считается от каталога backend"""
+    folder = current_app.config["UPLOAD_FOLDER"]
+    return folder if os.path.isabs(folder) else os.path.join(BACKEND_DIR, folder)
 
 
 def allowed_file(filename):
@@ -12,24 +21,43 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def save_file(file):
-    """Сохранение файла на сервере"""
-    if not file:
-        return None
-
-    # Получаем оригинальное имя файла и расширение
-    original_filename = file.filename
-    ext = original_filename.rsplit('.', 1)[-1].lower()
-
-    # Проверяем, что расширение файла разрешено
-    if ext not in ALLOWED_EXTENSIONS:
-        return None
-    # Генерируем уникальное имя для файла
-    unique_filename = f"{uuid.uuid4().hex}.{ext}"
-
-    # Сохраняем файл в нужную директорию
-    file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-    file.save(file_path)
-
-    # Возвращаем оригинальное имя файла для использования в базе данных
-    return original_filename, unique_filename
+def blob_key(key):
+    """Ключ хранилища по содержимому: SHA-256 в hex"""
+    return bool(key) and len(key) == 64 and all(c in HEX_DIGITS for c in key)
+
+
+def upload_path(key):
+    """Путь файла относительно каталога загрузок: blobs/ab/cd/<sha256>, старые файлы лежат плоско"""
+    if blob_key(key):
+        return "/".join((BLOB_DIR, key[:2], key[2:4], key))
+    return key
+
+
+def _attachment_headers(download_name):
+    try:
+        download_name.encode("ascii")
+        return {"filename": download_name}
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", download_name).encode("ascii", "ignore").decode("ascii")
+        return {"filename": simple, "filename*": f"UTF-8''{quote(download_name, safe='!#$&+-.^_`|~')}"}
+
+
+def send_upload(stored_name, download_name):
+    """Отдача загруженного файла: 304 по ETag/Last-Modified, Range, либо передача фронт-прокси"""
+    relative_path = upload_path(stored_name)
+    if current_app.config["UPLOAD_OFFLOAD"] == "x-accel":
+        response = current_app.response_class()
+        if blob_key(stored_name):
+            response.set_etag(stored_name)
+        response.headers["X-Accel-Redirect"] = current_app.config["UPLOAD_ACCEL_PREFIX"].rstrip("/") + "/" + quote(relative_path)
+        response.headers.set("Content-Disposition", "attachment", **_attachment_headers(download_name))
+        return response
+
+    # X-Sendfile включается через USE_X_SENDFILE; условные запросы и Range обрабатывает werkzeug.
+    # Для файлов в хранилище по содержимому хеш служит сильным ETag
+    etag = stored_name if blob_key(stored_name) else True
+    response = send_from_directory(upload_folder(), relative_path, as_attachment=True, download_name=download_name,
+                                   conditional=True, etag=etag, max_age=current_app.config["UPLOAD_MAX_AGE"])
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
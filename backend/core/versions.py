@@ -0,0 +1,162 @@
+import functools
+import hashlib
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import Delete, Insert, Update, event, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from .cache import TTLCache
+
+# Семейства ресурсов и таблицы, изменение которых меняет их представление
+RESOURCE_FAMILIES = {
+    "cases": ("hackathon_cases",),
+    "teams": ("teams", "team_members", "team_cases", "team_artifacts", "artifact_reviews",
+              "team_scores", "jury_score_stats", "review_assignments"),
+    "users": ("users", "roles"),
+}
+TABLE_FAMILIES = {table: family for family, tables in RESOURCE_FAMILIES.items() for table in tables}
+
+
+class ResourceVersions:
+    """Счётчики изменений семейств ресурсов для ETag.
+
+    Запись в таблицы семейства отмечается на уровне движка, поэтому учитываются и flush ORM, и массовые
+    операции; счётчики увеличиваются после commit сессии короткой отдельной транзакцией и не держат
+    блокировку строки версии, пока идёт пишущая транзакция. Чтения кэшируются в процессе на
+    RESOURCE_VERSION_TTL секунд, свои изменения процесс видит сразу после commit.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache()
+
+    def init_app(self, app):
+        from backend.core import db
+        from backend.core.models.version_model import ResourceVersion
+
+        self._table = ResourceVersion.__table__
+        self._cache.maxsize = len(RESOURCE_FAMILIES)
+        self._cache.ttl = app.config["RESOURCE_VERSION_TTL"]
+        self._cache.clear()
+
+        with app.app_context():
+            engine = db.engine
+            for target, name, listener in ((engine, "begin", self._on_rollback),
+                                           (engine, "before_execute", self._before_execute),
+                                           (engine, "rollback", self._on_rollback),
+                                           (db.session, "after_begin", self._after_begin),
+                                           (db.session, "after_commit", self._after_commit),
+                                           (db.session, "after_transaction_end", self._after_transaction_end)):
+                if not event.contains(target, name, listener):
+                    event.listen(target, name, listener)
+
+            # Строки счётчиков создаются миграцией; для баз из create_all — при старте
+            try:
+                with engine.begin() as connection:
+                    self._ensure_rows(connection, set(RESOURCE_FAMILIES))
+            except SQLAlchemyError as e:
+                app.logger.warning("Счётчики версий ресурсов не инициализированы: %s", e)
+
+    def _ensure_rows(self, connection, families):
+        existing = set(connection.scalars(select(self._table.c.name).where(self._table.c.name.in_(families))))
+        missing = families - existing
+        if missing:
+            connection.execute(insert(self._table), [{"name": family, "version": 1} for family in sorted(missing)])
+
+    def _before_execute(self, connection, clauseelement, multiparams, params, execution_options):
+        if not isinstance(clauseelement, (Insert, Update, Delete)):
+            return
+        family = TABLE_FAMILIES.get(clauseelement.table.name)
+        if family:
+            connection.info.setdefault("changed_families", set()).add(family)
+
+    def _on_rollback(self, connection):
+        # Также при begin: info живёт вместе с соединением пула и переживает транзакцию
+        connection.info.pop("changed_families", None)
+
+    def _after_begin(self, session, transaction, connection):
+        session.info.setdefault("version_connections", []).append((connection.engine, connection.info))
+
+    def _after_transaction_end(self, session, transaction):
+        # После after_commit, rollback или close: соединения следующей транзакции собираются заново
+        if transaction.parent is None:
+            session.info.pop("version_connections", None)
+
+    def _after_commit(self, session):
+        # Вызывается и при освобождении точки сохранения: внешняя транзакция ещё не зафиксирована
+        if session.in_nested_transaction():
+            return
+        changed = {}
+        for engine, info in session.info.pop("version_connections", ()):
+            changed.setdefault(engine, set()).update(info.pop("changed_families", ()))
+        for engine, families in changed.items():
+            if families:
+                self.bump(engine, families)
+
+    def bump(self, engine, families):
+        """Увеличить счётчики отдельной транзакцией: одного увеличения на commit достаточно"""
+        try:
+            with engine.begin() as connection:
+                updated = connection.execute(
+                    update(self._table).where(self._table.c.name.in_(families))
+                    .values(version=self._table.c.version + 1)
+                ).rowcount
+                if updated < len(families):
+                    self._ensure_rows(connection, set(families))
+        finally:
+            for family in families:
+                self._cache.invalidate(family)
+
+    def current(self, families):
+        """Текущие версии семейств; обычно из кэша процесса, иначе одним запросом"""
+        versions = {family: self._cache.get(family) for family in families}
+        missing = [family for family, version in versions.items() if version is None]
+        if missing:
+            from backend.core import db
+
+            rows = db.session.execute(
+                select(self._table.c.name, self._table.c.version).where(self._table.c.name.in_(missing))
+            ).all()
+            for family, version in rows:
+                self._cache.set(family, version)
+                versions[family] = version
+        return versions
+
+    def etag(self, families):
+        versions = self.current(families)
+        from .extensions import response_encoding
+
+        raw = "|".join([request.full_path, str(get_jwt_identity()), response_encoding.variant()]
+                       + [f"{f}:{versions.get(f)}" for f in families])
+        return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+    def conditional(self, *families, allow=None):
+        """Декоратор GET-ресурса: ETag из версий семейств, 304 по If-None-Match до работы с ORM.
+
+        allow — проверка доступа ресурса: 304 получают только прошедшие её, остальным отвечает сам метод.
+        """
+
+        def decorator(method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                if allow is not None and not allow():
+                    return method(*args, **kwargs)
+
+                etag = self.etag(families)
+                if etag in request.if_none_match:
+                    response = current_app.response_class(status=304)
+                    response.set_etag(etag)
+                    response.headers["Cache-Control"] = "private, no-cache"
+                    return response
+
+                result = method(*args, **kwargs)
+                if isinstance(result, tuple) and len(result) >= 2 and result[1] == 200:
+                    data, status, *rest = result
+                    headers = dict(rest[0]) if rest else {}
+                    headers.update({"ETag": f'"{etag}"', "Cache-Control": "private, no-cache"})
+                    return data, status, headers
+                return result
+
+            return wrapper
+
+        return decorator
@@ -0,0 +1,63 @@
+"""Конфигурация Gunicorn: приложение загружается один раз в мастере, воркеры получают его через fork.
+
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+
+Параметры переопределяются переменными окружения GUNICORN_*.
+"""
+import gc
+import glob
+import multiprocessing
+import os
+
+# Команды flask db воркерам не нужны: без них не импортируется alembic (см. DB_MIGRATIONS)
+os.environ.setdefault("DB_MIGRATIONS", "0")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+# Воркеры — по ядрам для проверки паролей (CPU), потоки — для ожидания БД и файлов
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1").lower() in ("1", "true", "yes", "on")
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+# Перезапуск воркера после N запросов ограничивает рост памяти; разброс не даёт перезапуститься всем сразу
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def on_starting(server):
+    # Файлы метрик прошлых запусков дали бы чужие значения счётчиков
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+def when_ready(server):
+    # Объекты загруженного приложения переносятся в постоянное поколение: сборщик мусора в воркерах
+    # не трогает их заголовки, и страницы памяти остаются общими с мастером (copy-on-write)
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    # Соединения пула, открытые в мастере при загрузке, не должны использоваться сразу несколькими процессами
+    if preload_app:
+        from backend.core import db
+        from backend.wsgi import app
+
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,13 +1,25 @@
+from http import HTTPStatus
+
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt
 from flask_restx import Resource
 
-from backend.core.schemas.auth_schemas import *
-from backend.core.services.profile_service import *
+from backend.core import db
+from backend.core.messages import AuthMessages
+from backend.core.models.auth_models import User
+from backend.core.schemas.auth_schemas import change_password_model, login_model
+from backend.core.services.auth_service import get_current_user_id
+from backend.core.services.profile_service import change_profile_password, delete_profile, get_profile, \
+    get_user_info_response, login_user
 from . import jury_ns
+from ..core.extensions import resource_versions
 from ..core.models.hackathon_model import HackathonCase
 from ..core.models.team_models import TeamArtifacts, Team, ArtifactReview, TeamCase, TeamMember
 from ..core.schemas.hackathon_schemas import artifact_review_model
+from ..core.services.leaderboard_service import record_review, review_scores
+from ..core.services.pagination import parse_page_args
+from ..core.services.review_service import get_assigned_teams, mark_reviewed
+from ..core.services.team_service import serialize_teams
 
 
 def resident_required():
@@ -33,6 +45,7 @@ class ResidentLogin(Resource):
 class ResidentProfile(Resource):
     @jwt_required()
     @jury_ns.doc(description="Получение информации о резиденте")
+    @resource_versions.conditional("users", allow=resident_required)
     def get(self):
         if not resident_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
@@ -109,7 +122,7 @@ class ArtifactReviewResource(Resource):
             return {"message": "Доступ только для жюри."}, HTTPStatus.FORBIDDEN
 
         # Получаем пользователя (жюри) из токена
-        jury_id = get_jwt_identity()
+        jury_id = get_current_user_id()
         team = Team.query.filter_by(team_id=team_id).first()
 
         if not team:
@@ -134,6 +147,8 @@ class ArtifactReviewResource(Resource):
         )
 
         db.session.add(review)
+        record_review(review)
+        mark_reviewed(jury_id, review.team_id)
         db.session.commit()
 
         return {"message": "Оценка успешно добавлена."}, HTTPStatus.CREATED
@@ -150,7 +165,7 @@ class ArtifactReviewResource(Resource):
             return {"message": "Доступ только для жюри."}, HTTPStatus.FORBIDDEN
 
         # Получаем пользователя (жюри) из токена
-        jury_id = get_jwt_identity()
+        jury_id = get_current_user_id()
         team = Team.query.filter_by(team_name=team_name).first()
 
         if not team:
@@ -175,6 +190,8 @@ class ArtifactReviewResource(Resource):
         )
 
         db.session.add(review)
+        record_review(review)
+        mark_reviewed(jury_id, review.team_id)
         db.session.commit()
 
         return {"message": "Оценка успешно добавлена."}, HTTPStatus.CREATED
@@ -188,7 +205,7 @@ class ArtifactReviewResource(Resource):
             return {"message": "Доступ только для жюри."}, HTTPStatus.FORBIDDEN
 
         # Получаем пользователя (жюри) из токена
-        jury_id = get_jwt_identity()
+        jury_id = get_current_user_id()
         team = Team.query.filter_by(team_name=team_name).first()
 
         if not team:
@@ -201,6 +218,7 @@ class ArtifactReviewResource(Resource):
 
         # Обновляем оценку
         data = request.get_json()
+        previous = review_scores(review)
         review.criterion_1 = data['criterion_1']
         review.criterion_2 = data['criterion_2']
         review.criterion_3 = data['criterion_3']
@@ -208,6 +226,7 @@ class ArtifactReviewResource(Resource):
         review.criterion_5 = data['criterion_5']
         review.comment = data.get('comment', review.comment)
 
+        record_review(review, previous)
         db.session.commit()
 
         return {"message": "Оценка успешно обновлена."}, HTTPStatus.OK
@@ -216,38 +235,38 @@ class ArtifactReviewResource(Resource):
 @jury_ns.route('/teams/review-pending')
 class PendingArtifactReviewResource(Resource):
     @jwt_required()
-    @jury_ns.doc(description="Получить список команд, которые нужно оценить")
+    @jury_ns.doc(description="Получить список назначенных команд, которые нужно оценить")
+    @jury_ns.param('limit', 'Размер страницы')
+    @jury_ns.param('cursor', 'Курсор следующей страницы')
+    @resource_versions.conditional("teams", "users", "cases")
     def get(self):
-        jury_id = get_jwt_identity()
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
 
-        pending_teams = Team.query.filter(
-            Team.artifacts != None,  # Проверяем, что команда отправила артефакты
-            ~Team.artifact_reviews.any(ArtifactReview.jury_id == jury_id)  # И ещё не оценены этим жюри
-        ).all()
+        pending_teams, next_cursor = get_assigned_teams(get_current_user_id(), False, limit, after)
 
-        if not pending_teams:
+        if not pending_teams and after is None:
             return {"message": "Нет команд для оценки."}, HTTPStatus.NOT_FOUND
 
-        # Сериализация данных с использованием метода to_dict()
-        teams_data = [team.to_dict() for team in pending_teams]
-
-        return {"teams": teams_data}, HTTPStatus.OK
+        return {"teams": serialize_teams(pending_teams), "next_cursor": next_cursor}, HTTPStatus.OK
 
 
 @jury_ns.route('/teams/reviewed')
 class ReviewedArtifactReviewResource(Resource):
     @jwt_required()
     @jury_ns.doc(description="Получить список команд, которые уже оценены")
+    @jury_ns.param('limit', 'Размер страницы')
+    @jury_ns.param('cursor', 'Курсор следующей страницы')
+    @resource_versions.conditional("teams", "users", "cases")
     def get(self):
-        jury_id = get_jwt_identity()
-        reviewed_teams = Team.query.filter(
-            Team.artifacts != None,  # Проверяем, что команда отправила артефакты
-            Team.artifact_reviews.any(ArtifactReview.jury_id == jury_id)  # И оценены этим жюри
-        ).all()
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
 
-        if not reviewed_teams:
-            return {"message": "Нет оцененных команд."}, HTTPStatus.NOT_FOUND
+        reviewed_teams, next_cursor = get_assigned_teams(get_current_user_id(), True, limit, after)
 
-        teams_data = [team.to_dict() for team in reviewed_teams]
+        if not reviewed_teams and after is None:
+            return {"message": "Нет оцененных команд."}, HTTPStatus.NOT_FOUND
 
-        return {"teams": teams_data}, HTTPStatus.OK
+        return {"teams": serialize_teams(reviewed_teams), "next_cursor": next_cursor}, HTTPStatus.OK
@@ -1,12 +1,21 @@
+from http import HTTPStatus
+
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt
 from flask_restx import Resource
 
-from backend.core.services.profile_service import *
-from backend.core.services.team_service import *
+from backend.core import db
+from backend.core.models.auth_models import User
+from backend.core.models.team_models import Team
+from backend.core.services.auth_service import get_current_user, parse_user_fields, users_query
+from backend.core.services.profile_service import get_user_info_response, login_user, register_user
+from backend.core.services.team_service import get_teams_page, parse_team_fields, team_members
 from . import organizer_ns
+from ..core.extensions import resource_versions
 from ..core.messages import AuthMessages
 from ..core.schemas.auth_schemas import login_model
+from ..core.services.export_service import EXPORT_FORMATS, export_teams_response
+from ..core.services.pagination import parse_page_args, paginate
 
 
 def organizer_or_admin_required():
@@ -25,29 +34,20 @@ class OrganizerLogin(Resource):
     @organizer_ns.doc(description="Аутентификация организатора для получения токена доступа")
     def post(self):
         data = request.get_json()
-        username = data.get("username")
-        password = data.get("password")
-        user = get_user_by_username(username)
-
-        if not user or not user.check_password(password) or user.system_role.role_name != "organizer":
-            return {"message": AuthMessages.AUTH_INVALID_CREDENTIALS}, HTTPStatus.UNAUTHORIZED
-
-        access_token = authenticate_user(username, password)
+        access_token = login_user("organizer", data)
         if access_token:
             return {"access_token": access_token}, HTTPStatus.OK
-
         return {"message": AuthMessages.AUTH_INVALID_CREDENTIALS}, HTTPStatus.UNAUTHORIZED
 
 
 @organizer_ns.route('/profile')
 class OrganizerProfile(Resource):
     @jwt_required()
+    @resource_versions.conditional("users", allow=organizer_required)
     def get(self):
         if not organizer_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
-        username = get_jwt_identity()
-        user = get_user_by_username(username)
-        return get_user_info_response(user)
+        return get_user_info_response(get_current_user())
 
 
 @organizer_ns.route('/jury')
@@ -69,36 +69,85 @@ class JuryManage(Resource):
         return register_user(data)
 
     @jwt_required()
+    @organizer_ns.param('limit', 'Размер страницы')
+    @organizer_ns.param('cursor', 'Курсор следующей страницы')
+    @organizer_ns.param('fields', 'Поля пользователя через запятую: username,full_name')
+    @resource_versions.conditional("users", allow=organizer_or_admin_required)
     def get(self):
         if not organizer_or_admin_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
-        jury_users = get_all_users("jury")
-        return [get_user_info_response(jury)[0] for jury in jury_users], HTTPStatus.OK
+
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
+        fields, error = parse_user_fields(request.args)
+        if error:
+            return error
+
+        jury_users, next_cursor = paginate(users_query("jury", fields), User.user_id, limit, after)
+        return {
+            "jury": [jury.to_dict(fields) for jury in jury_users],
+            "next_cursor": next_cursor
+        }, HTTPStatus.OK
 
 
 @organizer_ns.route('/teams')
 class TeamList(Resource):
     @jwt_required()
+    @organizer_ns.param('limit', 'Размер страницы')
+    @organizer_ns.param('cursor', 'Курсор следующей страницы')
+    @organizer_ns.param('fields', 'Поля ответа через запятую, поля связей через точку: team_name,members.username')
+    @organizer_ns.param('include', 'Связи к полям по умолчанию: members,cases,artifacts,reviews,team_lead')
+    @resource_versions.conditional("teams", "users", "cases", allow=organizer_or_admin_required)
     def get(self):
         if not organizer_or_admin_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
-        teams = Team.query.all()
-        return [team.to_dict() for team in teams], HTTPStatus.OK
+
+        limit, after, error = parse_page_args(request.args)
+        if error:
+            return error
+        fields, error = parse_team_fields(request.args)
+        if error:
+            return error
+
+        return get_teams_page(limit, after, fields), HTTPStatus.OK
+
+
+@organizer_ns.route('/teams/export')
+class TeamExport(Resource):
+    @jwt_required()
+    @organizer_ns.param('format', 'csv, jsonl или xlsx')
+    @organizer_ns.doc(description="Потоковая выгрузка итогового протокола: команды, участники, кейсы, артефакты и оценки")
+    def get(self):
+        if not organizer_or_admin_required():
+            return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
+
+        fmt = request.args.get('format', 'csv').lower()
+        if fmt not in EXPORT_FORMATS:
+            return {"message": "Поддерживаются только форматы CSV, JSONL и XLSX."}, HTTPStatus.BAD_REQUEST
+
+        return export_teams_response(fmt)
 
 
 @organizer_ns.route('/teams/<string:team_name>/members')
 class TeamMembersByName(Resource):
     @jwt_required()
+    @organizer_ns.param('fields', 'Поля пользователя через запятую: username,full_name')
+    @resource_versions.conditional("teams", "users", allow=organizer_required)
     def get(self, team_name):
         if not organizer_required():
             return {"message": AuthMessages.AUTH_ACCESS_DENIED}, HTTPStatus.FORBIDDEN
 
+        fields, error = parse_user_fields(request.args)
+        if error:
+            return error
+
         team = Team.query.filter_by(team_name=team_name).first()
         if not team:
             return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
 
-        members = team.members
-        return [user.to_dict() for user in members], HTTPStatus.OK
+        members = team_members(team.team_id, fields)
+        return [user.to_dict(fields) for user in members], HTTPStatus.OK
 
 
 @organizer_ns.route('/teams/<string:team_name>')
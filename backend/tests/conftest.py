@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import event
+
+from backend.core import create_app, db
+from backend.core.extensions import resource_versions, role_registry, user_cache
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("app")
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "test-secret",
+        "JWT_SECRET_KEY": "test-jwt-secret-key-with-enough-length",
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{workdir / 'test.sqlite3'}",
+        "UPLOAD_FOLDER": str(workdir / "uploads"),
+        "CACHE_BACKEND": "none",
+        "PROFILING_ENABLED": False,
+        "SQL_STATS_HEADERS": False,
+        "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000",
+    })
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def reset_database(app, create=True):
+    """Пересоздать схему и сбросить справочники и кэши процесса, привязанные к прежним строкам"""
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        if create:
+            db.create_all()
+    role_registry.invalidate()
+    user_cache.clear()
+    if create:
+        resource_versions.init_app(app)
+
+
+@pytest.fixture
+def database(app):
+    """Пустая схема на время теста"""
+    reset_database(app)
+    yield db
+    reset_database(app, create=False)
+
+
+@pytest.fixture
+def client(app, database):
+    return app.test_client()
+
+
+def login(client, namespace, username, password=PASSWORD):
+    response = client.post(f"/api/{namespace}/login", json={"username": username, "password": password})
+    assert response.status_code == 200, response.get_json()
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+class QueryCounter:
+    """Число SQL-выражений движка внутри блока with"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture
+def count_queries(app):
+    with app.app_context():
+        engine = db.engine
+    return lambda: QueryCounter(engine)
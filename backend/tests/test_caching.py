@@ -0,0 +1,121 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core.caching import FileSystemBackend, SharedCache
+
+CONFIG = {"CACHE_DEFAULT_TTL": 60, "CACHE_KEY_PREFIX": "test:", "CACHE_MAX_ENTRIES": 100,
+          "CACHE_REDIS_URL": "redis://localhost:6379/0"}
+
+
+class Versions:
+    """Версии семейств ресурсов, которые тест меняет вручную"""
+
+    def __init__(self):
+        self.values = {"teams": 1}
+
+    def current(self, families):
+        return {family: self.values.get(family) for family in families}
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture(params=["memory", "filesystem", "redis"])
+def cache(request, tmp_path):
+    client = request.getfixturevalue("redis_client") if request.param == "redis" else None
+    shared = SharedCache()
+    config = dict(CONFIG, CACHE_BACKEND=request.param, CACHE_DIR=str(tmp_path / "cache"))
+    shared.init_app(SimpleNamespace(config=config), versions=Versions(), client=client)
+    return shared
+
+
+def counting(cache):
+    calls = []
+
+    @cache.cached("teams_page", "teams")
+    def page(limit, after=None):
+        calls.append((limit, after))
+        return {"items": list(range(limit)), "after": after}
+
+    return page, calls
+
+
+def test_hit_after_miss(cache):
+    page, calls = counting(cache)
+    assert page(3) == page(3) == {"items": [0, 1, 2], "after": None}
+    page(3, after=5)
+    assert calls == [(3, None), (3, 5)]
+    assert cache.stats()["namespaces"]["teams_page"] == {"hits": 1, "misses": 2}
+
+
+def test_version_change_misses(cache):
+    page, calls = counting(cache)
+    page(2)
+    cache._versions.values["teams"] = 2
+    page(2)
+    assert len(calls) == 2
+
+
+def test_invalidate_namespace(cache):
+    page, calls = counting(cache)
+    page(2)
+    cache.invalidate("teams_page")
+    page(2)
+    page(2)
+    assert len(calls) == 2
+
+
+def test_redis_clear_keeps_foreign_keys(redis_client):
+    cache = SharedCache()
+    cache.init_app(SimpleNamespace(config=dict(CONFIG, CACHE_BACKEND="redis")), client=redis_client)
+    redis_client.set("other:key", "1")
+    page, calls = counting(cache)
+    page(1)
+
+    cache.clear()
+    assert redis_client.keys("test:*") == [] and redis_client.get("other:key") == b"1"
+    page(1)
+    assert len(calls) == 2
+
+
+def test_redis_sets_ttl(redis_client):
+    cache = SharedCache()
+    cache.init_app(SimpleNamespace(config=dict(CONFIG, CACHE_BACKEND="redis")), client=redis_client)
+
+    @cache.cached("short", ttl=5)
+    def value():
+        return 1
+
+    value()
+    key = cache.key_for("short", (), (), {})
+    assert 0 < redis_client.ttl(key) <= 5
+
+
+def test_filesystem_expired_and_corrupt_entries(tmp_path):
+    backend = FileSystemBackend(str(tmp_path), max_entries=10)
+    backend.set("expired", "value", -1)
+    assert backend.get("expired") is None
+    assert not os.path.exists(backend._path("expired"))
+
+    with open(backend._path("corrupt"), "w", encoding="utf-8") as file:
+        file.write("no expiry line")
+    assert backend.get("corrupt") is None
+
+    backend.set("fresh", "значение\nс переводом строки", 60)
+    assert backend.get("fresh") == "значение\nс переводом строки"
+
+
+def test_filesystem_prunes_oldest(tmp_path):
+    backend = FileSystemBackend(str(tmp_path), max_entries=10)
+    for index in range(25):
+        backend.set(f"key{index}", str(index), 60)
+        os.utime(backend._path(f"key{index}"), (index, index))
+
+    entries = os.listdir(tmp_path)
+    assert len(entries) <= 10 and not [entry for entry in entries if entry.startswith(".tmp")]
+    assert backend.get("key24") == "24" and backend.get("key0") is None
@@ -0,0 +1,94 @@
+from collections import Counter
+
+import pytest
+from sqlalchemy import delete, select
+
+from backend.core import db
+from backend.core.models.hackathon_model import HackathonCase
+from backend.core.models.team_models import TeamCase
+from backend.core.services.assignment_service import assign_cases, plan_assignment
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login
+
+
+def test_capacity_limits():
+    placement, unplaced = plan_assignment(range(10), {1: 3, 2: 2, 3: None}, seed=1)
+    load = Counter(placement.values())
+    assert load[1] <= 3 and load[2] <= 2
+    assert len(placement) == 10 and not unplaced
+
+
+def test_teams_without_room_are_unplaced():
+    placement, unplaced = plan_assignment(range(7), {1: 2, 2: 3}, seed=1)
+    assert Counter(placement.values()) == {1: 2, 2: 3}
+    assert sorted(unplaced + list(placement)) == list(range(7))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_preference_order(seed):
+    # Первый выбор один на двоих: вторая команда получает свой второй выбор, а не свободный кейс
+    preferences = {0: [1, 2], 1: [1, 2], 2: [3, 1]}
+    placement, _ = plan_assignment([0, 1, 2], {1: 1, 2: 1, 3: 1, 4: 1}, preferences, seed=seed)
+    assert {placement[0], placement[1]} == {1, 2}
+    assert placement[2] == 3
+
+
+def test_balanced_without_preferences():
+    placement, _ = plan_assignment(range(10), {1: None, 2: None, 3: None}, seed=3)
+    load = Counter(placement.values())
+    assert max(load.values()) - min(load.values()) <= 1
+
+
+def test_same_seed_same_result():
+    args = (range(50), {1: 10, 2: 20, 3: None}, {7: [2], 8: [1, 3]})
+    assert plan_assignment(*args, seed=42) == plan_assignment(*args, seed=42)
+    assert plan_assignment(*args, seed=42) != plan_assignment(*args, seed=43)
+
+
+def test_load_counts_toward_capacity():
+    placement, unplaced = plan_assignment(range(4), {1: 3, 2: 3}, seed=1, load={1: 3})
+    assert set(placement.values()) == {2} and len(unplaced) == 1
+
+
+@pytest.fixture
+def seeded(app, database):
+    with app.app_context():
+        generate_dataset(users=40, teams=12, jury=1, cases=3, reviews_per_jury=0, seed=1, password=PASSWORD)
+
+
+def team_cases(app):
+    with app.app_context():
+        return dict(db.session.execute(select(TeamCase.team_id, TeamCase.case_id)).all())
+
+
+def test_incremental_keeps_existing_rows(app, seeded):
+    with app.app_context():
+        db.session.execute(delete(TeamCase).where(TeamCase.team_id > 8))
+        db.session.commit()
+    existing = team_cases(app)
+
+    with app.app_context():
+        result, error, status = assign_cases(seed=1, incremental=True)
+    assert status == 200, error
+    assert result["assigned"] == 4 and result["unassigned"] == []
+
+    assigned = team_cases(app)
+    assert {team_id: assigned[team_id] for team_id in existing} == existing
+    assert len(assigned) == 12
+
+
+def test_full_assignment_respects_capacity_and_seed(app, client, seeded):
+    with app.app_context():
+        for case in HackathonCase.query:
+            case.capacity = 3
+        db.session.commit()
+    headers = login(client, "admin", "admin")
+
+    response = client.post("/api/admin/assign_cases", json={"seed": 7}, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["assigned"] == 9 and len(response.get_json()["unassigned"]) == 3
+    first = team_cases(app)
+    assert max(Counter(first.values()).values()) == 3
+
+    assert client.post("/api/admin/assign_cases", json={"seed": 7}, headers=headers).status_code == 200
+    assert team_cases(app) == first
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CHILD = "from backend.core import create_app; create_app()"
+
+
+def startup_log(tmp_path, **env):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'startup.sqlite3'}", DB_MIGRATIONS="0",
+               OPENAPI_SPEC_FILE="", **env)
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=REPO_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stderr
+
+
+def test_engine_report_is_logged(tmp_path):
+    assert "DB profile sqlite: journal_mode=WAL" in startup_log(tmp_path)
+
+
+def test_log_level(tmp_path):
+    assert "DB profile" not in startup_log(tmp_path, LOG_LEVEL="warning")
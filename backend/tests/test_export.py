@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+import zipfile
+from xml.sax.saxutils import escape
+
+import pytest
+from sqlalchemy import update
+
+from backend.core import db
+from backend.core.models.team_models import Team
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login
+
+PAYLOADS = ["=HYPERLINK(\"http://x\")", "+1", "-1", "@SUM(A1)", "\tcmd", "\rcmd"]
+
+
+@pytest.fixture
+def headers(app, client):
+    with app.app_context():
+        generate_dataset(users=len(PAYLOADS) * 3, teams=len(PAYLOADS), jury=1, cases=1, reviews_per_jury=0, seed=1,
+                         password=PASSWORD)
+        for team_id, payload in enumerate(PAYLOADS, start=1):
+            db.session.execute(update(Team).where(Team.team_id == team_id).values(description=payload))
+        db.session.commit()
+    return login(client, "organization", "organizer")
+
+
+def export(client, headers, fmt):
+    response = client.get(f"/api/organization/teams/export?format={fmt}", headers=headers)
+    assert response.status_code == 200
+    return response.get_data()
+
+
+def test_csv_escapes_formulas(client, headers):
+    rows = list(csv.DictReader(io.StringIO(export(client, headers, "csv").decode("utf-8-sig"), newline="")))
+    assert [row["description"] for row in rows] == ["'" + payload for payload in PAYLOADS]
+
+
+def test_xlsx_keeps_values(client, headers):
+    # Строки XLSX — inlineStr, они не вычисляются; апостроф остался бы в значении ячейки
+    with zipfile.ZipFile(io.BytesIO(export(client, headers, "xlsx"))) as archive:
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+    assert "<f>" not in sheet and "'" not in sheet
+    for payload in PAYLOADS:
+        assert f'<c t="inlineStr"><is><t xml:space="preserve">{escape(payload)}</t></is></c>' in sheet
+
+
+def test_jsonl_keeps_values(client, headers):
+    lines = export(client, headers, "jsonl").decode().splitlines()
+    assert [json.loads(line)["description"] for line in lines] == PAYLOADS
@@ -0,0 +1,75 @@
+import pytest
+
+from backend.core.models.auth_models import USER_FIELDS
+from backend.core.services.seed_service import generate_dataset
+from backend.core.services.team_service import parse_team_fields
+from backend.tests.conftest import PASSWORD, login
+
+DEFAULT_TEAM_FIELDS = {"team_id", "team_name", "description"}
+
+
+@pytest.fixture
+def admin(app, client):
+    with app.app_context():
+        generate_dataset(users=30, teams=10, jury=3, cases=2, reviews_per_jury=4, seed=1, password=PASSWORD)
+    headers = login(client, "admin", "admin")
+    # Прогрев: версии ресурсов читаются из базы при первом условном запросе
+    assert client.get("/api/admin/teams", headers=headers).status_code == 200
+    return headers
+
+
+def teams(client, headers, query):
+    response = client.get(f"/api/admin/teams?{query}", headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()["teams"]
+
+
+@pytest.mark.parametrize("query, field", [
+    ("fields=bogus", "bogus"),
+    ("fields=team_name,members.bogus", "members.bogus"),
+    ("fields=team_name.username", "team_name.username"),
+])
+def test_unknown_field(client, admin, query, field):
+    response = client.get(f"/api/admin/teams?{query}", headers=admin)
+    assert response.status_code == 400
+    assert field in response.get_json()["message"]
+
+
+def test_unknown_include(client, admin):
+    response = client.get("/api/admin/teams?include=bogus", headers=admin)
+    assert response.status_code == 400
+    assert "bogus" in response.get_json()["message"]
+
+
+def test_nested_member_fields(client, admin):
+    for team in teams(client, admin, "fields=team_name,members.username"):
+        assert set(team) == {"team_name", "members"}
+        assert team["members"] and all(set(member) == {"username"} for member in team["members"])
+
+
+def test_include_adds_relation_to_defaults(client, admin):
+    for team in teams(client, admin, "include=members"):
+        assert set(team) == DEFAULT_TEAM_FIELDS | {"members"}
+        assert all(set(member) == set(USER_FIELDS) for member in team["members"])
+
+
+def test_include_keeps_nested_selection(client, admin):
+    for team in teams(client, admin, "include=members&fields=members.username"):
+        assert set(team) == {"members"}
+        assert all(set(member) == {"username"} for member in team["members"])
+
+
+def test_team_name_is_one_query(client, count_queries, admin):
+    with count_queries() as counter:
+        result = teams(client, admin, "fields=team_name")
+    assert result and all(set(team) == {"team_name"} for team in result)
+    assert counter.count == 1
+    assert "team_members" not in counter.statements[0]
+
+
+def test_canonical_order(app):
+    with app.test_request_context():
+        first, _ = parse_team_fields({"fields": "members.phone,team_name,members.username"})
+        second, _ = parse_team_fields({"fields": "team_name,members.username,members.phone"})
+    assert first == second == {"team_name": None, "members": ("username", "phone")}
+    assert list(first) == ["team_name", "members"]
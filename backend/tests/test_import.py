@@ -0,0 +1,44 @@
+from sqlalchemy import insert, select
+
+from backend.core import db
+from backend.core.models.auth_models import User
+from backend.core.services import import_service
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD
+
+
+def participant(name):
+    return {"username": name, "email": f"{name}@example.com", "password": "secret", "full_name": name,
+            "phone": "1", "university": "u", "study_info": "s"}
+
+
+def test_conflict_rejects_only_conflicting_rows(app, database, monkeypatch):
+    hash_passwords = import_service.hash_passwords
+
+    def racing_hash(workers, passwords):
+        # Конкурирующая регистрация занимает имя между проверкой пачки и вставкой
+        db.session.execute(insert(User), [dict(participant("p1"), email="other@example.com", password_hash="-",
+                                               system_role_id=1)])
+        db.session.commit()
+        return hash_passwords(workers, passwords)
+
+    monkeypatch.setattr(import_service, "hash_passwords", racing_hash)
+    monkeypatch.setitem(app.config, "IMPORT_HASH_WORKERS", 1)
+    with app.app_context():
+        generate_dataset(users=1, teams=0, jury=0, cases=0, reviews_per_jury=0, seed=1, password=PASSWORD)
+        result = import_service.import_participants([(n, participant(f"p{n}"), None) for n in range(3)])
+        usernames = set(db.session.scalars(select(User.username).where(User.username.like("p%"))))
+
+    assert result["created"] == 2
+    assert [(error["row"], error["username"]) for error in result["errors"]] == [(1, "p1")]
+    assert usernames == {"p0", "p1", "p2"}
+
+
+def test_hash_pool_is_shared(app):
+    with app.app_context():
+        first = import_service.hash_passwords(2, ["a", "b"])
+        pool = import_service.hash_pool(2)
+        import_service.hash_passwords(2, ["c"])
+        assert import_service.hash_pool(2) is pool
+    assert pool._mp_context.get_start_method() == "spawn"
+    assert all(value.startswith("pbkdf2:sha256:1000$") for value in first)
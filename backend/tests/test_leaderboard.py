@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import select
+
+from backend.core import db
+from backend.core.models.team_models import TeamScore
+from backend.core.services.leaderboard_service import rebuild_scores
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login
+
+WRITES = ("INSERT", "UPDATE", "DELETE")
+REVIEW = {f"criterion_{i}": 5 for i in range(1, 6)}
+
+
+@pytest.fixture
+def seeded(app, database):
+    with app.app_context():
+        generate_dataset(users=30, teams=10, jury=3, cases=2, reviews_per_jury=4, seed=1, password=PASSWORD)
+
+
+def normalized(app):
+    with app.app_context():
+        return dict(db.session.execute(select(TeamScore.team_id, TeamScore.normalized_mean)).all())
+
+
+def submit_review(client, headers):
+    team_name = client.get("/api/jury/teams/review-pending", headers=headers).get_json()["teams"][0]["team_name"]
+    assert client.post(f"/api/jury/teams/review/{team_name}", json=REVIEW, headers=headers).status_code == 201
+    return team_name
+
+
+def test_reads_do_not_write(client, count_queries, seeded):
+    submit_review(client, login(client, "jury", "jury_0"))
+    admin = login(client, "admin", "admin")
+    organizer = login(client, "organization", "organizer")
+    with count_queries() as counter:
+        assert client.get("/api/admin/leaderboard?normalize=zscore", headers=admin).status_code == 200
+        response = client.get("/api/organization/teams/export?format=csv", headers=organizer)
+        assert response.status_code == 200
+        response.get_data()
+    assert not [statement for statement in counter.statements if statement.lstrip().upper().startswith(WRITES)]
+
+
+def test_review_updates_normalized_scores(app, client, seeded):
+    headers = login(client, "jury", "jury_0")
+    team_name = submit_review(client, headers)
+    assert client.put(f"/api/jury/teams/review/{team_name}", json={**REVIEW, "criterion_1": 1},
+                      headers=headers).status_code == 200
+    incremental = normalized(app)
+
+    with app.app_context():
+        rebuild_scores()
+    assert incremental == pytest.approx(normalized(app))
+    assert None not in incremental.values()
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MIGRATIONS_DIR = os.path.join(REPO_DIR, "backend", "migrations")
+
+BASELINE = {"artifact_reviews", "hackathon_cases", "roles", "team_artifacts", "team_cases", "team_members", "teams",
+            "users"}
+
+# Отдельный интерпретатор: alembic подключается только при DB_MIGRATIONS, а тестовое приложение его отключает
+CHILD = """
+import json, sys
+from flask_migrate import upgrade
+from sqlalchemy import inspect
+from backend.core import create_app, db
+
+def schema():
+    inspector = inspect(db.engine)
+    return {table: {"columns": sorted(column["name"] for column in inspector.get_columns(table)),
+                    "indexes": sorted(index["name"] for index in inspector.get_indexes(table))}
+            for table in inspector.get_table_names() if table != "alembic_version"}
+
+app = create_app()
+with app.app_context():
+    upgrade(directory=sys.argv[1], revision="0001")
+    baseline = sorted(schema())
+    upgrade(directory=sys.argv[1])
+    migrated = schema()
+    db.drop_all()
+    db.session.execute(db.text("DROP TABLE alembic_version"))
+    db.session.commit()
+    db.create_all()
+    print(json.dumps({"baseline": baseline, "migrated": migrated, "models": schema()}))
+"""
+
+
+def test_migrations_match_models(tmp_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'migrations.sqlite3'}", DB_MIGRATIONS="1",
+               DEBUG="0")
+    result = subprocess.run([sys.executable, "-c", CHILD, MIGRATIONS_DIR], cwd=REPO_DIR, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert set(output["baseline"]) == BASELINE
+    assert output["migrated"] == output["models"]
@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Каждое приложение — в своём интерпретаторе: в процессе тестов все модели и пространства имён уже загружены
+SEED = """
+import json, sys
+from backend.core import create_app, db
+from backend.core.extensions import api
+from backend.core.services.seed_service import generate_dataset
+app = create_app()
+with app.app_context():
+    db.create_all()
+    generate_dataset(users=6, teams=2, jury=1, cases=1, reviews_per_jury=0, seed=1, password="test-password")
+with open(sys.argv[1], "w", encoding="utf-8") as file:
+    json.dump(api.export_spec(app), file)
+"""
+
+CHILD = """
+import json
+from backend.core import create_app
+app = create_app()
+client = app.test_client()
+namespace, username = {"user": ("user", "user_0"), "organizer": ("organization", "organizer")}[app.config["API_NAMESPACES"][0]]
+login = client.post(f"/api/{namespace}/login", json={"username": username, "password": "test-password"})
+headers = {"Authorization": "Bearer " + login.get_json()["access_token"]}
+path = "/api/user/my-teams" if namespace == "user" else "/api/organization/teams"
+teams = client.get(path, headers=headers)
+print(json.dumps({"login": login.status_code, "teams": teams.status_code, "body": teams.get_json(),
+                  "paths": sorted(client.get("/swagger.json").get_json()["paths"])}))
+"""
+
+
+def run(code, env, *args):
+    result = subprocess.run([sys.executable, "-c", code, *args], cwd=REPO_DIR, env=env, capture_output=True,
+                            text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()[-1] if result.stdout.strip() else None
+
+
+def test_single_namespace_app(tmp_path):
+    spec_file = str(tmp_path / "openapi.json")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'app.sqlite3'}", DEBUG="0", CACHE_BACKEND="none",
+               JWT_SECRET_KEY="test-jwt-secret-key-with-enough-length", PASSWORD_HASH_METHOD="pbkdf2:sha256:1000",
+               OPENAPI_SPEC_FILE=spec_file, UPLOAD_FOLDER=str(tmp_path / "uploads"))
+    run(SEED, env, spec_file)
+
+    for namespace, prefix in (("user", "/api/user/"), ("organizer", "/api/organization/")):
+        result = json.loads(run(CHILD, dict(env, API_NAMESPACES=namespace)))
+        assert result["login"] == 200 and result["teams"] == 200, result
+        # Файл спецификации собран для всех пространств имён: приложению с одним он не отдаётся
+        assert result["paths"] and all(path.startswith(prefix) for path in result["paths"])
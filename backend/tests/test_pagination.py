@@ -0,0 +1,52 @@
+import base64
+import json
+
+import pytest
+
+from backend.core.services.pagination import decode_cursor, encode_cursor
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login
+
+
+def raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps({"after": value}).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("value", [[1, 2], "abc", True, None, 1.5, {"id": 1}])
+def test_decode_cursor_accepts_only_integer_ids(value):
+    assert decode_cursor(raw_cursor(value)) is None
+
+
+def test_decode_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_cursor("не-base64") is None
+
+
+@pytest.mark.parametrize("path", ["/api/admin/teams", "/api/admin/users", "/api/admin/leaderboard"])
+@pytest.mark.parametrize("value", [[1, 2], "abc", False, [1, "x", 0]])
+def test_malformed_cursor_is_bad_request(app, client, path, value):
+    with app.app_context():
+        generate_dataset(users=6, teams=2, jury=2, cases=1, reviews_per_jury=2, seed=1, password=PASSWORD)
+    headers = login(client, "admin", "admin")
+    response = client.get(path, query_string={"cursor": raw_cursor(value)}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_pages_follow_cursor(app, client):
+    with app.app_context():
+        generate_dataset(users=10, teams=5, jury=2, cases=1, reviews_per_jury=5, seed=1, password=PASSWORD)
+    headers = login(client, "admin", "admin")
+    names, cursor = [], None
+    while True:
+        page = client.get("/api/admin/teams", query_string={"limit": 2, "cursor": cursor or ""},
+                          headers=headers).get_json()
+        names += [team["team_name"] for team in page["teams"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert names == [f"team_{i}" for i in range(5)]
+
+    first = client.get("/api/admin/leaderboard", query_string={"limit": 2}, headers=headers).get_json()
+    second = client.get("/api/admin/leaderboard", query_string={"limit": 2, "cursor": first["next_cursor"]},
+                        headers=headers)
+    assert second.status_code == 200
@@ -0,0 +1,22 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from backend.core.models.auth_models import User, hash_method_prefix
+
+
+@pytest.mark.parametrize("method", ["pbkdf2", "pbkdf2:sha256", "pbkdf2:sha256:1000", "scrypt"])
+def test_partial_method_does_not_rehash(app, method):
+    app.config["PASSWORD_HASH_METHOD"] = method
+    try:
+        with app.app_context():
+            user = User(password_hash=generate_password_hash("secret", method=method))
+            assert not user.needs_rehash()
+    finally:
+        app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+
+
+def test_changed_parameters_rehash(app):
+    with app.app_context():
+        user = User(password_hash=generate_password_hash("secret", method="pbkdf2:sha256:2000"))
+        assert user.needs_rehash()
+    assert hash_method_prefix("pbkdf2:sha256:1000") == "pbkdf2:sha256:1000"
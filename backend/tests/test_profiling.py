@@ -0,0 +1,42 @@
+import threading
+import tracemalloc
+
+from backend.core.profiling import RequestProfiler
+
+
+def test_tracing_stops_after_last_overlapping_request(app, tmp_path, monkeypatch):
+    profiler = RequestProfiler()
+    profiler.directory = str(tmp_path)
+    monkeypatch.setattr(profiler, "_is_admin", lambda: True)
+
+    started = threading.Barrier(2)
+    first_done = threading.Event()
+    results = {}
+
+    def run(name):
+        try:
+            with app.test_request_context("/api/admin/teams?_profile=1"):
+                profiler._start()
+                started.wait(timeout=5)
+                if name == "second":
+                    first_done.wait(timeout=5)
+                    results["tracing_during_second"] = tracemalloc.is_tracing()
+                response = profiler._finish(app.response_class())
+                results[name] = response.headers.get("X-Profile-Id")
+        except Exception as e:
+            results[name] = e
+        finally:
+            if name == "first":
+                first_done.set()
+
+    assert not tracemalloc.is_tracing()
+    threads = [threading.Thread(target=run, args=(name,)) for name in ("first", "second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert results["tracing_during_second"] is True
+    assert all(isinstance(results[name], str) for name in ("first", "second")), results
+    assert not tracemalloc.is_tracing()
+    assert len(list(tmp_path.glob("*.txt"))) == 2
@@ -0,0 +1,81 @@
+from sqlalchemy import func, select
+
+from backend.core import db
+from backend.core.extensions import role_registry
+from backend.core.models.auth_models import User
+from backend.core.models.team_models import ReviewAssignment, TeamArtifacts
+from backend.core.services.auth_service import create_user
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login
+
+
+def current_jury_counts(app):
+    """Число назначений действующих членов жюри у каждой команды с артефактами"""
+    with app.app_context():
+        jury_ids = select(User.user_id).where(User.system_role_id == role_registry.id_of("jury"))
+        counts = dict(db.session.execute(
+            select(ReviewAssignment.team_id, func.count())
+            .where(ReviewAssignment.jury_id.in_(jury_ids))
+            .group_by(ReviewAssignment.team_id)
+        ).all())
+        return {team_id: counts.get(team_id, 0) for team_id in db.session.scalars(select(TeamArtifacts.team_id))}
+
+
+def test_jury_moved_to_organizers_releases_queue(app, client, database):
+    with app.app_context():
+        generate_dataset(users=24, teams=8, jury=4, cases=2, reviews_per_jury=2, seed=1, password=PASSWORD)
+        jury_id = db.session.scalar(select(User.user_id).where(User.username == "jury_0"))
+    headers = login(client, "admin", "admin")
+
+    response = client.post("/api/admin/organizers", json={"username": "jury_0"}, headers=headers)
+    assert response.status_code == 200
+
+    with app.app_context():
+        pending = db.session.scalar(select(func.count()).select_from(ReviewAssignment).where(
+            ReviewAssignment.jury_id == jury_id, ReviewAssignment.reviewed == False  # noqa: E712
+        ))
+    assert pending == 0
+    counts = current_jury_counts(app)
+    assert counts and set(counts.values()) == {app.config["REVIEWS_PER_TEAM"]}
+
+
+def loads_by_jury(app):
+    with app.app_context():
+        return dict(db.session.execute(
+            select(ReviewAssignment.jury_id, func.count()).group_by(ReviewAssignment.jury_id)
+        ).all())
+
+
+def add_jury(app, count, start):
+    with app.app_context():
+        for index in range(start, start + count):
+            assert create_user(f"new_jury_{index}", f"new_jury_{index}@example.com", PASSWORD, "Jury", "1", "u", "s",
+                               "jury", None)
+
+
+def test_new_jury_fill_underassigned_teams(app, database):
+    with app.app_context():
+        generate_dataset(users=18, teams=6, jury=1, cases=1, reviews_per_jury=0, seed=1, password=PASSWORD)
+    assert set(current_jury_counts(app).values()) == {1}
+
+    add_jury(app, 3, start=0)
+
+    counts = current_jury_counts(app)
+    assert len(counts) == 6 and set(counts.values()) == {app.config["REVIEWS_PER_TEAM"]}
+    loads = loads_by_jury(app)
+    assert len(loads) == 4 and max(loads.values()) - min(loads.values()) <= 2
+
+
+def test_new_jury_takes_share_of_full_queue(app, database):
+    with app.app_context():
+        generate_dataset(users=36, teams=12, jury=3, cases=1, reviews_per_jury=0, seed=1, password=PASSWORD)
+    before = loads_by_jury(app)
+
+    add_jury(app, 1, start=0)
+
+    loads = loads_by_jury(app)
+    counts = current_jury_counts(app)
+    assert set(counts.values()) == {app.config["REVIEWS_PER_TEAM"]}
+    new_load = loads[max(loads)]
+    assert new_load >= sum(before.values()) // 4
+    assert all(loads[jury_id] <= load for jury_id, load in before.items())
@@ -0,0 +1,95 @@
+import hashlib
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from backend.core import db
+from backend.core.models.storage_model import StoredBlob
+from backend.core.services.hackathon_service import create_hackathon_case, delete_hackathon_case, \
+    update_hackathon_case
+from backend.core.services.storage_service import acquire_upload, collect_garbage
+from backend.core.services.utilits import upload_folder, upload_path
+
+CASE = {"title": "Кейс", "description": "Описание"}
+
+
+def upload(content):
+    return FileStorage(io.BytesIO(content), filename="case.pdf")
+
+
+def key_of(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def refs():
+    db.session.expire_all()
+    return {blob.sha256: blob.ref_count for blob in StoredBlob.query}
+
+
+def stored(key):
+    return os.path.exists(os.path.join(upload_folder(), upload_path(key)))
+
+
+@pytest.fixture
+def context(app, database, tmp_path, monkeypatch):
+    # Свой каталог загрузок: файлы других тестов выглядели бы для сборщика мусора сиротами
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+    with app.app_context():
+        yield
+
+
+def test_reference_counting(context):
+    first, second = key_of(b"first"), key_of(b"second")
+    case_a, _, status = create_hackathon_case(CASE, upload(b"first"))
+    assert status == 201
+    case_b, _, _ = create_hackathon_case(CASE, upload(b"first"))
+    assert refs() == {first: 2}
+
+    update_hackathon_case(case_a.case_id, {}, upload(b"second"))
+    assert refs() == {first: 1, second: 1}
+
+    delete_hackathon_case(case_b.case_id)
+    # Файл без ссылок удаляется только сборкой мусора
+    assert refs() == {first: 0, second: 1}
+    assert stored(first)
+
+    assert collect_garbage() == 1
+    assert refs() == {second: 1}
+    assert not stored(first) and stored(second)
+
+
+def test_same_content_reuses_row(context):
+    key = key_of(b"same")
+    acquire_upload(key, 4)
+    acquire_upload(key, 4)
+    db.session.commit()
+    assert refs() == {key: 2}
+
+
+def test_reupload_keeps_released_file(context):
+    key = key_of(b"again")
+    case, _, _ = create_hackathon_case(CASE, upload(b"again"))
+    delete_hackathon_case(case.case_id)
+    create_hackathon_case(CASE, upload(b"again"))
+
+    assert collect_garbage() == 0
+    assert refs() == {key: 1}
+    assert stored(key)
+
+
+def test_collect_orphan_files(context):
+    # Файл на диске без строки: загрузка, транзакция которой откатилась
+    key = key_of(b"orphan")
+    create_hackathon_case(CASE, upload(b"kept"))
+    acquire_upload(key, 6)
+    path = os.path.join(upload_folder(), upload_path(key))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(b"orphan")
+    db.session.rollback()
+
+    assert collect_garbage() == 1
+    assert not stored(key) and stored(key_of(b"kept"))
+    assert refs() == {key_of(b"kept"): 1}
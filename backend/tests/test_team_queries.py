@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import insert, select
+
+from backend.core import db
+from backend.core.models.auth_models import User
+from backend.core.models.team_models import Team, TeamMember
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login, reset_database
+
+ENDPOINTS = {
+    "admin_teams": ("admin", "admin", "/api/admin/teams?limit=200"),
+    "organizer_teams": ("organization", "organizer", "/api/organization/teams?limit=200"),
+    "my_teams": ("user", "user_0", "/api/user/my-teams"),
+    "review_pending": ("jury", "jury_0", "/api/jury/teams/review-pending?limit=200"),
+    "reviewed": ("jury", "jury_0", "/api/jury/teams/reviewed?limit=200"),
+}
+
+
+def seed(app, teams):
+    """teams команд по три участника; user_0 состоит во всех, jury_0 оценил половину и проверяет остальные"""
+    with app.app_context():
+        generate_dataset(users=teams * 3, teams=teams, jury=3, cases=2, reviews_per_jury=teams // 2, seed=1,
+                         password=PASSWORD)
+        user_id = db.session.scalar(select(User.user_id).where(User.username == "user_0"))
+        own = set(db.session.scalars(select(TeamMember.team_id).where(TeamMember.user_id == user_id)))
+        db.session.execute(insert(TeamMember), [
+            {"team_id": team_id, "user_id": user_id}
+            for team_id in db.session.scalars(select(Team.team_id)) if team_id not in own
+        ])
+        db.session.commit()
+
+
+def measure(client, count_queries, namespace, username, path):
+    headers = login(client, namespace, username)
+    # Первый запрос прогревает справочники и версии ресурсов процесса
+    assert client.get(path, headers=headers).status_code == 200
+    with count_queries() as counter:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    return counter.count, response.get_json()
+
+
+def team_count(payload):
+    return len(payload if isinstance(payload, list) else payload["teams"])
+
+
+@pytest.mark.parametrize("name", ENDPOINTS)
+def test_query_count_does_not_grow_with_teams(app, database, client, count_queries, name):
+    namespace, username, path = ENDPOINTS[name]
+    counts, sizes = [], []
+    for teams in (4, 12):
+        seed(app, teams)
+        count, payload = measure(client, count_queries, namespace, username, path)
+        counts.append(count)
+        sizes.append(team_count(payload))
+        reset_database(app)
+
+    assert sizes[1] > sizes[0]
+    assert counts[1] <= counts[0], f"{name}: {counts[0]} SQL при 4 командах, {counts[1]} при 12"
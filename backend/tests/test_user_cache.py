@@ -0,0 +1,20 @@
+from sqlalchemy import update
+
+from backend.core import db
+from backend.core.models.auth_models import User
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login
+
+
+def test_cached_user_follows_users_version(app, client, database):
+    with app.app_context():
+        generate_dataset(users=3, teams=1, jury=1, cases=1, reviews_per_jury=0, seed=1, password=PASSWORD)
+    headers = login(client, "user", "user_0")
+    assert client.get("/api/user/profile", headers=headers).status_code == 200
+
+    # Изменение в обход invalidate_user, как из другого воркера: запись кэша устаревает по версии users
+    with app.app_context():
+        db.session.execute(update(User).where(User.username == "user_0").values(full_name="Renamed"))
+        db.session.commit()
+
+    assert client.get("/api/user/profile", headers=headers).get_json()["full_name"] == "Renamed"
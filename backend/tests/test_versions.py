@@ -0,0 +1,46 @@
+from flask_jwt_extended import verify_jwt_in_request
+from sqlalchemy import select, update
+
+from backend.core import db
+from backend.core.extensions import resource_versions
+from backend.core.models.auth_models import User
+from backend.core.models.version_model import ResourceVersion
+from backend.core.services.seed_service import generate_dataset
+from backend.tests.conftest import PASSWORD, login
+
+
+def users_version():
+    return db.session.scalar(select(ResourceVersion.version).where(ResourceVersion.name == "users"))
+
+
+def test_version_bumped_after_commit(app, database, count_queries):
+    with app.app_context():
+        generate_dataset(users=1, teams=0, jury=0, cases=0, reviews_per_jury=0, seed=1, password=PASSWORD)
+        before = users_version()
+        db.session.commit()
+
+        with count_queries() as counter:
+            db.session.execute(update(User).values(full_name="Renamed"))
+        assert not [statement for statement in counter.statements if "resource_versions" in statement]
+
+        db.session.commit()
+        assert users_version() == before + 1
+
+
+def test_not_modified_requires_access(app, client, database):
+    with app.app_context():
+        generate_dataset(users=1, teams=0, jury=0, cases=0, reviews_per_jury=0, seed=1, password=PASSWORD)
+    headers = login(client, "user", "user_0")
+    path = "/api/admin/users"
+
+    # ETag вычислим без ответа 200: участник не должен получать по нему 304 чужого ресурса
+    with app.test_request_context(path, headers=headers):
+        verify_jwt_in_request()
+        etag = resource_versions.etag(("users",))
+
+    response = client.get(path, headers={**headers, "If-None-Match": f'"{etag}"'})
+    assert response.status_code == 403
+
+    admin = login(client, "admin", "admin")
+    etag = client.get(path, headers=admin).headers["ETag"]
+    assert client.get(path, headers={**admin, "If-None-Match": etag}).status_code == 304
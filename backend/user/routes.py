@@ -1,15 +1,25 @@
+from http import HTTPStatus
+
 from flask import request
 from flask_jwt_extended import jwt_required
 from flask_restx import Resource
 
+from backend.core import db
+from backend.core.messages import AuthMessages
+from backend.core.models.auth_models import User
 from backend.core.schemas.auth_schemas import login_model, user_model
-from backend.core.services.profile_service import *
+from backend.core.services.auth_service import get_current_user, get_current_user_id, parse_user_fields
+from backend.core.services.profile_service import delete_profile, get_profile, get_user_info_response, login_user, \
+    register_user, update_user_profile
 from . import user_ns
-from ..core.models.hackathon_model import HackathonCase
-from ..core.models.team_models import Team, TeamArtifacts, TeamCase, ArtifactReview, TeamMember
+from ..core.extensions import resource_versions
+from ..core.models.team_models import Team, TeamArtifacts, TeamCase, ArtifactReview, TeamMember, ReviewAssignment
 
 from ..core.schemas.team_schemas import team_invite_model, team_model, team_artifacts
-from ..core.services.team_service import create_team, add_member_to_team
+from ..core.services.leaderboard_service import remove_team_reviews
+from ..core.services.review_service import assign_team
+from ..core.services.team_service import create_team, add_member_to_team, add_members_to_team, get_user_teams, \
+    parse_team_fields, team_members
 
 
 @user_ns.route('/register')
@@ -43,6 +53,7 @@ class UserLogin(Resource):
 class UserProfile(Resource):
     @jwt_required()
     @user_ns.doc(description="Получение информации о пользователе")
+    @resource_versions.conditional("users")
     def get(self):
         user, error, status = get_profile()
         if error:
@@ -54,8 +65,7 @@ class UserProfile(Resource):
     @user_ns.doc(description="Редактирование аккаунта пользователя")
     def put(self):
         data = request.get_json()
-        username = get_jwt_identity()
-        user = User.query.filter_by(username=username).first()
+        user = get_current_user()
 
         if not user:
             return {"message": "Пользователь не найден."}, HTTPStatus.NOT_FOUND
@@ -77,13 +87,10 @@ class TeamCollection(Resource):
     @user_ns.doc(description="Создание новой команды")
     def post(self):
         data = request.get_json()
-        username = get_jwt_identity()
-        user = get_user_by_username(username)
-
         response = create_team({
             "team_name": data.get("team_name"),
             "description": data.get("description"),
-            "team_lead_id": user.user_id,
+            "team_lead_id": get_current_user_id(),
         })
 
         return response
@@ -93,25 +100,33 @@ class TeamCollection(Resource):
 class TeamItem(Resource):
     @jwt_required()
     @user_ns.doc(description="Получение участников команды")
+    @user_ns.param('fields', 'Поля пользователя через запятую: username,full_name')
+    @resource_versions.conditional("teams", "users")
     def get(self, team_name):
+        fields, error = parse_user_fields(request.args)
+        if error:
+            return error
+
         team = Team.query.filter_by(team_name=team_name).first()
         if not team:
             return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
-        return [user.to_dict() for user in team.members], HTTPStatus.OK
+        return [user.to_dict(fields) for user in team_members(team.team_id, fields)], HTTPStatus.OK
 
     @jwt_required()
     @user_ns.expect(team_invite_model)
     @user_ns.doc(description="Приглашение пользователя в команду")
     def put(self, team_name):
         data = request.get_json()
-        inviter = get_user_by_username(get_jwt_identity())
-        print(inviter.user_id)
-
         team = Team.query.filter_by(team_name=team_name).first()
-        print(team.team_lead_id)
-        if not team or team.team_lead_id != inviter.user_id:
+        if not team or team.team_lead_id != get_current_user_id():
             return {"message": "Только тимлид может приглашать участников."}, HTTPStatus.FORBIDDEN
 
+        usernames = data.get("usernames")
+        if usernames:
+            if not isinstance(usernames, list) or not all(isinstance(name, str) for name in usernames):
+                return {"message": "Поле 'usernames' должно быть списком строк."}, HTTPStatus.BAD_REQUEST
+            return add_members_to_team(team.team_id, usernames), HTTPStatus.OK
+
         invitee = User.query.filter_by(username=data.get("username")).first()
         if not invitee:
             return {"message": "Пользователь не найден."}, HTTPStatus.NOT_FOUND
@@ -122,12 +137,14 @@ class TeamItem(Resource):
     @jwt_required()
     @user_ns.doc(description="Выход пользователя из команды или удаление всей команды (если тимлид)")
     def delete(self, team_name):
-        user = get_user_by_username(get_jwt_identity())
+        user = get_current_user()
         team = Team.query.filter_by(team_name=team_name).first()
         if not team:
             return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
 
         if team.team_lead_id == user.user_id:
+            remove_team_reviews(team.team_id)
+            ReviewAssignment.query.filter_by(team_id=team.team_id).delete()
             ArtifactReview.query.filter_by(team_id=team.team_id).delete()
 
             # Удаляем артефакты
@@ -143,134 +160,8 @@ class TeamItem(Resource):
             db.session.commit()
             return {"message": f"Вы были тимлидом, команда '{team_name}' удалена."}, HTTPStatus.OK
 
-
-@user_ns.route('/teams/<string:team_name>/artifacts')
-class TeamArtifactsResource(Resource):
-    @jwt_required()
-    @user_ns.doc(description="Получение артефактов команды")
-    def get(self, team_name):
-        team = Team.query.filter_by(team_name=team_name).first()
-        if not team or not team.artifacts:
-            return {"message": "Артефакты не найдены."}, HTTPStatus.NOT_FOUND
-
-        return {
-            "github_url": team.artifacts.github_url,
-            "figma_url": team.artifacts.figma_url,
-            "hosting_url": team.artifacts.hosting_url,
-            "presentation_url": team.artifacts.presentation_url,
-            "extra_links": team.artifacts.extra_links
-        }, HTTPStatus.OK
-
-    @jwt_required()
-    @user_ns.expect(team_artifacts)
-    @user_ns.doc(description="Создание или обновление артефактов команды")
-    def put(self, team_name):
-        user = get_user_by_username(get_jwt_identity())
-        team = Team.query.filter_by(team_name=team_name).first()
-
-        if not team:
-            return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
-        if team.team_lead_id != user.user_id:
-            return {"message": "Только тимлид может редактировать артефакты."}, HTTPStatus.FORBIDDEN
-
-        data = request.get_json()
-
-        if not team.artifacts:
-            artifacts = TeamArtifacts(team_id=team.team_id)
-            db.session.add(artifacts)
-        else:
-            artifacts = team.artifacts
-
-        artifacts.github_url = data.get("github_url")
-        artifacts.figma_url = data.get("figma_url")
-        artifacts.hosting_url = data.get("hosting_url")
-        artifacts.presentation_url = data.get("presentation_url")
-        artifacts.extra_links = data.get("extra_links")
-
+        TeamMember.query.filter_by(team_id=team.team_id, user_id=user.user_id).delete()
         db.session.commit()
-        return {"message": "Артефакты успешно сохранены."}, HTTPStatus.OK
-
-
-@user_ns.route('/my-teams')
-class MyTeams(Resource):
-    @jwt_required()
-    @user_ns.doc(description="Получение списка команд, в которых состоит пользователь (лид или участник)")
-    def get(self):
-        user = get_user_by_username(get_jwt_identity())
-
-        lead_teams = Team.query.filter_by(team_lead_id=user.user_id).all()
-        member_teams = user.teams
-
-        all_teams = {team.team_id: team for team in lead_teams + member_teams}.values()
-
-        result = []
-        for team in all_teams:
-            team_data = team.to_dict()
-
-            team_case = TeamCase.query.filter_by(team_id=team.team_id).first()
-            if team_case:
-                hackathon_case = HackathonCase.query.filter_by(case_id=team_case.case_id).first()
-                if hackathon_case:
-                    team_data["case"] = hackathon_case.to_dict()
-                else:
-                    team_data["case"] = None
-            else:
-                team_data["case"] = None
-
-            result.append(team_data)
-
-        return result, HTTPStatus.OK
-@user_ns.route('/teams/<string:team_name>/members/<string:username>')
-class RemoveTeamMember(Resource):
-    @jwt_required()
-    @user_ns.doc(description="Удаление участника из команды (доступно только тимлиду)")
-    def delete(self, team_name, username):
-        current_user = get_user_by_username(get_jwt_identity())
-
-        team = Team.query.filter_by(team_name=team_name).first()
-        if not team:
-            return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
-
-        if team.team_lead_id != current_user.user_id:
-            return {"message": "Удаление участников доступно только тимлиду."}, HTTPStatus.FORBIDDEN
-
-        user_to_remove = User.query.filter_by(username=username).first()
-        if not user_to_remove:
-            return {"message": "Пользователь не найден."}, HTTPStatus.NOT_FOUND
-
-        if user_to_remove not in team.members:
-            return {"message": f"Пользователь {username} не состоит в команде."}, HTTPStatus.BAD_REQUEST
-
-        team.members.remove(user_to_remove)
-        db.session.commit()
-        
-        return {"message": f"Пользователь {username} удалён из команды {team_name}."}, HTTPStatus.OK
-
-    @user_ns.route('/teams/<string:team_name>/members/<string:username>')
-    class RemoveTeamMember(Resource):
-        @jwt_required()
-        @user_ns.doc(description="Удаление участника из команды (доступно только тимлиду)")
-        def delete(self, team_name, username):
-            current_user = get_user_by_username(get_jwt_identity())
-
-            team = Team.query.filter_by(team_name=team_name).first()
-            if not team:
-                return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
-
-            if team.team_lead_id != current_user.user_id:
-                return {"message": "Удаление участников доступно только тимлиду."}, HTTPStatus.FORBIDDEN
-
-            user_to_remove = User.query.filter_by(username=username).first()
-            if not user_to_remove:
-                return {"message": "Пользователь не найден."}, HTTPStatus.NOT_FOUND
-
-            if user_to_remove not in team.members:
-                return {"message": f"Пользователь {username} не состоит в команде."}, HTTPStatus.BAD_REQUEST
-
-            team.members.remove(user_to_remove)
-            db.session.commit()
-
-            return {"message": f"Пользователь {username} удалён из команды {team_name}."}, HTTPStatus.OK
         return {"message": f"Вы покинули команду '{team_name}'."}, HTTPStatus.OK
 
 
@@ -295,12 +186,11 @@ class TeamArtifactsResource(Resource):
     @user_ns.expect(team_artifacts)
     @user_ns.doc(description="Создание или обновление артефактов команды")
     def put(self, team_name):
-        user = get_user_by_username(get_jwt_identity())
         team = Team.query.filter_by(team_name=team_name).first()
 
         if not team:
             return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
-        if team.team_lead_id != user.user_id:
+        if team.team_lead_id != get_current_user_id():
             return {"message": "Только тимлид может редактировать артефакты."}, HTTPStatus.FORBIDDEN
 
         data = request.get_json()
@@ -308,6 +198,8 @@ class TeamArtifactsResource(Resource):
         if not team.artifacts:
             artifacts = TeamArtifacts(team_id=team.team_id)
             db.session.add(artifacts)
+            # Первая отправка артефактов ставит команду в очередь жюри
+            assign_team(team.team_id)
         else:
             artifacts = team.artifacts
 
@@ -325,28 +217,20 @@ class TeamArtifactsResource(Resource):
 class MyTeams(Resource):
     @jwt_required()
     @user_ns.doc(description="Получение списка команд, в которых состоит пользователь (лид или участник)")
+    @user_ns.param('fields', 'Поля ответа через запятую, поля связей через точку: team_name,members.username')
+    @user_ns.param('include', 'Связи к полям по умолчанию: members,cases,artifacts,reviews,team_lead')
+    @resource_versions.conditional("teams", "users", "cases")
     def get(self):
-        user = get_user_by_username(get_jwt_identity())
-
-        lead_teams = Team.query.filter_by(team_lead_id=user.user_id).all()
-        member_teams = user.teams
-
-        all_teams = {team.team_id: team for team in lead_teams + member_teams}.values()
+        fields, error = parse_team_fields(request.args)
+        if error:
+            return error
 
         result = []
-        for team in all_teams:
-            team_data = team.to_dict()
-
-            team_case = TeamCase.query.filter_by(team_id=team.team_id).first()
-            if team_case:
-                hackathon_case = HackathonCase.query.filter_by(case_id=team_case.case_id).first()
-                if hackathon_case:
-                    team_data["case"] = hackathon_case.to_dict()
-                else:
-                    team_data["case"] = None
-            else:
-                team_data["case"] = None
-
+        for team in get_user_teams(get_current_user_id(), fields):
+            team_data = team.to_dict(fields)
+            # Кейсы уже загружены вместе с командой; поле case приходит вместе с cases
+            if fields is None or "cases" in fields:
+                team_data["case"] = team.cases[0].to_dict() if team.cases else None
             result.append(team_data)
 
         return result, HTTPStatus.OK
@@ -357,13 +241,11 @@ class RemoveTeamMember(Resource):
     @jwt_required()
     @user_ns.doc(description="Удаление участника из команды (доступно только тимлиду)")
     def delete(self, team_name, username):
-        current_user = get_user_by_username(get_jwt_identity())
-
         team = Team.query.filter_by(team_name=team_name).first()
         if not team:
             return {"message": "Команда не найдена."}, HTTPStatus.NOT_FOUND
 
-        if team.team_lead_id != current_user.user_id:
+        if team.team_lead_id != get_current_user_id():
             return {"message": "Удаление участников доступно только тимлиду."}, HTTPStatus.FORBIDDEN
 
         user_to_remove = User.query.filter_by(username=username).first()
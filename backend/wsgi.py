@@ -0,0 +1,7 @@
+"""WSGI-точка входа для production-сервера.
+
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi:app
+"""
+from backend.core import create_app
+
+app = create_app()